@@ -1,6 +1,8 @@
 # core/admin.py
 
 from django.contrib import admin
+from django.contrib.postgres.search import SearchQuery
+from django.db.models import Q
 
 from .models import (
     DictionaryEntry,
@@ -14,17 +16,51 @@ from .models import (
 )
 
 
+class DeferredChangelistMixin:
+    """
+    Skip wide TEXT/JSON columns that the changelist never displays.
+    Change forms still load the full row.
+    """
+    changelist_defer = ()
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        match = request.resolver_match
+        if self.changelist_defer and match and match.url_name.endswith("_changelist"):
+            qs = qs.defer(*self.changelist_defer)
+        return qs
+
+
 class EntryVariantInline(admin.TabularInline):
     model = EntryVariant
     extra = 1
 
 
 @admin.register(DictionaryEntry)
-class DictionaryEntryAdmin(admin.ModelAdmin):
+class DictionaryEntryAdmin(DeferredChangelistMixin, admin.ModelAdmin):
     list_display = ("lemma", "updated_at")
-    search_fields = ("lemma", "gloss_ll", "gloss_en", "variants__alias")
+    changelist_defer = ("gloss_ll", "gloss_en", "search_vector")
+    search_fields = ("lemma", "gloss_ll", "gloss_en")
     inlines = [EntryVariantInline]
 
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Match through the GIN-indexed search_vector (lemma + glosses), with
+        a trigram leg on lemma for typos. Variant aliases are matched via
+        a subquery (no JOIN/DISTINCT).
+        """
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+
+        variant_entries = EntryVariant.objects.filter(alias__iexact=term).values("entry_id")
+        queryset = queryset.filter(
+            Q(search_vector=SearchQuery(term, config="simple"))
+            | Q(lemma__trigram_similar=term)
+            | Q(pk__in=variant_entries)
+        )
+        return queryset, False
+
 
 @admin.register(LibraryCategory)
 class LibraryCategoryAdmin(admin.ModelAdmin):
@@ -33,14 +69,17 @@ class LibraryCategoryAdmin(admin.ModelAdmin):
 
 
 @admin.register(LibraryItem)
-class LibraryItemAdmin(admin.ModelAdmin):
+class LibraryItemAdmin(DeferredChangelistMixin, admin.ModelAdmin):
     list_display = ("id", "title", "category", "is_published", "created_at")
+    changelist_defer = ("description",)
+    list_select_related = ("category",)
     list_filter = ("is_published", "category")
     search_fields = ("title", "description")
+    autocomplete_fields = ("submitted_by", "source_submission")
 
 
 @admin.register(LibrarySubmission)
-class LibrarySubmissionAdmin(admin.ModelAdmin):
+class LibrarySubmissionAdmin(DeferredChangelistMixin, admin.ModelAdmin):
     list_display = (
         "id",
         "title",
@@ -50,20 +89,26 @@ class LibrarySubmissionAdmin(admin.ModelAdmin):
         "reviewed_by",
         "reviewed_at",
     )
+    list_select_related = ("submitted_by", "reviewed_by")
+    changelist_defer = ("description", "rejection_reason")
     list_filter = ("status", "created_at")
-    search_fields = ("title", "description", "submitted_by__username", "submitted_by__email")
+    # Prefix-anchored (^) lookups on the joined user columns instead of %term% scans
+    search_fields = ("title", "description", "^submitted_by__username", "^submitted_by__email")
     readonly_fields = ("submitted_by", "created_at", "reviewed_by", "reviewed_at")
 
 
 @admin.register(LibraryEvent)
 class LibraryEventAdmin(admin.ModelAdmin):
     list_display = ("item", "event_type", "user", "created_at")
+    list_select_related = ("item", "user")
     list_filter = ("event_type", "created_at")
     search_fields = ("item__title",)
+    autocomplete_fields = ("item", "user")
+    show_full_result_count = False
 
 
 @admin.register(ImportJob)
-class ImportJobAdmin(admin.ModelAdmin):
+class ImportJobAdmin(DeferredChangelistMixin, admin.ModelAdmin):
     list_display = (
         "id",
         "job_type",
@@ -73,6 +118,8 @@ class ImportJobAdmin(admin.ModelAdmin):
         "success_rows",
         "failed_rows",
     )
+    list_select_related = ("created_by",)
+    changelist_defer = ("log",)
     readonly_fields = (
         "job_type",
         "created_by",
@@ -83,10 +130,11 @@ class ImportJobAdmin(admin.ModelAdmin):
         "log",
     )
     ordering = ("-created_at",)
+    show_full_result_count = False
 
 
 @admin.register(SearchQueryLog)
-class SearchQueryLogAdmin(admin.ModelAdmin):
+class SearchQueryLogAdmin(DeferredChangelistMixin, admin.ModelAdmin):
     list_display = (
         "source",
         "query",
@@ -95,8 +143,10 @@ class SearchQueryLogAdmin(admin.ModelAdmin):
         "user",
         "created_at",
     )
+    list_select_related = ("user",)
+    changelist_defer = ("meta", "search_vector")
     list_filter = ("source", "has_results", "created_at")
-    search_fields = ("query", "user__username", "user__email")
+    search_fields = ("query", "^user__username", "^user__email")
     readonly_fields = (
         "source",
         "query",
@@ -106,4 +156,21 @@ class SearchQueryLogAdmin(admin.ModelAdmin):
         "created_at",
         "meta",
     )
-    ordering = ("-created_at",)
\ No newline at end of file
+    ordering = ("-created_at",)
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Match `query` through the GIN-indexed search_vector rather than
+        ILIKE; user columns are prefix-matched.
+        """
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+
+        queryset = queryset.filter(
+            Q(search_vector=SearchQuery(term, config="simple"))
+            | Q(user__username__istartswith=term)
+            | Q(user__email__istartswith=term)
+        )
+        return queryset, False
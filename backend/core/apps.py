@@ -1,5 +1,5 @@
 from django.apps import AppConfig
-from django.db.models.signals import post_migrate
+from django.db.models.signals import post_delete, post_migrate, post_save
 
 
 class CoreConfig(AppConfig):
@@ -8,15 +8,38 @@ class CoreConfig(AppConfig):
 
     def ready(self):
         """
-        Ensure required auth groups exist after migrations.
+        Ensure required auth groups exist after migrations, and hook
+        cache invalidation up to changes in the cached models.
 
         Uses lazy import so it only runs once apps are ready
         and avoids AppRegistryNotReady in Docker.
         """
         from django.contrib.auth.models import Group  # imported lazily
 
+        from . import cache_generations
+        from .models import DictionaryEntry, LibraryCategory, LibraryItem
+
         def create_groups(sender, **kwargs):
-            for role in ("manager", "editor"):
-                Group.objects.get_or_create(name=role)
+            # Single INSERT ... ON CONFLICT DO NOTHING for all roles
+            Group.objects.bulk_create(
+                [Group(name=role) for role in ("manager", "editor")],
+                ignore_conflicts=True,
+            )
+
+        post_migrate.connect(
+            create_groups, sender=self, dispatch_uid="core.ensure_groups"
+        )
 
-        post_migrate.connect(create_groups, sender=self)
+        # Committed edits invalidate results cached from the rows they change
+        receivers = (
+            (DictionaryEntry, cache_generations.dictionary),
+            (LibraryItem, cache_generations.library),
+            (LibraryCategory, cache_generations.library),
+        )
+        for sender, generation in receivers:
+            for signal in (post_save, post_delete):
+                signal.connect(
+                    generation.bump_on_commit,
+                    sender=sender,
+                    dispatch_uid=f"core.cache_generations.{sender.__name__}",
+                )
@@ -0,0 +1,53 @@
+"""
+Generation counters for cached results derived from database rows.
+
+Cached results put the current generation of the data they were built
+from in their keys. Any change to that data bumps it, so stale results
+are never read again and just expire on their own TTL. Model saves and
+deletes bump it through signals (connected in CoreConfig.ready), and
+bulk writers that skip signals directly; either way only once the
+transaction commits.
+"""
+
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+class Generation:
+    def __init__(self, key: str):
+        self.key = key
+
+    def current(self) -> int:
+        """
+        Return the current generation. A missing counter is seeded from
+        the clock, so one lost to eviction restarts above every value
+        handed out before it.
+        """
+        return cache.get_or_set(self.key, time.time_ns, timeout=None)
+
+    def bump(self, **kwargs) -> None:
+        """
+        Invalidate everything cached under the current generation. Accepts
+        signal keyword arguments so it can be connected as a receiver.
+        """
+        try:
+            cache.incr(self.key)
+        except ValueError:
+            # No counter yet: the next current() call seeds a fresh one
+            pass
+
+    def bump_on_commit(self, **kwargs) -> None:
+        """
+        Signal receiver: bump once the current transaction commits. Bumping
+        earlier would let a concurrent request rebuild the new generation
+        from the pre-commit rows and cache that for the whole TTL.
+        """
+        transaction.on_commit(self.bump)
+
+
+# Dictionary search counts and autocomplete suggestions
+dictionary = Generation("dict:entries:generation")
+# Library search pages
+library = Generation("library:items:generation")
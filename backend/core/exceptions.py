@@ -9,19 +9,15 @@ from django.db import IntegrityError
 logger = logging.getLogger(__name__)
 
 
-def custom_exception_handler(exc, context):
+def _error_details(exc, context):
     """
-    Custom exception handler for DRF that provides consistent error responses
-    and logs errors appropriately.
+    Build the logging `extra` payload for an exception.
+    Only called once we know the record will actually be emitted.
     """
-    # Call REST framework's default exception handler first
-    response = exception_handler(exc, context)
-
-    # Get context details
     view = context.get('view', None)
     request = context.get('request', None)
 
-    error_details = {
+    return {
         'exception_type': type(exc).__name__,
         'exception_message': str(exc),
         'view': view.__class__.__name__ if view else 'Unknown',
@@ -29,21 +25,34 @@ def custom_exception_handler(exc, context):
         'method': request.method if request else 'Unknown',
     }
 
+
+def custom_exception_handler(exc, context):
+    """
+    Custom exception handler for DRF that provides consistent error responses
+    and logs errors appropriately.
+    """
+    # Call REST framework's default exception handler first
+    response = exception_handler(exc, context)
+
     # Handle DRF exceptions (response is already created)
     if response is not None:
         # Standardize the error response format
         if isinstance(response.data, dict):
             response.data['error_type'] = type(exc).__name__
 
-        logger.warning(
-            f"API Error: {error_details['exception_type']} - {error_details['exception_message']}",
-            extra=error_details
-        )
+        if logger.isEnabledFor(logging.WARNING):
+            error_details = _error_details(exc, context)
+            logger.warning(
+                f"API Error: {error_details['exception_type']} - {error_details['exception_message']}",
+                extra=error_details
+            )
         return response
 
     # Handle Django's Http404
     if isinstance(exc, Http404):
-        logger.info(f"404 Not Found: {error_details['path']}")
+        if logger.isEnabledFor(logging.INFO):
+            request = context.get('request', None)
+            logger.info(f"404 Not Found: {request.path if request else 'Unknown'}")
         return Response(
             {
                 'detail': 'Not found.',
@@ -52,6 +61,9 @@ def custom_exception_handler(exc, context):
             status=status.HTTP_404_NOT_FOUND
         )
 
+    # Everything below is an error path that always logs
+    error_details = _error_details(exc, context)
+
     # Handle Django's ValidationError
     if isinstance(exc, DjangoValidationError):
         logger.warning(f"Validation Error: {str(exc)}", extra=error_details)
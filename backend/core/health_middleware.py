@@ -0,0 +1,32 @@
+"""
+Answers process-level probes before the rest of the middleware chain.
+"""
+
+from .views_health import healthz, liveness
+
+# The probes that only report that the process is up; readiness and the
+# detailed check touch the database and cache, so they keep the full path
+_PROBES = {
+    "/healthz/": healthz,
+    "/healthz": healthz,
+    "/liveness/": liveness,
+    "/liveness": liveness,
+}
+
+
+class HealthCheckMiddleware:
+    """
+    Serve /healthz/ and /liveness/ directly, skipping sessions, CSRF,
+    auth, CORS and URL resolution. Installed first in MIDDLEWARE, so a
+    probe also isn't subject to ALLOWED_HOSTS or the HTTPS redirect, which
+    kubelets and load balancers hitting the pod IP over HTTP would trip.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        probe = _PROBES.get(request.path_info)
+        if probe is not None and request.method in ("GET", "HEAD"):
+            return probe(request)
+        return self.get_response(request)
@@ -0,0 +1,32 @@
+"""
+Write-behind recording of LibraryEvent rows.
+
+LibraryTrack calls `track_event(...)` instead of
+`LibraryEvent.objects.create`. With LIBRARY_EVENT_BATCH_SIZE > 1 events are
+buffered per process and written in bulk once the batch fills up or
+LIBRARY_EVENT_FLUSH_SECONDS pass; see core/write_behind.py for the
+mechanics and trade-offs. With the default batch size of 1 every event is
+a plain synchronous insert.
+"""
+
+from .models import LibraryEvent
+from .write_behind import WriteBehindBuffer
+
+_buffer = WriteBehindBuffer(
+    LibraryEvent, "LIBRARY_EVENT_BATCH_SIZE", "LIBRARY_EVENT_FLUSH_SECONDS"
+)
+
+
+def track_event(**fields):
+    """
+    Record a library event. Returns the saved LibraryEvent, or None if it
+    was buffered.
+    """
+    return _buffer.add(**fields)
+
+
+def flush() -> int:
+    """
+    Write any buffered events now. Returns the number of rows written.
+    """
+    return _buffer.flush()
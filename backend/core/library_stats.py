@@ -0,0 +1,68 @@
+"""
+Per-item view counters kept in the cache.
+
+LibraryTrack calls `record_view(item_id, user_id)` for every "view" event.
+Each item has a running total and, per day, a count of distinct viewers,
+so view analytics read a few cache keys instead of aggregating
+LibraryEvent rows. Counters are cache data: they survive restarts only as
+long as the cache (Redis in production) keeps them.
+"""
+
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+
+# Distinct-viewer counts are kept this many days
+VIEWER_DAYS = 7
+
+_DAY_SECONDS = 24 * 60 * 60
+
+
+def _total_key(item_id: int) -> str:
+    return f"lib:views_total:{item_id}"
+
+
+def _viewers_key(item_id: int, day: date) -> str:
+    return f"lib:viewers:{item_id}:{day.isoformat()}"
+
+
+def _incr(key: str, timeout) -> None:
+    if cache.add(key, 1, timeout):
+        return
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Expired between add() and incr()
+        cache.add(key, 1, timeout)
+
+
+def record_view(item_id: int, user_id: int) -> None:
+    """
+    Count a view of `item_id`, and `user_id` as a viewer for today.
+    """
+    _incr(_total_key(item_id), None)
+
+    day = timezone.localdate()
+    ttl = (VIEWER_DAYS + 1) * _DAY_SECONDS
+    # add() succeeds once per user and day, so only first views count
+    if cache.add(f"{_viewers_key(item_id, day)}:{user_id}", 1, ttl):
+        _incr(_viewers_key(item_id, day), ttl)
+
+
+def item_views(item_id: int) -> dict:
+    """
+    Total views and distinct viewers per day (newest first) for an item.
+    One cache round trip.
+    """
+    today = timezone.localdate()
+    days = [today - timedelta(days=n) for n in range(VIEWER_DAYS)]
+    keys = [_total_key(item_id)] + [_viewers_key(item_id, day) for day in days]
+    values = cache.get_many(keys)
+    return {
+        "item_id": item_id,
+        "total_views": values.get(keys[0], 0),
+        "unique_viewers_by_day": {
+            day.isoformat(): values.get(key, 0) for day, key in zip(days, keys[1:], strict=True)
+        },
+    }
@@ -4,9 +4,13 @@ Django management command for database backups.
 Usage: python manage.py backup_db
 """
 
+import gzip
 import os
+import shutil
 import subprocess
+import tempfile
 from datetime import datetime, timedelta
+from fnmatch import fnmatchcase
 from pathlib import Path
 from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
@@ -78,53 +82,60 @@ class Command(BaseCommand):
             '--no-acl',
             '--clean',
             '--if-exists',
-            '-f', str(backup_file)
         ]
 
         try:
             # Run backup
             self.stdout.write("Creating backup...")
-            subprocess.run(cmd, env=env, check=True, capture_output=True)
-            self.stdout.write(self.style.SUCCESS(f"✅ Backup created: {backup_file}"))
-
-            # Compress if requested
             if compress:
-                self.stdout.write("Compressing backup...")
-                subprocess.run(['gzip', str(backup_file)], check=True)
-                backup_file_gz = Path(f"{backup_file}.gz")
-                size_mb = backup_file_gz.stat().st_size / (1024 * 1024)
+                # Stream pg_dump stdout straight into gzip: a single pass,
+                # no intermediate plaintext .sql file on disk.
+                final_file = Path(f"{backup_file}.gz")
+                self._dump_compressed(cmd, env, final_file)
+                size_mb = final_file.stat().st_size / (1024 * 1024)
                 self.stdout.write(self.style.SUCCESS(
-                    f"✅ Backup compressed: {backup_file_gz} ({size_mb:.2f} MB)"
+                    f"✅ Backup compressed: {final_file} ({size_mb:.2f} MB)"
                 ))
-                final_file = backup_file_gz
             else:
+                subprocess.run(
+                    cmd + ['-f', str(backup_file)],
+                    env=env, check=True, capture_output=True,
+                )
+                self.stdout.write(self.style.SUCCESS(f"✅ Backup created: {backup_file}"))
                 size_mb = backup_file.stat().st_size / (1024 * 1024)
                 self.stdout.write(self.style.SUCCESS(
                     f"✅ Backup size: {size_mb:.2f} MB"
                 ))
                 final_file = backup_file
 
-            # Clean up old backups
+            # Clean up old backups and collect the survivors in one
+            # scandir pass (DirEntry.stat() reuses the directory read).
             self.stdout.write(f"Cleaning up backups older than {retention_days} days...")
-            cutoff_date = datetime.now() - timedelta(days=retention_days)
+            cutoff = (datetime.now() - timedelta(days=retention_days)).timestamp()
+            pattern = f"{db_name}_backup_*.sql*"
             deleted_count = 0
-
-            for old_backup in output_dir.glob(f"{db_name}_backup_*.sql*"):
-                if old_backup.stat().st_mtime < cutoff_date.timestamp():
-                    old_backup.unlink()
-                    deleted_count += 1
+            backups = []
+
+            with os.scandir(output_dir) as entries:
+                for entry in entries:
+                    if not (entry.is_file() and fnmatchcase(entry.name, pattern)):
+                        continue
+                    st = entry.stat()
+                    if st.st_mtime < cutoff:
+                        os.unlink(entry.path)
+                        deleted_count += 1
+                    else:
+                        backups.append((entry.name, st.st_size, st.st_mtime))
 
             self.stdout.write(self.style.SUCCESS(
                 f"✅ Deleted {deleted_count} old backup(s)"
             ))
 
             # List current backups
-            backups = sorted(output_dir.glob(f"{db_name}_backup_*.sql*"))
             self.stdout.write("\nCurrent backups:")
-            for backup in backups:
-                size = backup.stat().st_size / (1024 * 1024)
-                mtime = datetime.fromtimestamp(backup.stat().st_mtime)
-                self.stdout.write(f"  - {backup.name} ({size:.2f} MB, {mtime})")
+            for name, size_bytes, mtime in sorted(backups):
+                size = size_bytes / (1024 * 1024)
+                self.stdout.write(f"  - {name} ({size:.2f} MB, {datetime.fromtimestamp(mtime)})")
 
             self.stdout.write("")
             self.stdout.write("=" * 50)
@@ -135,3 +146,25 @@ class Command(BaseCommand):
             raise CommandError(f"Backup failed: {e.stderr.decode() if e.stderr else str(e)}")
         except Exception as e:
             raise CommandError(f"Backup failed: {str(e)}")
+
+    def _dump_compressed(self, cmd, env, target: Path):
+        """
+        Pipe pg_dump output through gzip into `target`.
+        Removes the partial file if pg_dump fails.
+        """
+        # stderr goes to a temp file so a chatty pg_dump can't fill the
+        # pipe buffer and deadlock while we're draining stdout.
+        with tempfile.TemporaryFile() as err:
+            proc = subprocess.Popen(cmd, env=env, stdout=subprocess.PIPE, stderr=err)
+            try:
+                with gzip.open(target, 'wb') as out:
+                    shutil.copyfileobj(proc.stdout, out, length=1 << 20)
+            finally:
+                proc.stdout.close()
+                returncode = proc.wait()
+            err.seek(0)
+            stderr = err.read()
+
+        if returncode != 0:
+            target.unlink(missing_ok=True)
+            raise subprocess.CalledProcessError(returncode, cmd, stderr=stderr)
@@ -0,0 +1,25 @@
+# backend/core/management/commands/refresh_search_stats.py
+"""
+Refresh the hourly search rollup used by the analytics endpoints.
+Usage: python manage.py refresh_search_stats  (run every minute from cron)
+       python manage.py refresh_search_stats --full  (rebuild from scratch)
+"""
+
+from django.core.management.base import BaseCommand
+
+from core import search_stats
+
+
+class Command(BaseCommand):
+    help = 'Roll recent SearchQueryLog rows up into core_searchqueryhourly'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Rebuild the whole rollup instead of only the latest hours'
+        )
+
+    def handle(self, *args, **options):
+        search_stats.refresh(full=options['full'])
+        self.stdout.write(self.style.SUCCESS('Search stats refreshed'))
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-15 02:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_add_trigram_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='libraryevent',
+            index=models.Index(fields=['event_type', '-created_at'], name='core_librar_event_t_f0bbe1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='libraryevent',
+            index=models.Index(fields=['item', '-created_at'], name='core_librar_item_id_80a89a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='libraryitem',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-created_at'], name='libitem_pub_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='searchquerylog',
+            index=models.Index(fields=['source', '-created_at'], name='core_search_source_36c870_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='searchquerylog',
+            index=models.Index(fields=['has_results', '-created_at'], name='core_search_has_res_55d154_idx'),
+        ),
+    ]
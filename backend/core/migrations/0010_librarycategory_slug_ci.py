@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-15 02:28
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_analytics_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='librarycategory',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Upper('slug'), name='uniq_category_slug_ci'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-15 02:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_librarycategory_slug_ci'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='searchquerylog',
+            name='meta',
+            field=models.JSONField(blank=True, default=None, null=True),
+        ),
+    ]
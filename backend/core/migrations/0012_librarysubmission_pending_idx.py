@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-15 02:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_searchquerylog_meta_nullable'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='librarysubmission',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['-created_at'], name='libsub_pending_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.7 on 2026-10-15 02:32
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_librarysubmission_pending_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='searchquerylog',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.SearchVector('query', config='simple'), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='searchquerylog',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='searchlog_vector_gin'),
+        ),
+    ]
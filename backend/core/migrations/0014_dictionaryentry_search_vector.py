@@ -0,0 +1,24 @@
+# Generated by Django 5.2.7 on 2026-10-15 02:34
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_searchquerylog_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dictionaryentry',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('lemma', config='simple', weight='A'), '||', django.contrib.postgres.search.SearchVector('gloss_ll', 'gloss_en', config='simple', weight='B'), django.contrib.postgres.search.SearchConfig('simple')), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='dictionaryentry',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='dictentry_vector_gin'),
+        ),
+    ]
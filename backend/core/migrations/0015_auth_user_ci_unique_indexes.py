@@ -0,0 +1,56 @@
+# Case-insensitive unique indexes on auth_user, matching the UPPER(...)
+# comparison Django emits for iexact lookups used by SignUpSerializer.
+
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import Upper
+
+
+def check_case_duplicates(apps, schema_editor):
+    """
+    Refuse to build the indexes over accounts that differ only in case,
+    listing them, instead of failing on an opaque unique violation. Such
+    accounts have to be merged or renamed by hand before migrating.
+    """
+    User = apps.get_model('auth', 'User')
+    users = User.objects.using(schema_editor.connection.alias)
+
+    conflicts = []
+    for field, rows in (('username', users), ('email', users.exclude(email=''))):
+        duplicates = (
+            rows.values(folded=Upper(field))
+            .annotate(n=Count('id'))
+            .filter(n__gt=1)
+            .values_list('folded', flat=True)
+        )
+        for folded in duplicates:
+            accounts = rows.filter(**{f'{field}__iexact': folded}).values_list('id', field)
+            listed = ', '.join(f'#{pk} {value!r}' for pk, value in accounts)
+            conflicts.append(f'  {field}: {listed}')
+
+    if conflicts:
+        raise RuntimeError(
+            'Cannot add case-insensitive unique indexes on auth_user; these '
+            'accounts differ only in case:\n' + '\n'.join(conflicts)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0014_dictionaryentry_search_vector'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_case_duplicates, migrations.RunPython.noop),
+        migrations.RunSQL(
+            sql='CREATE UNIQUE INDEX IF NOT EXISTS auth_user_username_ci_uniq ON auth_user (UPPER(username));',
+            reverse_sql='DROP INDEX IF EXISTS auth_user_username_ci_uniq;',
+        ),
+        # Blank emails are allowed and shared, so only index real addresses
+        migrations.RunSQL(
+            sql="CREATE UNIQUE INDEX IF NOT EXISTS auth_user_email_ci_uniq ON auth_user (UPPER(email)) WHERE email <> '';",
+            reverse_sql='DROP INDEX IF EXISTS auth_user_email_ci_uniq;',
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.7 on 2026-10-15 02:43
+
+from django.db import migrations, models
+
+CREATE_VIEW_SQL = """
+CREATE MATERIALIZED VIEW IF NOT EXISTS core_searchqueryhourly AS
+SELECT
+    source,
+    date_trunc('hour', created_at) AS hour,
+    query,
+    has_results,
+    COUNT(*) AS searches
+FROM core_searchquerylog
+GROUP BY 1, 2, 3, 4;
+CREATE UNIQUE INDEX IF NOT EXISTS core_searchqueryhourly_key
+    ON core_searchqueryhourly (source, hour, query, has_results);
+CREATE INDEX IF NOT EXISTS core_searchqueryhourly_hour
+    ON core_searchqueryhourly (hour);
+"""
+
+DROP_VIEW_SQL = "DROP MATERIALIZED VIEW IF EXISTS core_searchqueryhourly;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_auth_user_ci_unique_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchQueryHourly',
+            fields=[
+                ('pk', models.CompositePrimaryKey('source', 'hour', 'query', 'has_results', blank=True, editable=False, primary_key=True, serialize=False)),
+                ('source', models.CharField(max_length=50)),
+                ('hour', models.DateTimeField()),
+                ('query', models.TextField()),
+                ('has_results', models.BooleanField()),
+                ('searches', models.BigIntegerField()),
+            ],
+            options={
+                'db_table': 'core_searchqueryhourly',
+                'managed': False,
+            },
+        ),
+        migrations.RunSQL(sql=CREATE_VIEW_SQL, reverse_sql=DROP_VIEW_SQL),
+    ]
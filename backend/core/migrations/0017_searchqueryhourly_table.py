@@ -0,0 +1,50 @@
+# Replace the fully recomputed materialized view with a table that
+# core.search_stats.refresh() updates incrementally. The SQL is inlined so
+# the migration doesn't change if search_stats does.
+
+from django.db import migrations
+
+CREATE_TABLE_SQL = """
+DROP MATERIALIZED VIEW IF EXISTS core_searchqueryhourly;
+CREATE TABLE core_searchqueryhourly (
+    source varchar(50) NOT NULL,
+    hour timestamptz NOT NULL,
+    query text NOT NULL,
+    has_results boolean NOT NULL,
+    searches bigint NOT NULL,
+    PRIMARY KEY (source, hour, query, has_results)
+);
+CREATE INDEX core_searchqueryhourly_hour ON core_searchqueryhourly (hour);
+INSERT INTO core_searchqueryhourly (source, hour, query, has_results, searches)
+SELECT source, date_trunc('hour', created_at), LEFT(query, 255), has_results, COUNT(*)
+FROM core_searchquerylog
+GROUP BY 1, 2, 3, 4;
+"""
+
+CREATE_VIEW_SQL = """
+DROP TABLE IF EXISTS core_searchqueryhourly;
+CREATE MATERIALIZED VIEW core_searchqueryhourly AS
+SELECT
+    source,
+    date_trunc('hour', created_at) AS hour,
+    query,
+    has_results,
+    COUNT(*) AS searches
+FROM core_searchquerylog
+GROUP BY 1, 2, 3, 4;
+CREATE UNIQUE INDEX core_searchqueryhourly_key
+    ON core_searchqueryhourly (source, hour, query, has_results);
+CREATE INDEX core_searchqueryhourly_hour
+    ON core_searchqueryhourly (hour);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_searchqueryhourly_rollup'),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=CREATE_TABLE_SQL, reverse_sql=CREATE_VIEW_SQL),
+    ]
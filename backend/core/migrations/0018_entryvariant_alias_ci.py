@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-15 02:59
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_searchqueryhourly_table'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='entryvariant',
+            index=models.Index(django.db.models.functions.text.Upper('alias'), name='entryvariant_alias_ci'),
+        ),
+    ]
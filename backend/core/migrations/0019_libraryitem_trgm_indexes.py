@@ -0,0 +1,30 @@
+# Trigram GIN indexes for the library search's title/description
+# icontains (ILIKE '%q%') filters. Partial on is_published, which the
+# search always filters on. Raw SQL, like the pg_trgm setup in 0007, so
+# the schema built from models for tests doesn't require the extension.
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_entryvariant_alias_ci'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                'CREATE INDEX IF NOT EXISTS libitem_title_trgm_idx '
+                'ON core_libraryitem USING gin (title gin_trgm_ops) WHERE is_published;'
+            ),
+            reverse_sql='DROP INDEX IF EXISTS libitem_title_trgm_idx;',
+        ),
+        migrations.RunSQL(
+            sql=(
+                'CREATE INDEX IF NOT EXISTS libitem_description_trgm_idx '
+                'ON core_libraryitem USING gin (description gin_trgm_ops) WHERE is_published;'
+            ),
+            reverse_sql='DROP INDEX IF EXISTS libitem_description_trgm_idx;',
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-15 03:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_libraryitem_trgm_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='searchquerylog',
+            name='core_search_source_14f387_idx',
+        ),
+        migrations.AddIndex(
+            model_name='searchquerylog',
+            index=models.Index(fields=['source', 'has_results'], name='searchlog_source_hr_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-15 03:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_libraryitem_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='libraryitem',
+            name='libitem_pub_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='libraryitem',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-created_at', '-id'], name='libitem_pub_created_id_idx'),
+        ),
+    ]
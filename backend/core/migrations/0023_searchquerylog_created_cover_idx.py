@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-15 03:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_libraryitem_pub_created_id_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='searchquerylog',
+            name='core_search_created_29af60_idx',
+        ),
+        migrations.AddIndex(
+            model_name='searchquerylog',
+            index=models.Index(fields=['-created_at'], include=('query', 'source', 'has_results', 'id'), name='searchlog_created_cover_idx'),
+        ),
+    ]
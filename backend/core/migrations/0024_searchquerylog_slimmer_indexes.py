@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-15 03:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0023_searchquerylog_created_cover_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='searchquerylog',
+            name='core_search_has_res_c1cbb6_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='searchquerylog',
+            name='searchlog_created_cover_idx',
+        ),
+        migrations.AddIndex(
+            model_name='searchquerylog',
+            index=models.Index(fields=['-created_at'], include=('source', 'has_results', 'id'), name='searchlog_created_cover_idx'),
+        ),
+    ]
@@ -1,5 +1,9 @@
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Upper
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 
 
 # =========================
@@ -12,10 +16,22 @@ class DictionaryEntry(models.Model):
     gloss_en = models.TextField(blank=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Weighted full-text vector maintained by Postgres: headword ranks above
+    # glosses. Variants live in another table and are matched separately.
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector("lemma", weight="A", config="simple")
+            + SearchVector("gloss_ll", "gloss_en", weight="B", config="simple")
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
     class Meta:
         ordering = ["lemma"]
         indexes = [
             models.Index(fields=['lemma']),
+            GinIndex(fields=['search_vector'], name='dictentry_vector_gin'),
         ]
 
     def __str__(self):
@@ -33,6 +49,9 @@ class EntryVariant(models.Model):
     class Meta:
         indexes = [
             models.Index(fields=['alias']),
+            # Matches the UPPER(...) expression Django emits for alias__iexact
+            # (admin entry search)
+            models.Index(Upper('alias'), name='entryvariant_alias_ci'),
         ]
 
     def __str__(self):
@@ -50,6 +69,11 @@ class LibraryCategory(models.Model):
     class Meta:
         ordering = ["name"]
         verbose_name_plural = "Library categories"
+        constraints = [
+            # Case-insensitive uniqueness; matches the UPPER(...) expression
+            # Django emits for slug__iexact so those lookups hit the index.
+            models.UniqueConstraint(Upper('slug'), name='uniq_category_slug_ci'),
+        ]
 
     def __str__(self):
         return self.name
@@ -101,6 +125,12 @@ class LibrarySubmission(models.Model):
         indexes = [
             models.Index(fields=['-created_at']),
             models.Index(fields=['status']),
+            # Moderation inbox: only pending rows, newest first
+            models.Index(
+                fields=['-created_at'],
+                condition=Q(status="pending"),
+                name='libsub_pending_idx',
+            ),
         ]
 
     def __str__(self):
@@ -156,11 +186,30 @@ class LibraryItem(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Weighted full-text vector maintained by Postgres: title ranks above
+    # description. English config, so "story" also finds "Stories".
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector("title", weight="A", config="english")
+            + SearchVector("description", weight="B", config="english")
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
     class Meta:
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=['-created_at']),
             models.Index(fields=['is_published']),
+            GinIndex(fields=['search_vector'], name='libitem_vector_gin'),
+            # Public listings only ever read published rows, newest first;
+            # id matches the search's tiebreak so keyset pages seek on it
+            models.Index(
+                fields=['-created_at', '-id'],
+                condition=Q(is_published=True),
+                name='libitem_pub_created_id_idx',
+            ),
         ]
 
     def __str__(self):
@@ -181,6 +230,7 @@ class LibraryEvent(models.Model):
         (EVENT_DOWNLOAD, "Download"),
         (EVENT_COMPLETE, "Complete"),
     )
+    EVENT_TYPES_SET = frozenset(value for value, _ in EVENT_TYPES)
 
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -202,6 +252,8 @@ class LibraryEvent(models.Model):
         indexes = [
             models.Index(fields=['-created_at']),
             models.Index(fields=['event_type']),
+            models.Index(fields=['event_type', '-created_at']),
+            models.Index(fields=['item', '-created_at']),
         ]
 
     def __str__(self):
@@ -253,15 +305,58 @@ class SearchQueryLog(models.Model):
         on_delete=models.SET_NULL,
     )
     created_at = models.DateTimeField(auto_now_add=True)
-    meta = models.JSONField(default=dict, blank=True)
+    meta = models.JSONField(null=True, blank=True, default=None)
+
+    # Maintained by Postgres from `query`; 'simple' config since queries
+    # mix Lango and English and shouldn't be stemmed.
+    search_vector = models.GeneratedField(
+        expression=SearchVector("query", config="simple"),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
 
     class Meta:
         ordering = ["-created_at"]
         indexes = [
-            models.Index(fields=['-created_at']),
-            models.Index(fields=['source']),
-            models.Index(fields=['has_results']),
+            # Covers the windowed totals (filtered counts per source), so
+            # they read only the window, index-only. query is left out: it
+            # is free text and would bloat every index tuple.
+            models.Index(
+                fields=['-created_at'],
+                include=['source', 'has_results', 'id'],
+                name='searchlog_created_cover_idx',
+            ),
+            # Also serves source-only lookups; lets the per-source
+            # no-result counts run off the index
+            models.Index(fields=['source', 'has_results'], name='searchlog_source_hr_idx'),
+            models.Index(fields=['source', '-created_at']),
+            models.Index(fields=['has_results', '-created_at']),
+            GinIndex(fields=['search_vector'], name='searchlog_vector_gin'),
         ]
 
     def __str__(self):
         return f"{self.source}: {self.query[:50]}"
+
+
+class SearchQueryHourly(models.Model):
+    """
+    Hourly search counts per (source, query, has_results), rolled up from
+    SearchQueryLog into the `core_searchqueryhourly` table.
+
+    The table is created by migration and brought up to date by the
+    `refresh_search_stats` management command; rows are as fresh as the
+    last refresh.
+    """
+    pk = models.CompositePrimaryKey("source", "hour", "query", "has_results")
+    source = models.CharField(max_length=50)
+    hour = models.DateTimeField()
+    query = models.TextField()
+    has_results = models.BooleanField()
+    searches = models.BigIntegerField()
+
+    class Meta:
+        managed = False
+        db_table = "core_searchqueryhourly"
+
+    def __str__(self):
+        return f"{self.source}: {self.query[:50]} @ {self.hour:%Y-%m-%d %H:00}"
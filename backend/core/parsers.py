@@ -0,0 +1,33 @@
+"""
+JSON parser backed by orjson.
+"""
+
+import codecs
+import io
+
+import orjson
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+
+class ORJSONParser(JSONParser):
+    """
+    Drop-in replacement for DRF's JSONParser that decodes with orjson.
+
+    orjson only reads UTF-8; other request charsets go through the stdlib
+    path. Bodies orjson rejects (malformed JSON, integers beyond 64 bits)
+    are re-parsed by JSONParser, so accepted input and error messages stay
+    the same as DRF's.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(body), media_type, parser_context)
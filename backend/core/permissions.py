@@ -5,6 +5,20 @@ from rest_framework import permissions
 
 MANAGER_GROUP = "manager"
 EDITOR_GROUP = "editor"
+MODERATOR_GROUPS = frozenset({MANAGER_GROUP, EDITOR_GROUP})
+
+
+def _user_group_names(user) -> frozenset:
+    """
+    Return the user's group names, loaded once and cached on the user
+    instance (which lives for the duration of the request). The set is
+    frozen so callers can't alter the cached membership.
+    """
+    names = getattr(user, "_cached_group_names", None)
+    if names is None:
+        names = frozenset(user.groups.values_list("name", flat=True))
+        user._cached_group_names = names
+    return names
 
 
 def _in_group(user, group_name: str) -> bool:
@@ -13,7 +27,16 @@ def _in_group(user, group_name: str) -> bool:
     """
     if not user or not user.is_authenticated:
         return False
-    return user.groups.filter(name=group_name).exists()
+    return group_name in _user_group_names(user)
+
+
+def _in_any_group(user, group_names: frozenset) -> bool:
+    """
+    Return True if the authenticated user is in at least one of the groups.
+    """
+    if not user or not user.is_authenticated:
+        return False
+    return not _user_group_names(user).isdisjoint(group_names)
 
 
 class IsAuthenticatedOrReadOnly(BasePermission):
@@ -66,7 +89,7 @@ class IsModeratorOrAdmin(BasePermission):
         if user.is_superuser or user.is_staff:
             return True
 
-        return _in_group(user, MANAGER_GROUP) or _in_group(user, EDITOR_GROUP)
+        return _in_any_group(user, MODERATOR_GROUPS)
 
 
 class IsStaffUser(permissions.BasePermission):
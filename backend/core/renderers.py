@@ -0,0 +1,34 @@
+"""
+JSON renderer backed by orjson.
+"""
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+_LINE_SEPARATOR = "\u2028".encode()
+_PARAGRAPH_SEPARATOR = "\u2029".encode()
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Drop-in replacement for DRF's JSONRenderer that encodes with orjson.
+
+    Output matches JSONRenderer's compact form: datetimes and anything
+    orjson can't encode natively (Decimal, lazy translation strings, ...)
+    go through DRF's JSONEncoder, and U+2028/U+2029 are escaped. Indented
+    output (`; indent=N` or the browsable API) falls back to the stdlib path.
+    """
+    _encoder = JSONRenderer.encoder_class()
+    _options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=self._encoder.default, option=self._options)
+        if _LINE_SEPARATOR in ret or _PARAGRAPH_SEPARATOR in ret:
+            ret = ret.replace(_LINE_SEPARATOR, b'\\u2028').replace(_PARAGRAPH_SEPARATOR, b'\\u2029')
+        return ret
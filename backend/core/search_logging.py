@@ -0,0 +1,37 @@
+"""
+Write-behind logging of SearchQueryLog rows.
+
+Search views call `log_search(...)` instead of
+`SearchQueryLog.objects.create`. With SEARCH_LOG_BATCH_SIZE > 1 rows are
+buffered per process, keeping the insert off the request, and written
+in bulk once the batch fills up or SEARCH_LOG_FLUSH_SECONDS pass; see
+core/write_behind.py for the mechanics and trade-offs (notably, buffered
+rows get the flush time as created_at). With the default batch size of 1
+every call is a plain synchronous insert.
+"""
+
+from .models import SearchQueryLog
+from .write_behind import WriteBehindBuffer
+
+# Logged queries are cut to this many characters. query is a key column in
+# the hourly rollup's btree primary key, whose entries are capped at ~2.7KB.
+MAX_LOGGED_QUERY_LENGTH = 255
+
+_buffer = WriteBehindBuffer(
+    SearchQueryLog, "SEARCH_LOG_BATCH_SIZE", "SEARCH_LOG_FLUSH_SECONDS"
+)
+
+
+def log_search(**fields) -> None:
+    """
+    Record a search query, buffering it if batching is enabled.
+    """
+    fields["query"] = fields.get("query", "")[:MAX_LOGGED_QUERY_LENGTH]
+    _buffer.add(**fields)
+
+
+def flush() -> int:
+    """
+    Write any buffered rows now. Returns the number of rows written.
+    """
+    return _buffer.flush()
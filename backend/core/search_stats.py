@@ -0,0 +1,80 @@
+"""
+Hourly rollup of SearchQueryLog kept in the core_searchqueryhourly table.
+
+Analytics read SearchQueryHourly instead of aggregating the raw log when
+SEARCH_STATS_FROM_ROLLUP is on, so their cost scales with the number of
+distinct (hour, query) groups rather than with log volume. Keep it current
+with `python manage.py refresh_search_stats`.
+
+Refreshes are incremental: only log rows from the latest rolled-up hour
+onward are re-aggregated (through the created_at index) and upserted, so
+a refresh costs the last hour or so of traffic, not the whole log.
+"""
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+
+from .models import SearchQueryHourly, SearchQueryLog
+from .search_logging import MAX_LOGGED_QUERY_LENGTH
+
+TABLE_NAME = "core_searchqueryhourly"
+
+# Log rows written before queries were truncated can still be longer than
+# the rollup's primary key allows, so the rollup cuts them the same way
+ROLLUP_SQL = f"""
+INSERT INTO {TABLE_NAME} (source, hour, query, has_results, searches)
+SELECT source, date_trunc('hour', created_at), LEFT(query, {MAX_LOGGED_QUERY_LENGTH}), has_results, COUNT(*)
+FROM core_searchquerylog
+WHERE created_at >= %s
+GROUP BY 1, 2, 3, 4
+ON CONFLICT (source, hour, query, has_results)
+DO UPDATE SET searches = EXCLUDED.searches;
+"""
+
+
+def refresh(full: bool = False) -> None:
+    """
+    Bring the rollup up to date. By default the newest rolled-up hour and
+    everything after it are recomputed from the log; `full` rebuilds the
+    table from scratch (after backfills or edits to older log rows).
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        since = None
+        if full:
+            cursor.execute(f"TRUNCATE {TABLE_NAME};")
+        else:
+            cursor.execute(f"SELECT MAX(hour) FROM {TABLE_NAME};")
+            since = cursor.fetchone()[0]
+        cursor.execute(ROLLUP_SQL, ["-infinity" if since is None else since])
+
+
+def rollup_enabled() -> bool:
+    return getattr(settings, "SEARCH_STATS_FROM_ROLLUP", False)
+
+
+def search_rows(since=None, **filters):
+    """
+    Rows to aggregate search counts over: the hourly rollup when enabled,
+    otherwise the raw log. Aggregate them with `searches()`.
+    """
+    if rollup_enabled():
+        qs = SearchQueryHourly.objects.filter(**filters)
+        if since is not None:
+            # Whole hours: include the hour `since` falls in
+            qs = qs.filter(hour__gte=since.replace(minute=0, second=0, microsecond=0))
+        return qs
+
+    qs = SearchQueryLog.objects.filter(**filters)
+    if since is not None:
+        qs = qs.filter(created_at__gte=since)
+    return qs
+
+
+def searches(**extra):
+    """
+    Aggregate counting searches over `search_rows()`.
+    """
+    if rollup_enabled():
+        return Sum("searches", default=0, **extra)
+    return Count("id", **extra)
@@ -1,4 +1,7 @@
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from django.db.models import BooleanField, ExpressionWrapper, Q
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
@@ -76,16 +79,11 @@ class SignUpSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ("username", "email", "password")
-
-    def validate_username(self, value: str):
-        if User.objects.filter(username__iexact=value).exists():
-            raise serializers.ValidationError(_("Username already taken."))
-        return value
-
-    def validate_email(self, value: str):
-        if value and User.objects.filter(email__iexact=value).exists():
-            raise serializers.ValidationError(_("Email already in use."))
-        return value
+        # Uniqueness (case-insensitive) is checked in validate() with a
+        # single query; drop the model's case-sensitive UniqueValidator.
+        extra_kwargs = {
+            "username": {"validators": [User.username_validator]},
+        }
 
     def validate_password(self, value: str):
         if len(value) < 8:
@@ -94,15 +92,63 @@ class SignUpSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(_("Password cannot be entirely numeric."))
         return value
 
-    def create(self, validated_data):
-        user = User(
-            username=validated_data["username"],
-            email=validated_data.get("email", ""),
+    def validate(self, attrs):
+        username = attrs["username"]
+        email = attrs.get("email")
+
+        username_match = Q(username__iexact=username)
+        email_match = Q(email__iexact=email) if email else Q(pk__in=[])
+
+        # Which field clashed is decided in SQL too: Python's str.upper()
+        # folds some characters (e.g. "ß") differently from Postgres UPPER(),
+        # which is what the case-insensitive unique indexes use.
+        clashes = User.objects.filter(username_match | email_match).values_list(
+            ExpressionWrapper(username_match, output_field=BooleanField()),
+            ExpressionWrapper(email_match, output_field=BooleanField()),
+        )
+        errors = {}
+        for username_taken, email_taken in clashes:
+            if username_taken:
+                errors["username"] = [_("Username already taken.")]
+            if email_taken:
+                errors["email"] = [_("Email already in use.")]
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
+
+    @staticmethod
+    def _build_user(data):
+        return User(
+            username=data["username"],
+            email=data.get("email", ""),
+            password=make_password(data["password"]),
         )
-        user.set_password(validated_data["password"])
-        user.save()
+
+    def create(self, validated_data):
+        user = self._build_user(validated_data)
+        try:
+            with transaction.atomic():
+                user.save()
+        except IntegrityError:
+            # A concurrent sign-up took the name/email after validate();
+            # re-run the lookup to report which field, else re-raise.
+            self.validate(validated_data)
+            raise
         return user
 
+    @classmethod
+    def bulk_create_users(cls, rows, batch_size=500):
+        """
+        Create many users (invites, seed scripts) with one INSERT per batch.
+
+        Rows are dicts with username, password and optional email. They are
+        not validated here; run untrusted input through the serializer first.
+        """
+        return User.objects.bulk_create(
+            [cls._build_user(row) for row in rows],
+            batch_size=batch_size,
+        )
+
 
 # ------------ Library Submissions / Events ------------ #
 
@@ -172,4 +218,4 @@ class ImportJobSerializer(serializers.ModelSerializer):
             "failed_rows",
             "log",
         )
-        read_only_fields = fields  # All fields are read-only
\ No newline at end of file
+        read_only_fields = fields  # All fields are read-only
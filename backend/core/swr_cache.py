@@ -0,0 +1,54 @@
+"""
+Stale-while-revalidate caching for expensive aggregates.
+
+`get_or_rebuild(key, build, fresh_for, stale_for)` stores the built value
+with the time it was built. Within `fresh_for` seconds it is served as is.
+After that, and until `stale_for`, it is still served, but one caller
+(chosen by a cache lock) rebuilds it in a background thread, so an
+expiring entry never makes every concurrent request run `build` at once.
+Only a missing entry, or one older than `stale_for`, is built inline.
+"""
+
+import logging
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+
+def get_or_rebuild(key: str, build, fresh_for: int, stale_for: int):
+    entry = cache.get(key)
+    now = time.time()
+    if entry is not None:
+        built_at, value = entry
+        age = now - built_at
+        if age < fresh_for:
+            return value
+        if age < stale_for:
+            # The lock outlives a rebuild, so one per `fresh_for` at most
+            if cache.add(f"{key}:rebuilding", 1, fresh_for):
+                _rebuild_in_background(key, build, stale_for)
+            return value
+
+    value = build()
+    cache.set(key, (now, value), stale_for)
+    return value
+
+
+def _rebuild(key: str, build, stale_for: int) -> None:
+    try:
+        built_at = time.time()
+        cache.set(key, (built_at, build()), stale_for)
+    except Exception:
+        logger.exception("Failed to rebuild cached %s", key)
+    finally:
+        connection.close()
+
+
+def _rebuild_in_background(key: str, build, stale_for: int) -> None:
+    threading.Thread(
+        target=_rebuild, args=(key, build, stale_for), name="swr-rebuild", daemon=True
+    ).start()
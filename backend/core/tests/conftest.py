@@ -3,8 +3,32 @@
 Pytest fixtures for core tests.
 Ensures PostgreSQL pg_trgm extension is available for fuzzy search tests.
 """
+import os
+from contextlib import contextmanager
+from http.cookies import SimpleCookie
+
 import pytest
-from django.db import connection
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+
+from core.permissions import EDITOR_GROUP, MANAGER_GROUP
+
+
+@pytest.fixture(scope='session')
+def django_db_setup(django_db_setup, django_db_blocker):
+    """
+    Make sure the role groups exist. core's post_migrate handler creates
+    them when the test database is built, but a database kept by
+    --reuse-db may predate that.
+    """
+    with django_db_blocker.unblock():
+        Group.objects.bulk_create(
+            [Group(name=role) for role in (MANAGER_GROUP, EDITOR_GROUP)],
+            ignore_conflicts=True,
+        )
 
 
 @pytest.fixture(scope='session', autouse=True)
@@ -15,6 +39,10 @@ def enable_pg_trgm_extension(django_db_setup, django_db_blocker):
     """
     with django_db_blocker.unblock():
         with connection.cursor() as cursor:
+            # Skip the DDL (and its lock) when the extension is already there
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            if cursor.fetchone():
+                return
             try:
                 cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
             except Exception as e:
@@ -22,3 +50,98 @@ def enable_pg_trgm_extension(django_db_setup, django_db_blocker):
                 # This can happen if test user doesn't have SUPERUSER privileges
                 print(f"Warning: Could not create pg_trgm extension: {e}")
                 print("Fuzzy search tests may fail. Grant SUPERUSER to test database user.")
+
+
+@pytest.fixture(scope='session', autouse=True)
+def fast_password_hasher():
+    """
+    Hash test passwords with MD5 instead of the production PBKDF2 hasher.
+    create_user() and sign-in checks otherwise dominate suite runtime.
+    """
+    override = override_settings(
+        PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher']
+    )
+    override.enable()
+    yield
+    override.disable()
+
+
+@pytest.fixture(scope='session', autouse=True)
+def local_memory_cache():
+    """
+    Run the suite against an in-process cache instead of Redis, so the
+    per-test cache.clear() calls are cheap and tests need no Redis server.
+    """
+    override = override_settings(CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': f'test-{os.getpid()}',
+        }
+    })
+    override.enable()
+    from django.core.cache import cache
+    cache.clear()
+    yield
+    override.disable()
+
+
+@contextmanager
+def _rolled_back(django_db_blocker):
+    with django_db_blocker.unblock():
+        with transaction.atomic():
+            yield
+            transaction.set_rollback(True)
+
+
+@pytest.fixture(scope='class')
+def class_db(django_db_setup, django_db_blocker):
+    """
+    Database access for class-scoped fixtures, like TestCase.setUpTestData:
+    rows created under it live in an outer transaction that is rolled back
+    after the class's last test, while each test still runs in its own
+    savepoint. Only share rows (and model instances) tests don't mutate.
+    """
+    with _rolled_back(django_db_blocker):
+        yield
+
+
+@pytest.fixture(scope='module')
+def module_db(django_db_setup, django_db_blocker):
+    """
+    Like class_db, for module-scoped fixtures whose rows every class in a
+    test module shares.
+    """
+    with _rolled_back(django_db_blocker):
+        yield
+
+
+@pytest.fixture(scope='class')
+def class_api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def api_client(class_api_client):
+    """
+    APIClient shared by a test class. Forced auth, credentials and cookies
+    are reset after each test (without logout(), which may touch the DB).
+    """
+    yield class_api_client
+    class_api_client.force_authenticate(user=None)
+    class_api_client.credentials()
+    class_api_client.cookies = SimpleCookie()
+
+
+# Shared users have no usable password (nothing to hash); authenticate
+# them with APIClient.force_authenticate.
+
+@pytest.fixture
+def staff_user(db):
+    """Staff user for admin/analytics endpoints."""
+    return get_user_model().objects.create_user(username='staff', is_staff=True)
+
+
+@pytest.fixture
+def regular_user(db):
+    """Authenticated user without staff permissions."""
+    return get_user_model().objects.create_user(username='regular')
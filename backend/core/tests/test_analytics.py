@@ -2,17 +2,22 @@
 
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
 from django.utils import timezone
 from datetime import timedelta
-from rest_framework.test import APIClient
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
 from rest_framework import status
 
+from core import search_stats
 from core.models import (
     SearchQueryLog,
+    SearchQueryHourly,
     LibraryEvent,
     LibraryItem,
     DictionaryEntry
 )
+from core.views_analytics import QueryHealthSummary
 
 User = get_user_model()
 
@@ -21,22 +26,12 @@ User = get_user_model()
 class TestQueryHealthSummary:
     """Test query health summary endpoint"""
     
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def setup(self, staff_user, regular_user):
         self.client = APIClient()
         self.url = '/api/admin/query-health/summary'
-        
-        # Create staff user
-        self.staff_user = User.objects.create_user(
-            username='staff',
-            password='pass123',
-            is_staff=True
-        )
-        
-        # Create regular user
-        self.regular_user = User.objects.create_user(
-            username='regular',
-            password='pass123'
-        )
+        self.staff_user = staff_user
+        self.regular_user = regular_user
         
         # Create test query logs
         SearchQueryLog.objects.create(
@@ -97,6 +92,14 @@ class TestQueryHealthSummary:
         assert response.status_code == status.HTTP_200_OK
         assert response.data['window_days'] == 7
     
+    def test_query_health_days_bounded(self):
+        """Test long windows are kept and invalid ones fall back to the default"""
+        self.client.force_authenticate(user=self.staff_user)
+        
+        assert self.client.get(self.url, {'days': 1000}).data['window_days'] == 1000
+        assert self.client.get(self.url, {'days': 0}).data['window_days'] == 1
+        assert self.client.get(self.url, {'days': 'abc'}).data['window_days'] == 30
+    
     def test_query_health_custom_limit(self):
         """Test query health with custom result limit"""
         self.client.force_authenticate(user=self.staff_user)
@@ -114,13 +117,15 @@ class TestQueryHealthSummary:
         cache.clear()
         
         # Create multiple no-result queries
-        for i in range(3):
-            SearchQueryLog.objects.create(
+        SearchQueryLog.objects.bulk_create([
+            SearchQueryLog(
                 source='dictionary',
                 query='missing word',
                 has_results=False,
                 results_count=0
             )
+            for _ in range(3)
+        ])
         
         self.client.force_authenticate(user=self.staff_user)
         response = self.client.get(self.url)
@@ -134,6 +139,27 @@ class TestQueryHealthSummary:
             assert most_frequent['query'] == 'missing word'
             assert most_frequent['times'] == 3
     
+    def test_query_health_top_lists_one_query(self, django_assert_num_queries):
+        """Test both top lists come from a single grouped query"""
+        from django.core.cache import cache
+        cache.clear()
+        SearchQueryLog.objects.bulk_create(
+            [SearchQueryLog(source='dictionary', query='popular', has_results=True) for _ in range(5)]
+            + [SearchQueryLog(source='dictionary', query='missing word', has_results=False) for _ in range(3)]
+        )
+        
+        self.client.force_authenticate(user=self.staff_user)
+        # Totals, top lists
+        with django_assert_num_queries(2):
+            response = self.client.get(self.url, {'limit': 1})
+        
+        assert response.data['top_queries'] == [
+            {'query': 'popular', 'source': 'dictionary', 'times': 5}
+        ]
+        assert response.data['top_no_result_queries'] == [
+            {'query': 'missing word', 'source': 'dictionary', 'times': 3}
+        ]
+    
     def test_query_health_caching(self):
         """Test that results are cached"""
         self.client.force_authenticate(user=self.staff_user)
@@ -154,23 +180,73 @@ class TestQueryHealthSummary:
         response2 = self.client.get(self.url)
         assert response2.status_code == status.HTTP_200_OK
         
-        # Results might be cached (60s cache timeout)
-        # This tests that caching is working, not exact values
+        # Served from the 60s cache, so the new row isn't counted yet
+        assert response2.data['total_searches'] == response1.data['total_searches']
+
+    def test_query_health_stale_rebuilt_in_background(self, monkeypatch):
+        """Test a stale summary is served while one rebuild refreshes it"""
+        import time
+        from django.core.cache import cache
+        from core import swr_cache
+        cache.clear()
+        rebuilds = []
+        monkeypatch.setattr(
+            swr_cache, '_rebuild_in_background',
+            lambda *args: rebuilds.append(args) or swr_cache._rebuild(*args),
+        )
+        monkeypatch.setattr(swr_cache.connection, 'close', lambda: None)
+        self.client.force_authenticate(user=self.staff_user)
+        self.client.get(self.url)
+        SearchQueryLog.objects.create(source='dictionary', query='new query', has_results=True)
+        
+        now = time.time()
+        monkeypatch.setattr(swr_cache.time, 'time', lambda: now + 120)
+        stale = self.client.get(self.url)
+        again = self.client.get(self.url)
+        
+        assert stale.data['total_searches'] == 3
+        assert len(rebuilds) == 1
+        assert again.data['total_searches'] == 4
+    
+    def test_query_health_etag_not_modified(self):
+        """Test a matching If-None-Match gets a 304 without a body"""
+        self.client.force_authenticate(user=self.staff_user)
+        
+        response1 = self.client.get(self.url)
+        etag = response1['ETag']
+        assert etag
+        
+        response2 = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        assert response2.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response2.content == b''
+    
+    def test_query_health_weak_etag_not_modified(self):
+        """Test the view itself answers a W/-prefixed If-None-Match with a 304"""
+        from core.views_query_health import QueryHealthSummary
+        self.client.force_authenticate(user=self.staff_user)
+        etag = self.client.get(self.url)['ETag']
+        
+        # Called directly, so ConditionalGetMiddleware can't turn a 200 into the 304
+        request = APIRequestFactory().get(self.url, HTTP_IF_NONE_MATCH=f'W/{etag}')
+        force_authenticate(request, user=self.staff_user)
+        response = QueryHealthSummary.as_view()(request)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.data is None
 
 
 @pytest.mark.django_db
 class TestLibraryAnalyticsOverview:
     """Test library analytics overview endpoint"""
     
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def setup(self, staff_user):
+        from django.core.cache import cache
+        
         self.client = APIClient()
         self.url = '/api/admin/analytics/library/overview'
-        
-        self.staff_user = User.objects.create_user(
-            username='staff',
-            password='pass123',
-            is_staff=True
-        )
+        self.staff_user = staff_user
+        # Overviews are cached for 60s; start each test from the database
+        cache.clear()
         
         # Create test library item and events
         self.item = LibraryItem.objects.create(
@@ -201,9 +277,8 @@ class TestLibraryAnalyticsOverview:
         
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
     
-    def test_requires_staff_permission(self):
+    def test_requires_staff_permission(self, regular_user):
         """Test endpoint requires staff permissions"""
-        regular_user = User.objects.create_user(username='regular', password='pass123')
         self.client.force_authenticate(user=regular_user)
         response = self.client.get(self.url)
         
@@ -223,6 +298,35 @@ class TestLibraryAnalyticsOverview:
         assert response.data['by_type']['download'] == 1
         assert response.data['by_type']['complete'] == 1
     
+    def test_library_analytics_caching(self):
+        """Test repeat requests are served from the cache"""
+        self.client.force_authenticate(user=self.staff_user)
+        response1 = self.client.get(self.url)
+        
+        LibraryEvent.objects.create(
+            item=self.item,
+            event_type=LibraryEvent.EVENT_VIEW
+        )
+        response2 = self.client.get(self.url)
+        
+        assert response2.status_code == status.HTTP_200_OK
+        assert response2.data['total_events'] == response1.data['total_events']
+    
+    def test_item_views_from_counters(self, regular_user):
+        """Test per-item view counters count totals and distinct viewers"""
+        from core import library_stats
+        library_stats.record_view(self.item.id, regular_user.id)
+        library_stats.record_view(self.item.id, regular_user.id)
+        library_stats.record_view(self.item.id, self.staff_user.id)
+        
+        self.client.force_authenticate(user=self.staff_user)
+        response = self.client.get(f'/api/admin/analytics/library/items/{self.item.id}/views')
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['total_views'] == 3
+        today = timezone.localdate().isoformat()
+        assert response.data['unique_viewers_by_day'][today] == 2
+    
     def test_library_analytics_empty_data(self):
         """Test library analytics with no events"""
         LibraryEvent.objects.all().delete()
@@ -239,15 +343,15 @@ class TestLibraryAnalyticsOverview:
 class TestDictionaryAnalyticsOverview:
     """Test dictionary analytics overview endpoint"""
     
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def setup(self, staff_user):
+        from django.core.cache import cache
+        
         self.client = APIClient()
         self.url = '/api/admin/analytics/dictionary/overview'
-        
-        self.staff_user = User.objects.create_user(
-            username='staff',
-            password='pass123',
-            is_staff=True
-        )
+        self.staff_user = staff_user
+        # Overviews are cached for 60s; start each test from the database
+        cache.clear()
         
         # Create test search logs
         SearchQueryLog.objects.create(
@@ -275,9 +379,8 @@ class TestDictionaryAnalyticsOverview:
         
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
     
-    def test_requires_staff_permission(self):
+    def test_requires_staff_permission(self, regular_user):
         """Test endpoint requires staff permissions"""
-        regular_user = User.objects.create_user(username='regular', password='pass123')
         self.client.force_authenticate(user=regular_user)
         response = self.client.get(self.url)
         
@@ -300,6 +403,14 @@ class TestDictionaryAnalyticsOverview:
         assert response.data['no_results'] == 1
         assert response.data['no_results_rate'] == 0.5
     
+    def test_dictionary_analytics_single_query(self, django_assert_num_queries):
+        """Test both counts come from one aggregate query"""
+        self.client.force_authenticate(user=self.staff_user)
+        with django_assert_num_queries(1):
+            response = self.client.get(self.url)
+        
+        assert response.status_code == status.HTTP_200_OK
+    
     def test_dictionary_analytics_empty_data(self):
         """Test dictionary analytics with no queries"""
         SearchQueryLog.objects.filter(source='dictionary').delete()
@@ -365,6 +476,50 @@ class TestSearchQueryLogging:
         
         assert log.meta['ip'] == '127.0.0.1'
         assert log.meta['user_agent'] == 'test'
+
+    def test_query_log_meta_defaults_to_null(self):
+        """Test query log stores NULL rather than {} when no metadata given"""
+        log = SearchQueryLog.objects.create(
+            source='dictionary',
+            query='test',
+            has_results=True,
+            results_count=1
+        )
+
+        log.refresh_from_db()
+        assert log.meta is None
+
+    def test_query_log_search_vector(self):
+        """Test search_vector is generated from the query text"""
+        from django.contrib.postgres.search import SearchQuery
+
+        log = SearchQueryLog.objects.create(
+            source='dictionary',
+            query='missing lango word',
+            has_results=False,
+            results_count=0
+        )
+
+        matches = SearchQueryLog.objects.filter(
+            search_vector=SearchQuery('lango', config='simple')
+        )
+        assert list(matches) == [log]
+    
+    def test_admin_changelist_defers_heavy_columns(self, rf):
+        """Test the admin list skips meta/search_vector but the change form loads them"""
+        from types import SimpleNamespace
+        from django.contrib import admin
+        
+        model_admin = admin.site._registry[SearchQueryLog]
+        
+        request = rf.get('/')
+        request.resolver_match = SimpleNamespace(url_name='core_searchquerylog_changelist')
+        deferred, is_defer = model_admin.get_queryset(request).query.deferred_loading
+        assert is_defer and {'meta', 'search_vector'} <= set(deferred)
+        
+        request.resolver_match = SimpleNamespace(url_name='core_searchquerylog_change')
+        deferred, _ = model_admin.get_queryset(request).query.deferred_loading
+        assert not deferred
     
     def test_query_log_ordering(self):
         """Test query logs are ordered by created_at descending"""
@@ -428,9 +583,174 @@ class TestLibraryEventModel:
         """Test all event types can be created"""
         item = LibraryItem.objects.create(title="Test", is_published=True)
         
-        for event_type, _ in LibraryEvent.EVENT_TYPES:
-            event = LibraryEvent.objects.create(
-                item=item,
-                event_type=event_type
-            )
-            assert event.event_type == event_type
+        events = LibraryEvent.objects.bulk_create([
+            LibraryEvent(item=item, event_type=event_type)
+            for event_type, _ in LibraryEvent.EVENT_TYPES
+        ])
+        
+        assert all(event.id is not None for event in events)
+        assert sorted(LibraryEvent.objects.values_list('event_type', flat=True)) == sorted(
+            event_type for event_type, _ in LibraryEvent.EVENT_TYPES
+        )
+
+
+@pytest.mark.django_db
+class TestSearchLogBuffer:
+    """Test write-behind buffering of search query logs"""
+    
+    def teardown_method(self):
+        from core import search_logging
+        search_logging.flush()
+    
+    def test_unbuffered_writes_immediately(self, settings):
+        """Test batch size 1 inserts on every call"""
+        from core.search_logging import log_search
+        settings.SEARCH_LOG_BATCH_SIZE = 1
+        
+        log_search(source='dictionary', query='now', has_results=True, results_count=1)
+        
+        assert SearchQueryLog.objects.filter(query='now').count() == 1
+    
+    def test_long_query_truncated(self, settings):
+        """Test over-long queries are cut so they fit the rollup's btree key"""
+        from core.search_logging import MAX_LOGGED_QUERY_LENGTH, log_search
+        settings.SEARCH_LOG_BATCH_SIZE = 1
+        
+        log_search(source='dictionary', query='x' * 5000, has_results=False, results_count=0)
+        
+        assert SearchQueryLog.objects.get().query == 'x' * MAX_LOGGED_QUERY_LENGTH
+    
+    def test_buffered_writes_once_batch_fills(self, settings):
+        """Test rows are held until the batch is full, then bulk inserted"""
+        from core.search_logging import log_search
+        settings.SEARCH_LOG_BATCH_SIZE = 3
+        settings.SEARCH_LOG_FLUSH_SECONDS = 60
+        
+        log_search(source='dictionary', query='a', has_results=False, results_count=0)
+        log_search(source='dictionary', query='b', has_results=False, results_count=0)
+        assert SearchQueryLog.objects.count() == 0
+        
+        log_search(source='dictionary', query='c', has_results=False, results_count=0)
+        assert SearchQueryLog.objects.count() == 3
+    
+    def test_flush_writes_pending_rows(self, settings):
+        """Test flush() drains a partially filled buffer"""
+        from core.search_logging import flush, log_search
+        settings.SEARCH_LOG_BATCH_SIZE = 10
+        settings.SEARCH_LOG_FLUSH_SECONDS = 60
+        
+        log_search(source='library', query='pending', has_results=True, results_count=2)
+        
+        assert flush() == 1
+        assert SearchQueryLog.objects.filter(query='pending').exists()
+
+    def test_background_flush_writes_aged_rows(self, settings, monkeypatch):
+        """Test the flusher thread drains aged rows without another search"""
+        import time
+        from core import search_logging
+        settings.SEARCH_LOG_BATCH_SIZE = 10
+        settings.SEARCH_LOG_FLUSH_SECONDS = 0.05
+        written = []
+        monkeypatch.setattr(search_logging._buffer, 'write', written.extend)
+        
+        search_logging.log_search(source='dictionary', query='idle', has_results=False, results_count=0)
+        
+        deadline = time.monotonic() + 2
+        while not written and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert [row.query for row in written] == ['idle']
+
+
+@pytest.mark.django_db
+class TestSearchStatsRollup:
+    """Test analytics served from the hourly rollup table"""
+    
+    @pytest.fixture(autouse=True)
+    def setup(self, settings, staff_user):
+        # Tests run without migrations, so create the unmanaged table here
+        with connection.schema_editor() as editor:
+            editor.create_model(SearchQueryHourly)
+        
+        settings.SEARCH_STATS_FROM_ROLLUP = True
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=staff_user)
+        
+        SearchQueryLog.objects.bulk_create([
+            SearchQueryLog(source='dictionary', query='missing word', has_results=False, results_count=0),
+            SearchQueryLog(source='dictionary', query='missing word', has_results=False, results_count=0),
+            SearchQueryLog(source='dictionary', query='found', has_results=True, results_count=2),
+            SearchQueryLog(source='library', query='book', has_results=True, results_count=1),
+        ])
+    
+    def test_counts_reflect_last_refresh(self):
+        """Test the rollup is empty until refreshed, then matches the log"""
+        url = '/api/admin/analytics/dictionary/overview'
+        assert self.client.get(url).data['total_queries'] == 0
+        
+        search_stats.refresh()
+        # Skip the overview's 60s response cache
+        cache.clear()
+        response = self.client.get(url)
+        
+        assert response.data['total_queries'] == 3
+        assert response.data['no_results'] == 2
+        assert response.data['with_results'] == 1
+    
+    def test_incremental_refresh_keeps_older_hours(self):
+        """Test a refresh only re-aggregates from the latest rolled-up hour"""
+        old = SearchQueryLog.objects.create(source='dictionary', query='old', has_results=True, results_count=1)
+        SearchQueryLog.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(hours=5))
+        search_stats.refresh()
+        
+        # Older hours aren't rescanned: pruning their raw rows keeps the totals
+        SearchQueryLog.objects.filter(pk=old.pk).delete()
+        SearchQueryLog.objects.create(source='dictionary', query='found', has_results=True, results_count=2)
+        search_stats.refresh()
+        
+        counts = dict(SearchQueryHourly.objects.values_list('query', 'searches'))
+        assert counts['old'] == 1
+        assert counts['found'] == 2
+        
+        search_stats.refresh(full=True)
+        assert not SearchQueryHourly.objects.filter(query='old').exists()
+    
+    def test_refresh_truncates_long_queries(self):
+        """Test untruncated log rows are rolled up under their first 255 characters"""
+        from core.search_logging import MAX_LOGGED_QUERY_LENGTH
+        long_query = 'x' * 5000
+        SearchQueryLog.objects.bulk_create([
+            SearchQueryLog(source='dictionary', query=long_query, has_results=False, results_count=0),
+            SearchQueryLog(source='dictionary', query=long_query + 'y', has_results=False, results_count=0),
+        ])
+        
+        search_stats.refresh(full=True)
+        
+        row = SearchQueryHourly.objects.get(query__startswith='x')
+        assert row.query == long_query[:MAX_LOGGED_QUERY_LENGTH]
+        assert row.searches == 2
+    
+    def test_query_health_from_rollup(self):
+        """Test query health totals and top lists come from the rollup"""
+        search_stats.refresh(full=True)
+        response = self.client.get('/api/admin/query-health/summary')
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['total_searches'] == 4
+        assert response.data['no_result_searches'] == 2
+        assert response.data['top_no_result_queries'][0] == {
+            'query': 'missing word', 'source': 'dictionary', 'times': 2
+        }
+    
+    def test_analytics_summary_from_rollup(self, staff_user):
+        """Test the analytics summary view's top missing list reads the rollup"""
+        search_stats.refresh(full=True)
+        # Raw rows added after the refresh aren't counted until the next one
+        SearchQueryLog.objects.create(source='library', query='late', has_results=False)
+        
+        request = APIRequestFactory().get('/')
+        force_authenticate(request, user=staff_user)
+        response = QueryHealthSummary.as_view()(request)
+        
+        assert response.data['total_queries'] == 4
+        assert response.data['top_no_result_queries'] == [{'query': 'missing word', 'count': 2}]
@@ -1,7 +1,12 @@
 # core/tests/test_auth.py
 
+import importlib
+from types import SimpleNamespace
+
 import pytest
+from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.db import connection
 from rest_framework.test import APIClient
 from rest_framework import status
 
@@ -15,6 +20,11 @@ class TestSignUp:
     def setup_method(self):
         self.client = APIClient()
         self.signup_url = '/api/auth/sign-up'
+
+    def teardown_method(self):
+        """Clear throttle cache between tests"""
+        from django.core.cache import cache
+        cache.clear()
     
     def test_signup_success(self):
         """Test successful user registration"""
@@ -33,6 +43,21 @@ class TestSignUp:
         # Verify user was created in database
         assert User.objects.filter(username='testuser').exists()
     
+    def test_signup_creates_token_without_lookup(self):
+        """Test sign-up inserts the token without first querying for one"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        data = {
+            'username': 'testuser',
+            'password': 'SecurePass123!'
+        }
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(self.signup_url, data, format='json')
+        
+        assert response.status_code == status.HTTP_201_CREATED
+        token_sql = [q['sql'] for q in ctx if 'authtoken_token' in q['sql']]
+        assert len(token_sql) == 1 and token_sql[0].startswith('INSERT')
+    
     def test_signup_duplicate_username(self):
         """Test signup with existing username"""
         User.objects.create_user(username='existing', password='pass123')
@@ -46,6 +71,62 @@ class TestSignUp:
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert 'username' in response.data
     
+    def test_signup_duplicate_username_case_insensitive(self):
+        """Test signup rejects a username differing only in case"""
+        User.objects.create_user(username='Existing', password='pass123')
+
+        data = {
+            'username': 'existing',
+            'password': 'SecurePass123!'
+        }
+        response = self.client.post(self.signup_url, data, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'username' in response.data
+
+    def test_signup_duplicate_email(self):
+        """Test signup with an email already in use"""
+        User.objects.create_user(username='existing', email='taken@example.com', password='pass123')
+
+        data = {
+            'username': 'newuser',
+            'email': 'TAKEN@example.com',
+            'password': 'SecurePass123!'
+        }
+        response = self.client.post(self.signup_url, data, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'email' in response.data
+        assert 'username' not in response.data
+
+    def test_signup_duplicate_email_folds_like_postgres(self):
+        """Test only the field Postgres matched is reported ('ß'.upper() is 'SS' in Python only)"""
+        User.objects.create_user(username='SS', email='taken@example.com', password='pass123')
+
+        data = {
+            'username': 'ß',
+            'email': 'taken@example.com',
+            'password': 'SecurePass123!'
+        }
+        response = self.client.post(self.signup_url, data, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'email' in response.data
+        assert 'username' not in response.data
+
+    def test_signup_race_reports_field_error(self):
+        """Test a username taken between validation and insert is a 400-style error"""
+        from rest_framework.exceptions import ValidationError
+        from core.serializers import SignUpSerializer
+
+        serializer = SignUpSerializer(data={'username': 'racer', 'password': 'SecurePass123!'})
+        assert serializer.is_valid()
+        User.objects.create_user(username='racer', password='pass123')
+
+        with pytest.raises(ValidationError) as exc:
+            serializer.save()
+        assert 'username' in exc.value.detail
+
     def test_signup_weak_password(self):
         """Test signup with weak password"""
         data = {
@@ -64,6 +145,59 @@ class TestSignUp:
         
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
+    def test_signup_serializer_fields_built_once(self):
+        """Test the field map is built once per serializer instance"""
+        from core.serializers import SignUpSerializer
+
+        serializer = SignUpSerializer(data={'username': 'once', 'password': 'SecurePass123!'})
+        fields = serializer.fields
+        assert serializer.is_valid()
+        assert serializer.fields is fields
+
+
+@pytest.mark.django_db
+class TestCaseInsensitiveIndexMigration:
+    """Test the precheck before the case-insensitive auth_user indexes"""
+    
+    def test_reports_case_duplicates(self):
+        """Test accounts differing only in case are listed instead of failing the index"""
+        migration = importlib.import_module('core.migrations.0015_auth_user_ci_unique_indexes')
+        with connection.cursor() as cursor:
+            # Rolled back with the test
+            cursor.execute('DROP INDEX IF EXISTS auth_user_username_ci_uniq')
+        User.objects.bulk_create([User(username='Bob'), User(username='bob')])
+        
+        with pytest.raises(RuntimeError, match="'Bob'"):
+            migration.check_case_duplicates(apps, SimpleNamespace(connection=connection))
+    
+    def test_passes_without_duplicates(self):
+        """Test the precheck is silent on clean data"""
+        migration = importlib.import_module('core.migrations.0015_auth_user_ci_unique_indexes')
+        User.objects.bulk_create([User(username='alice', email='a@example.com'), User(username='bob')])
+        
+        migration.check_case_duplicates(apps, SimpleNamespace(connection=connection))
+
+
+@pytest.mark.django_db
+class TestBulkCreateUsers:
+    """Test SignUpSerializer.bulk_create_users"""
+
+    def test_bulk_create_single_insert(self, django_assert_num_queries):
+        """Test many users are created with one INSERT"""
+        from core.serializers import SignUpSerializer
+
+        rows = [
+            {'username': f'invitee{i}', 'email': f'invitee{i}@example.com', 'password': 'SecurePass123!'}
+            for i in range(3)
+        ]
+        with django_assert_num_queries(1):
+            SignUpSerializer.bulk_create_users(rows)
+
+        user = User.objects.get(username='invitee1')
+        assert user.email == 'invitee1@example.com'
+        assert user.check_password('SecurePass123!')
+        assert User.objects.filter(username__startswith='invitee').count() == 3
+
 
 @pytest.mark.django_db
 class TestSignIn:
@@ -96,6 +230,22 @@ class TestSignIn:
         assert 'user' in response.data
         assert response.data['user']['username'] == 'testuser'
     
+    def test_signin_reuses_token_without_writes(self, django_assert_num_queries):
+        """Test a returning user's token is loaded with the user, not re-created"""
+        from rest_framework.authtoken.models import Token
+        token = Token.objects.create(user=self.user)
+        data = {
+            'username': 'testuser',
+            'password': 'TestPass123!'
+        }
+        
+        # User + token lookup, then authenticate()'s own user query
+        with django_assert_num_queries(2):
+            response = self.client.post(self.signin_url, data, format='json')
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['token'] == token.key
+    
     def test_signin_wrong_password(self):
         """Test login with incorrect password"""
         data = {
@@ -131,6 +281,63 @@ class TestSignIn:
         assert response.status_code == status.HTTP_403_FORBIDDEN
         assert 'disabled' in str(response.data).lower()
     
+    def test_signin_throttled_before_hashing(self, monkeypatch):
+        """Test attempts past the limit are rejected without authenticating"""
+        from core import views_auth
+        calls = []
+        real_authenticate = views_auth.authenticate
+        monkeypatch.setattr(
+            views_auth, 'authenticate',
+            lambda **kw: calls.append(kw) or real_authenticate(**kw),
+        )
+        data = {'username': 'testuser', 'password': 'WrongPassword'}
+        
+        # Carrying credentials doesn't lift the limit
+        self.client.force_authenticate(user=self.user)
+        for _ in range(5):
+            self.client.post(self.signin_url, data, format='json')
+        response = self.client.post(self.signin_url, data, format='json')
+        
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert len(calls) == 5
+    
+    def test_signin_throttle_resets_each_window(self, monkeypatch):
+        """Test the attempt count starts over in the next window"""
+        from core.throttles import AuthRateThrottle
+        now = [120.0]
+        monkeypatch.setattr(AuthRateThrottle, 'timer', lambda self: now[0])
+        data = {'username': 'testuser', 'password': 'WrongPassword'}
+        
+        for _ in range(5):
+            self.client.post(self.signin_url, data, format='json')
+        response = self.client.post(self.signin_url, data, format='json')
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert response['Retry-After'] == '60'
+        
+        now[0] = 180.0
+        response = self.client.post(self.signin_url, data, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    def test_signin_blocked_client_skips_drf(self, monkeypatch):
+        """Test retries after a refusal are answered by the middleware alone"""
+        from core.throttles import AuthRateThrottle
+        checks = []
+        real_allow = AuthRateThrottle.allow_request
+        monkeypatch.setattr(
+            AuthRateThrottle, 'allow_request',
+            lambda self, request, view: checks.append(1) or real_allow(self, request, view),
+        )
+        data = {'username': 'testuser', 'password': 'WrongPassword'}
+        
+        for _ in range(6):
+            self.client.post(self.signin_url, data, format='json')
+        assert len(checks) == 6
+        
+        response = self.client.post(self.signin_url, data, format='json')
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert int(response['Retry-After']) > 0
+        assert len(checks) == 6
+    
     def test_signin_missing_fields(self):
         """Test login with missing fields"""
         data = {'username': 'testuser'}
@@ -2,10 +2,12 @@
 
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from rest_framework.test import APIClient
 from rest_framework import status
 
 from core.models import DictionaryEntry, EntryVariant, SearchQueryLog
+from core.views_dictionary import PublicDictionaryEntryDetail
 
 User = get_user_model()
 
@@ -19,21 +21,11 @@ class TestPublicDictionarySearch:
         self.search_url = '/api/public/v1/dictionary/search'
         
         # Create test data
-        self.entry1 = DictionaryEntry.objects.create(
-            lemma="leb",
-            gloss_ll="language",
-            gloss_en="language"
-        )
-        self.entry2 = DictionaryEntry.objects.create(
-            lemma="lango",
-            gloss_ll="people",
-            gloss_en="people"
-        )
-        self.entry3 = DictionaryEntry.objects.create(
-            lemma="dictionary",
-            gloss_ll="dictionary desc",
-            gloss_en="book of words"
-        )
+        self.entry1, self.entry2, self.entry3 = DictionaryEntry.objects.bulk_create([
+            DictionaryEntry(lemma="leb", gloss_ll="language", gloss_en="language"),
+            DictionaryEntry(lemma="lango", gloss_ll="people", gloss_en="people"),
+            DictionaryEntry(lemma="dictionary", gloss_ll="dictionary desc", gloss_en="book of words"),
+        ])
         
         # Create variant for testing
         EntryVariant.objects.create(
@@ -41,6 +33,9 @@ class TestPublicDictionarySearch:
             alias="dholuo"
         )
     
+    def teardown_method(self):
+        cache.clear()
+    
     def test_search_without_query(self):
         """Test search returns all entries when no query provided"""
         response = self.client.get(self.search_url)
@@ -106,6 +101,28 @@ class TestPublicDictionarySearch:
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data['results']) <= 2
     
+    def test_search_cursor_pagination(self):
+        """Test next_cursor pages through lemma-ordered results"""
+        response = self.client.get(self.search_url, {'limit': 2})
+        assert [r['lemma'] for r in response.data['results']] == ['dictionary', 'lango']
+        cursor = response.data['next_cursor']
+        
+        response = self.client.get(self.search_url, {'limit': 2, 'cursor': cursor})
+        assert [r['lemma'] for r in response.data['results']] == ['leb']
+        assert response.data['next_cursor'] is None
+        assert response.data['count'] == 3
+        
+        # Exact search pages the same way
+        response = self.client.get(self.search_url, {'q': 'la', 'fuzzy': 'false', 'limit': 1})
+        response = self.client.get(self.search_url, {'q': 'la', 'fuzzy': 'false', 'limit': 1, 'cursor': response.data['next_cursor']})
+        assert [r['lemma'] for r in response.data['results']] == ['leb']
+    
+    def test_search_invalid_cursor(self):
+        """Test an undecodable cursor is rejected"""
+        response = self.client.get(self.search_url, {'cursor': '%%%'})
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
     def test_search_pagination_limit_bounds(self):
         """Test pagination limit respects max of 100"""
         response = self.client.get(self.search_url, {'limit': 200})
@@ -120,6 +137,14 @@ class TestPublicDictionarySearch:
         assert response.status_code == status.HTTP_200_OK
         # Should use default limit of 20
     
+    def test_search_invalid_similarity(self):
+        """Test an unparseable similarity falls back to the default threshold"""
+        response = self.client.get(self.search_url, {'similarity': 'abc'})
+        
+        assert response.status_code == status.HTTP_200_OK
+        log = SearchQueryLog.objects.get(source='dictionary')
+        assert log.meta['similarity_threshold'] == 0.3
+    
     def test_search_logs_query(self):
         """Test that searches are logged for analytics"""
         query = "test_query"
@@ -136,6 +161,26 @@ class TestPublicDictionarySearch:
         assert log.has_results == (response.data['count'] > 0)
         assert log.results_count == len(response.data['results'])
     
+    def test_search_logged_by_the_view(self):
+        """Test the log row is written by the view, not by a response hook"""
+        from rest_framework.test import APIRequestFactory
+        from core.views_dictionary import PublicDictionarySearch
+        
+        request = APIRequestFactory().get(self.search_url, {'q': 'inline', 'fuzzy': 'false'})
+        PublicDictionarySearch.as_view()(request)
+        
+        assert SearchQueryLog.objects.filter(query='inline').exists()
+    
+    def test_search_not_modified_still_logged(self):
+        """Test a repeat search answered 304 by conditional GET is logged"""
+        params = {'q': 'leb', 'fuzzy': 'false'}
+        response1 = self.client.get(self.search_url, params)
+        
+        response2 = self.client.get(self.search_url, params, HTTP_IF_NONE_MATCH=response1['ETag'])
+        
+        assert response2.status_code == status.HTTP_304_NOT_MODIFIED
+        assert SearchQueryLog.objects.filter(query='leb').count() == 2
+    
     def test_search_logs_authenticated_user(self):
         """Test that authenticated user is logged in search"""
         user = User.objects.create_user(username='testuser', password='pass123')
@@ -155,6 +200,79 @@ class TestPublicDictionarySearch:
         log = SearchQueryLog.objects.latest('created_at')
         assert log.user is None
     
+    def test_search_fulltext_matches_whole_words(self):
+        """Test fulltext mode matches words in any field, lemma hits first"""
+        DictionaryEntry.objects.create(lemma="words", gloss_en="plural of word")
+        
+        response = self.client.get(self.search_url, {'q': 'words', 'fulltext': 'true'})
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['search_type'] == 'fulltext'
+        assert [r['lemma'] for r in response.data['results']] == ['words', 'dictionary']
+        
+        # Whole words only: no substring match on "lang"
+        response = self.client.get(self.search_url, {'q': 'lang', 'fulltext': 'true'})
+        assert response.data['count'] == 0
+    
+    def test_search_query_count_independent_of_results(self):
+        """Test search issues the same queries for 1 or many results (no per-row lookups)"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        params = {'q': 'kwan', 'fuzzy': 'false', 'limit': 100}
+        DictionaryEntry.objects.create(lemma="kwan0")
+        with CaptureQueriesContext(connection) as single:
+            response = self.client.get(self.search_url, params)
+        assert response.data['count'] == 1
+        
+        for i in range(1, 20):
+            entry = DictionaryEntry.objects.create(lemma=f"kwan{i}")
+            EntryVariant.objects.create(entry=entry, alias=f"alias{i}")
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(self.search_url, params)
+        assert response.data['count'] == 20
+        
+        # page + search log insert; the short page makes COUNT unnecessary
+        assert len(many) == len(single) <= 2
+    
+    def test_search_count_only_when_more_pages(self, django_capture_on_commit_callbacks):
+        """Test COUNT runs only for a full page, and is reused across pages"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        def count_queries(params):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(self.search_url, params)
+            return response, [q for q in ctx if 'COUNT(' in q['sql']]
+        
+        response, counts = count_queries({'q': 'leb', 'fuzzy': 'false'})
+        assert response.data['count'] == 1 and not counts
+        
+        response, counts = count_queries({'limit': 1})
+        assert response.data['count'] == 3 and len(counts) == 1
+        
+        # Later pages of the same search reuse the cached total...
+        response, counts = count_queries({'limit': 1, 'offset': 1})
+        assert response.data['count'] == 3 and not counts
+        
+        # ...until an entry change commits
+        with django_capture_on_commit_callbacks(execute=True):
+            DictionaryEntry.objects.create(lemma="zulu")
+        response, counts = count_queries({'limit': 1, 'offset': 1})
+        assert response.data['count'] == 4 and len(counts) == 1
+    
+    def test_search_reads_only_public_columns(self):
+        """Test the page query selects just the returned columns"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(self.search_url, {'q': 'leb', 'fuzzy': 'false'})
+        
+        page_sql = next(q['sql'] for q in ctx if '"core_dictionaryentry"."lemma"' in q['sql'] and 'COUNT' not in q['sql'])
+        assert 'updated_at' not in page_sql
+        assert 'search_vector' not in page_sql.split(' FROM ')[0]
+    
     def test_search_response_structure(self):
         """Test response has correct structure"""
         response = self.client.get(self.search_url, {'q': 'leb'})
@@ -184,6 +302,9 @@ class TestPublicDictionaryEntryDetail:
         )
         self.detail_url = f'/api/public/v1/dictionary/entry/{self.entry.id}'
     
+    def teardown_method(self):
+        cache.clear()
+    
     def test_get_existing_entry(self):
         """Test retrieving an existing entry"""
         response = self.client.get(self.detail_url)
@@ -208,6 +329,48 @@ class TestPublicDictionaryEntryDetail:
         
         assert response.status_code == status.HTTP_200_OK
     
+    def test_entry_detail_conditional_get(self, django_assert_num_queries):
+        """Test a matching If-None-Match returns 304 after one lookup"""
+        response = self.client.get(self.detail_url)
+        etag = response['ETag']
+        assert 'max-age=300' in response['Cache-Control']
+        
+        with django_assert_num_queries(1):
+            response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        
+        # An edit changes the ETag and the cached body
+        self.entry.gloss_en = "edited"
+        self.entry.save()
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != etag
+        assert response.data['gloss_en'] == 'edited'
+    
+    def test_entry_detail_weak_etag_skips_body(self, monkeypatch):
+        """Test a W/-prefixed If-None-Match still matches without building the body"""
+        etag = self.client.get(self.detail_url)['ETag']
+        cache.clear()
+        
+        def fail(pk):
+            raise AssertionError('body built for a matching ETag')
+        monkeypatch.setattr(PublicDictionaryEntryDetail, '_payload', staticmethod(fail))
+        
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=f'W/{etag}')
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response['ETag'] == etag
+    
+    def test_entry_detail_throttles_signed_in_users_per_user(self):
+        """Test a token-bearing read counts against the user rate, not the IP's"""
+        from rest_framework_simplejwt.tokens import RefreshToken
+        user = User.objects.create_user(username='reader', password='pass12345')
+        token = RefreshToken.for_user(user).access_token
+        
+        response = self.client.get(self.detail_url, HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert cache.get(f'throttle_user_{user.pk}')
+    
     def test_entry_detail_response_structure(self):
         """Test response has all required fields"""
         response = self.client.get(self.detail_url)
@@ -219,6 +382,43 @@ class TestPublicDictionaryEntryDetail:
         assert 'gloss_en' in response.data
 
 
+@pytest.mark.django_db
+class TestPublicDictionaryAutocomplete:
+    """Test public dictionary autocomplete endpoint"""
+    
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = '/api/public/v1/dictionary/autocomplete'
+    
+    def teardown_method(self):
+        cache.clear()
+    
+    def test_autocomplete_cached_until_entries_change(self, monkeypatch, django_capture_on_commit_callbacks):
+        """Test suggestions are reused per prefix and dropped on entry edits"""
+        from core.views_dictionary import PublicDictionaryAutocomplete
+        
+        # Stand in for the trigram query, which needs pg_trgm
+        calls = []
+        def fake_suggestions(q, limit):
+            calls.append((q, limit))
+            return [{"lemma": q, "gloss_en": "", "similarity": 1.0}]
+        monkeypatch.setattr(PublicDictionaryAutocomplete, '_suggestions', staticmethod(fake_suggestions))
+        
+        first = self.client.get(self.url, {'q': 'wor'})
+        assert first.status_code == status.HTTP_200_OK
+        assert self.client.get(self.url, {'q': 'WOR'}).data == first.data
+        assert len(calls) == 1
+        
+        # A different limit is a different result set
+        self.client.get(self.url, {'q': 'wor', 'limit': 5})
+        assert len(calls) == 2
+        
+        with django_capture_on_commit_callbacks(execute=True):
+            DictionaryEntry.objects.create(lemma="word")
+        self.client.get(self.url, {'q': 'wor'})
+        assert len(calls) == 3
+
+
 @pytest.mark.django_db
 class TestDictionaryEntryModel:
     """Test DictionaryEntry model behavior"""
@@ -263,6 +463,23 @@ class TestDictionaryEntryModel:
         
         assert entry.updated_at > original_time
 
+    def test_search_vector_covers_lemma_and_glosses(self):
+        """Test search_vector is generated from lemma and both glosses"""
+        from django.contrib.postgres.search import SearchQuery
+
+        entry = DictionaryEntry.objects.create(
+            lemma="pii",
+            gloss_ll="pii maleng",
+            gloss_en="water"
+        )
+        DictionaryEntry.objects.create(lemma="other", gloss_en="thing")
+
+        for term in ("pii", "maleng", "water"):
+            matches = DictionaryEntry.objects.filter(
+                search_vector=SearchQuery(term, config="simple")
+            )
+            assert list(matches) == [entry]
+
 
 @pytest.mark.django_db
 class TestEntryVariantModel:
@@ -0,0 +1,109 @@
+# core/tests/test_health.py
+
+import pytest
+from django.test import Client
+
+from core import views_health
+
+
+class TestProbes:
+    """Test process-level probes served by HealthCheckMiddleware"""
+    
+    def setup_method(self):
+        self.client = Client()
+    
+    def test_healthz(self):
+        """Test healthz answers without touching the database"""
+        response = self.client.get('/healthz/')
+        
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'application/json'
+        assert response.json() == {'status': 'healthy'}
+    
+    def test_liveness(self):
+        """Test liveness reports the process is alive"""
+        response = self.client.get('/liveness')
+        
+        assert response.status_code == 200
+        assert response.json()['status'] == 'alive'
+    
+    def test_probe_skips_host_validation(self):
+        """Test probes to a pod IP aren't rejected by ALLOWED_HOSTS"""
+        response = self.client.get('/healthz/', HTTP_HOST='10.1.2.3:6200')
+        
+        assert response.status_code == 200
+    
+    def test_probe_writes_fall_through(self):
+        """Test only GET/HEAD are short-circuited"""
+        response = self.client.post('/healthz/', HTTP_HOST='10.1.2.3:6200')
+        
+        assert response.status_code == 400
+
+
+@pytest.mark.django_db
+class TestHealthDetail:
+    """Test detailed health check endpoint"""
+    
+    def setup_method(self):
+        self.client = Client()
+        views_health._dependency_checks.cache_clear()
+    
+    def teardown_method(self):
+        views_health._dependency_checks.cache_clear()
+    
+    def test_health_detail_reports_dependencies(self):
+        """Test database, cache and application checks are reported"""
+        response = self.client.get('/health/')
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data['status'] == 'healthy'
+        assert set(data['checks']) == {'database', 'cache', 'application'}
+    
+    def test_health_detail_reuses_checks_briefly(self, monkeypatch):
+        """Test dependency checks run once per time bucket"""
+        calls = []
+        monkeypatch.setattr(
+            views_health, '_check_database',
+            lambda: calls.append(1) or {'status': 'unhealthy', 'message': 'down'},
+        )
+        now = [1000.0]
+        monkeypatch.setattr(views_health.time, 'monotonic', lambda: now[0])
+        
+        assert self.client.get('/health/').status_code == 503
+        assert self.client.get('/health/').status_code == 503
+        assert len(calls) == 1
+        
+        now[0] += views_health.HEALTH_DETAIL_CACHE_SECONDS
+        self.client.get('/health/')
+        assert len(calls) == 2
+
+
+@pytest.mark.django_db
+class TestReadiness:
+    """Test readiness probe"""
+    
+    def test_readiness_checks_database_with_query(self):
+        """Test readiness runs a round trip to the database"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        with CaptureQueriesContext(connection) as ctx:
+            response = Client().get('/readiness/')
+        
+        assert response.status_code == 200
+        assert response.json()['status'] == 'ready'
+        assert [q['sql'] for q in ctx.captured_queries] == ['SELECT 1']
+    
+    def test_readiness_reports_unreachable_database(self, monkeypatch):
+        """Test a failed connection makes readiness return 503"""
+        from django.db import OperationalError
+        
+        def refuse():
+            raise OperationalError("connection refused")
+        monkeypatch.setattr(views_health, '_ensure_database', refuse)
+        
+        response = Client().get('/readiness/')
+        
+        assert response.status_code == 503
+        assert response.json()['status'] == 'not_ready'
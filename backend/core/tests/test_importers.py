@@ -3,36 +3,23 @@
 import pytest
 import io
 import json
-from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
 from rest_framework.test import APIClient
 from rest_framework import status
 
-from core.models import DictionaryEntry, LibraryItem, ImportJob
-
-User = get_user_model()
+from core.models import DictionaryEntry, EntryVariant, LibraryItem, ImportJob
 
 
 @pytest.mark.django_db
 class TestDictionaryImportCSV:
     """Test dictionary CSV import endpoint"""
     
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def setup(self, staff_user, regular_user):
         self.client = APIClient()
         self.import_url = '/api/admin/import/dictionary/csv'
-        
-        # Create staff user
-        self.staff_user = User.objects.create_user(
-            username='staff',
-            password='pass123',
-            is_staff=True
-        )
-        
-        # Create regular user
-        self.regular_user = User.objects.create_user(
-            username='regular',
-            password='pass123'
-        )
+        self.staff_user = staff_user
+        self.regular_user = regular_user
     
     def test_import_requires_authentication(self):
         """Test import requires authentication"""
@@ -78,6 +65,26 @@ class TestDictionaryImportCSV:
         assert job.job_type == 'dictionary'
         assert job.created_by == self.staff_user
     
+    def test_import_writes_per_batch_not_per_row(self, monkeypatch):
+        """Test rows are merged with one upsert statement per batch"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        monkeypatch.setattr('core.views_import.IMPORT_BATCH_SIZE', 2)
+        DictionaryEntry.objects.create(lemma='e', gloss_en='old')
+        csv_content = "lemma,gloss_ll,gloss_en\na,,1\nb,,2\nc,,3\nd,,4\ne,,5"
+        csv_file = SimpleUploadedFile("dict.csv", csv_content.encode('utf-8'), content_type='text/csv')
+        
+        self.client.force_authenticate(user=self.staff_user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(self.import_url, {'file': csv_file}, format='multipart')
+        
+        assert response.status_code == status.HTTP_200_OK
+        upserts = [q for q in ctx if q['sql'].lstrip().startswith('INSERT INTO "core_dictionaryentry"')]
+        assert len(upserts) == 3
+        job = ImportJob.objects.get(id=response.data['job_id'])
+        assert 'Upserted 5 entries (4 created, 1 updated).' in job.log
+        assert DictionaryEntry.objects.get(lemma='e').gloss_en == '5'
+    
     def test_import_missing_file(self):
         """Test import without file fails"""
         self.client.force_authenticate(user=self.staff_user)
@@ -104,6 +111,24 @@ class TestDictionaryImportCSV:
         assert response.status_code == status.HTTP_200_OK
         assert response.data['success_rows'] == 1
     
+    def test_import_invalid_utf8(self):
+        """Test undecodable bytes are rejected without writing entries"""
+        csv_file = SimpleUploadedFile(
+            "dict.csv",
+            b"lemma,gloss_ll,gloss_en\ngood,ok,ok\nbad,\xff\xfe,x",
+            content_type='text/csv'
+        )
+        
+        self.client.force_authenticate(user=self.staff_user)
+        response = self.client.post(
+            self.import_url,
+            {'file': csv_file},
+            format='multipart'
+        )
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not DictionaryEntry.objects.filter(lemma="good").exists()
+    
     def test_import_updates_existing(self):
         """Test import updates existing entries"""
         # Create existing entry
@@ -159,6 +184,51 @@ class TestDictionaryImportCSV:
         assert DictionaryEntry.objects.filter(lemma='valid').exists()
         assert not DictionaryEntry.objects.filter(lemma='').exists()
     
+    def test_import_rejects_overlong_lemma(self):
+        """Test an over-long lemma fails its row instead of the whole import"""
+        csv_content = f"lemma,gloss_ll,gloss_en\n{'x' * 256},ll,en\nvalid,valid_ll,valid_en"
+        csv_file = SimpleUploadedFile(
+            "dict.csv",
+            csv_content.encode('utf-8'),
+            content_type='text/csv'
+        )
+        
+        self.client.force_authenticate(user=self.staff_user)
+        response = self.client.post(
+            self.import_url,
+            {'file': csv_file},
+            format='multipart'
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['success_rows'] == 1
+        assert response.data['failed_rows'] == 1
+        assert list(DictionaryEntry.objects.values_list('lemma', flat=True)) == ['valid']
+        job = ImportJob.objects.get(id=response.data['job_id'])
+        assert 'Row 1: lemma longer than 255 characters.' in job.log
+    
+    def test_import_short_rows_and_blank_lines(self):
+        """Test short rows read missing cells as blank and blank lines are skipped"""
+        csv_content = "gloss_en,lemma,gloss_ll\n\nen_a,a\n,b,ll_b\n"
+        csv_file = SimpleUploadedFile(
+            "dict.csv",
+            csv_content.encode('utf-8'),
+            content_type='text/csv'
+        )
+        
+        self.client.force_authenticate(user=self.staff_user)
+        response = self.client.post(
+            self.import_url,
+            {'file': csv_file},
+            format='multipart'
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['total_rows'] == 2
+        assert set(DictionaryEntry.objects.values_list('lemma', 'gloss_ll', 'gloss_en')) == {
+            ('a', '', 'en_a'), ('b', 'll_b', ''),
+        }
+    
     def test_import_handles_missing_columns(self):
         """Test import handles missing optional columns"""
         csv_content = "lemma\ntest_word"
@@ -187,15 +257,11 @@ class TestDictionaryImportCSV:
 class TestDictionaryImportJSON:
     """Test dictionary JSON import endpoint"""
     
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def setup(self, staff_user):
         self.client = APIClient()
         self.import_url = '/api/admin/import/dictionary/json'
-        
-        self.staff_user = User.objects.create_user(
-            username='staff',
-            password='pass123',
-            is_staff=True
-        )
+        self.staff_user = staff_user
     
     def test_import_json_success(self):
         """Test successful JSON import"""
@@ -259,6 +325,79 @@ class TestDictionaryImportJSON:
         assert entry.gloss_ll == 'new'
         assert entry.gloss_en == 'new'
     
+    def test_import_json_blank_gloss_keeps_existing(self):
+        """Test blank glosses keep stored values and the log counts upserts"""
+        DictionaryEntry.objects.create(lemma='existing', gloss_ll='old_ll', gloss_en='old_en')
+        
+        data = {
+            'entries': [
+                {'lemma': 'existing', 'gloss_ll': '', 'gloss_en': 'new_en'},
+                {'lemma': 'fresh', 'gloss_en': 'fresh_en'}
+            ]
+        }
+        
+        self.client.force_authenticate(user=self.staff_user)
+        response = self.client.post(self.import_url, data, format='json')
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert DictionaryEntry.objects.filter(lemma='existing').values_list('gloss_ll', 'gloss_en').get() == ('old_ll', 'new_en')
+        assert DictionaryEntry.objects.filter(lemma='fresh').values_list('gloss_ll', 'gloss_en').get() == ('', 'fresh_en')
+        
+        job = ImportJob.objects.get(id=response.data['job_id'])
+        assert '(1 created, 1 updated)' in job.log
+    
+    def test_import_json_truncated_body(self):
+        """Test a body cut off mid-array is rejected and nothing is written"""
+        self.client.force_authenticate(user=self.staff_user)
+        response = self.client.post(
+            self.import_url,
+            '{"entries": [{"lemma": "first"}, {"lemma": "sec',
+            content_type='application/json'
+        )
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not DictionaryEntry.objects.filter(lemma='first').exists()
+    
+    def test_import_json_flushes_in_batches(self, monkeypatch):
+        """Test streamed entries are written per batch with merged results"""
+        monkeypatch.setattr('core.views_import.IMPORT_BATCH_SIZE', 2)
+        data = {
+            'entries': [
+                {'lemma': 'a', 'gloss_en': 'first'},
+                {'lemma': 'b'},
+                {'lemma': 'a', 'gloss_ll': 'll'},
+            ]
+        }
+        
+        self.client.force_authenticate(user=self.staff_user)
+        response = self.client.post(self.import_url, data, format='json')
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['success_rows'] == 3
+        assert DictionaryEntry.objects.filter(lemma='a').values_list('gloss_ll', 'gloss_en').get() == ('ll', 'first')
+        assert DictionaryEntry.objects.count() == 2
+    
+    def test_import_json_variants(self):
+        """Test variants are attached once and invalid aliases are skipped"""
+        data = {
+            'entries': [
+                {'lemma': 'gwok', 'gloss_en': 'dog', 'variants': ['guok', ' gwog ', '', 'guok']},
+                {'lemma': 'dyel', 'variants': 'diel'},
+            ]
+        }
+        
+        self.client.force_authenticate(user=self.staff_user)
+        for _ in range(2):
+            response = self.client.post(self.import_url, data, format='json')
+            assert response.status_code == status.HTTP_200_OK
+        
+        assert sorted(EntryVariant.objects.values_list('entry__lemma', 'alias')) == [
+            ('dyel', 'diel'), ('gwok', 'guok'), ('gwok', 'gwog')
+        ]
+        job = ImportJob.objects.get(id=response.data['job_id'])
+        assert 'Item 1: skipped invalid variant.' in job.log
+        assert 'Added' not in job.log  # second run found them all present
+    
     def test_import_json_skips_empty_lemma(self):
         """Test JSON import skips entries with empty lemma"""
         data = {
@@ -274,21 +413,57 @@ class TestDictionaryImportJSON:
         assert response.status_code == status.HTTP_200_OK
         assert response.data['success_rows'] == 1
         assert response.data['failed_rows'] == 1
+    
+    def test_import_json_rejects_overlong_lemma(self):
+        """Test JSON import fails over-long lemmas per item"""
+        data = {
+            'entries': [
+                {'lemma': 'x' * 256, 'variants': ['long']},
+                {'lemma': 'valid', 'gloss_en': 'test'}
+            ]
+        }
+        
+        self.client.force_authenticate(user=self.staff_user)
+        response = self.client.post(self.import_url, data, format='json')
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['success_rows'] == 1
+        assert response.data['failed_rows'] == 1
+        assert list(DictionaryEntry.objects.values_list('lemma', flat=True)) == ['valid']
+    
+    def test_import_json_repeated_lemma_merges(self):
+        """Test a lemma repeated in one import merges in order, blanks keep values"""
+        DictionaryEntry.objects.create(lemma='existing', gloss_ll='old_ll', gloss_en='old_en')
+        
+        data = {
+            'entries': [
+                {'lemma': 'existing', 'gloss_ll': '', 'gloss_en': 'new_en'},
+                {'lemma': 'fresh', 'gloss_ll': 'first', 'gloss_en': ''},
+                {'lemma': 'fresh', 'gloss_ll': '', 'gloss_en': 'second'},
+            ]
+        }
+        
+        self.client.force_authenticate(user=self.staff_user)
+        response = self.client.post(self.import_url, data, format='json')
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['success_rows'] == 3
+        
+        existing = DictionaryEntry.objects.get(lemma='existing')
+        assert (existing.gloss_ll, existing.gloss_en) == ('old_ll', 'new_en')
+        fresh = DictionaryEntry.objects.get(lemma='fresh')
+        assert (fresh.gloss_ll, fresh.gloss_en) == ('first', 'second')
 
 
 @pytest.mark.django_db
 class TestLibraryImportJSON:
     """Test library JSON import endpoint"""
     
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def setup(self, staff_user):
         self.client = APIClient()
         self.import_url = '/api/admin/import/library/json'
-        
-        self.staff_user = User.objects.create_user(
-            username='staff',
-            password='pass123',
-            is_staff=True
-        )
+        self.staff_user = staff_user
     
     def test_import_library_success(self):
         """Test successful library JSON import"""
@@ -354,6 +529,23 @@ class TestLibraryImportJSON:
         
         assert LibraryItem.objects.filter(title='Valid').exists()
     
+    def test_import_library_rejects_overlong_title(self):
+        """Test library import fails over-long titles per item"""
+        data = {
+            'items': [
+                {'title': 'x' * 256},
+                {'title': 'Valid'}
+            ]
+        }
+        
+        self.client.force_authenticate(user=self.staff_user)
+        response = self.client.post(self.import_url, data, format='json')
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['success_rows'] == 1
+        assert response.data['failed_rows'] == 1
+        assert list(LibraryItem.objects.values_list('title', flat=True)) == ['Valid']
+    
     def test_import_library_updates_existing(self):
         """Test library import updates existing items"""
         LibraryItem.objects.create(
@@ -381,6 +573,18 @@ class TestLibraryImportJSON:
         assert item.description == 'New description'
         assert item.is_published is True
     
+    def test_import_library_invalidates_search_cache(self, django_capture_on_commit_callbacks):
+        """Test a library import moves the search cache generation"""
+        from core import cache_generations
+        before = cache_generations.library.current()
+        
+        self.client.force_authenticate(user=self.staff_user)
+        with django_capture_on_commit_callbacks(execute=True):
+            response = self.client.post(self.import_url, {'items': [{'title': 'New'}]}, format='json')
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert cache_generations.library.current() != before
+    
     def test_import_library_minimal_fields(self):
         """Test library import with only required fields"""
         data = {
@@ -398,18 +602,34 @@ class TestLibraryImportJSON:
         item = LibraryItem.objects.get(title='Minimal Item')
         assert item.description == ''
         assert item.url == ''
+    
+    def test_import_library_repeated_title(self):
+        """Test a title repeated in one import creates once, then updates"""
+        data = {
+            'items': [
+                {'title': 'Twice', 'description': 'first'},
+                {'title': 'Twice', 'description': 'second'},
+            ]
+        }
+        
+        self.client.force_authenticate(user=self.staff_user)
+        response = self.client.post(self.import_url, data, format='json')
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert LibraryItem.objects.filter(title='Twice').count() == 1
+        assert LibraryItem.objects.get(title='Twice').description == 'second'
+        
+        job = ImportJob.objects.get(id=response.data['job_id'])
+        assert job.log.splitlines()[1:] == ["Item 1: created 'Twice'", "Item 2: updated 'Twice'"]
 
 
 @pytest.mark.django_db
 class TestImportJobTracking:
     """Test import job tracking and logging"""
     
-    def setup_method(self):
-        self.staff_user = User.objects.create_user(
-            username='staff',
-            password='pass123',
-            is_staff=True
-        )
+    @pytest.fixture(autouse=True)
+    def setup(self, staff_user):
+        self.staff_user = staff_user
     
     def test_import_job_created(self):
         """Test that import jobs are tracked"""
@@ -442,6 +662,23 @@ class TestImportJobTracking:
         assert job.success_rows == 1
         assert job.failed_rows == 1
     
+    def test_import_job_written_once(self):
+        """Test per-row log lines are buffered and the job row is updated once"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        client = APIClient()
+        client.force_authenticate(user=self.staff_user)
+        
+        data = {'entries': [{'lemma': ''}, {'lemma': ''}, {'lemma': 'ok'}, {'lemma': ''}]}
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.post('/api/admin/import/dictionary/json', data, format='json')
+        
+        job_updates = [q for q in ctx if q['sql'].startswith('UPDATE "core_importjob"')]
+        assert len(job_updates) == 1
+        job = ImportJob.objects.get(id=response.data['job_id'])
+        assert job.log.count('missing lemma') == 3
+    
     def test_import_job_records_creator(self):
         """Test import job records the user who created it"""
         client = APIClient()
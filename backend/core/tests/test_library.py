@@ -1,9 +1,14 @@
 # core/tests/test_library.py
 
+import json
+from types import SimpleNamespace
+
 import pytest
 from django.contrib.auth import get_user_model
-from django.contrib.auth.models import Group
-from rest_framework.test import APIClient
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 
 from core.models import (
@@ -16,44 +21,59 @@ from core.models import (
 User = get_user_model()
 
 
-@pytest.mark.django_db
-class TestLibrarySearch:
-    """Test library search endpoint (authenticated)"""
-    
-    def setup_method(self):
-        self.client = APIClient()
-        self.search_url = '/api/library/search'
-        self.user = User.objects.create_user(username='testuser', password='pass123')
-        
-        # Create test category
-        self.category = LibraryCategory.objects.create(
-            name="Books",
-            slug="books"
-        )
-        
-        # Create test data
-        self.item1 = LibraryItem.objects.create(
+@pytest.fixture(scope='class')
+def library_search_data(class_db):
+    """User, category and items shared read-only by TestLibrarySearch."""
+    user = User.objects.create_user(username='testuser')
+    
+    # Create test category
+    category = LibraryCategory.objects.create(
+        name="Books",
+        slug="books"
+    )
+    
+    # Create test data; the unpublished item should not appear in results
+    item1, item2, item3 = LibraryItem.objects.bulk_create([
+        LibraryItem(
             title="Lango Stories",
             description="Collection of traditional stories",
             url="http://example.com/stories",
             item_type="book",
-            category=self.category,
+            category=category,
             is_published=True
-        )
-        self.item2 = LibraryItem.objects.create(
+        ),
+        LibraryItem(
             title="Learning Lango",
             description="Language learning guide",
             url="http://example.com/learning",
             item_type="document",
-            category=self.category,
+            category=category,
             is_published=True
-        )
-        # Unpublished item (should not appear in results)
-        self.item3 = LibraryItem.objects.create(
+        ),
+        LibraryItem(
             title="Unpublished",
             description="Not visible",
             is_published=False
-        )
+        ),
+    ])
+    return SimpleNamespace(user=user, category=category, item1=item1, item2=item2, item3=item3)
+
+
+@pytest.mark.django_db
+class TestLibrarySearch:
+    """Test library search endpoint (authenticated)"""
+    
+    @pytest.fixture(autouse=True)
+    def setup(self, api_client, library_search_data):
+        # Search pages are cached; start every test cold
+        cache.clear()
+        self.client = api_client
+        self.search_url = '/api/library/search'
+        self.user = library_search_data.user
+        self.category = library_search_data.category
+        self.item1 = library_search_data.item1
+        self.item2 = library_search_data.item2
+        self.item3 = library_search_data.item3
     
     def test_search_requires_authentication(self):
         """Test that library search requires authentication"""
@@ -61,23 +81,47 @@ class TestLibrarySearch:
         
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
     
+    def test_search_unchanged_page_not_modified(self):
+        """Test a repeat fetch with the page's ETag gets a bodyless 304"""
+        self.client.force_authenticate(user=self.user)
+        response1 = self.client.get(self.search_url)
+        
+        response2 = self.client.get(self.search_url, HTTP_IF_NONE_MATCH=response1['ETag'])
+        
+        assert response2.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response2.content == b''
+    
     def test_search_authenticated_success(self):
         """Test authenticated user can search library"""
         self.client.force_authenticate(user=self.user)
-        response = self.client.get(self.search_url)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.search_url)
         
         assert response.status_code == status.HTTP_200_OK
+        # Page and total in one query; category comes in via the join
+        assert len(ctx.captured_queries) == 1
         assert 'count' in response.data
         assert 'results' in response.data
         assert response.data['count'] == 2  # Only published items
     
+    def test_search_reads_only_rendered_columns(self):
+        """Test the page query doesn't select unused columns"""
+        self.client.force_authenticate(user=self.user)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(self.search_url, {'q': 'stories'})
+        
+        select_list = ctx.captured_queries[0]['sql'].split(' FROM ')[0]
+        assert '"description"' not in select_list
+        assert '"url"' not in select_list
+        assert '"search_vector"' not in select_list
+    
     def test_search_only_returns_published(self):
         """Test that search only returns published items"""
         self.client.force_authenticate(user=self.user)
         response = self.client.get(self.search_url)
         
         assert response.status_code == status.HTTP_200_OK
-        titles = [item['title'] for item in response.data['results']]
+        titles = {item['title'] for item in response.data['results']}
         assert 'Unpublished' not in titles
     
     def test_search_by_title(self):
@@ -100,11 +144,30 @@ class TestLibrarySearch:
     def test_search_by_category(self):
         """Test search filters by category slug"""
         self.client.force_authenticate(user=self.user)
-        response = self.client.get(self.search_url, {'category': 'books'})
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.search_url, {'category': 'books'})
         
         assert response.status_code == status.HTTP_200_OK
+        assert len(ctx.captured_queries) <= 2
         assert response.data['count'] == 2
-    
+
+    def test_search_category_slug_exact(self):
+        """Test the category filter matches the slug exactly, as before"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.search_url, {'category': 'BOOKS'})
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 0
+
+    def test_search_returns_category_name(self):
+        """Test results carry the category name and item type"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.search_url, {'q': 'Stories'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['results'][0]['category'] == 'Books'
+        assert response.data['results'][0]['item_type'] == 'book'
+
     def test_search_pagination(self):
         """Test search respects pagination parameters"""
         self.client.force_authenticate(user=self.user)
@@ -113,6 +176,57 @@ class TestLibrarySearch:
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data['results']) == 1
     
+    def test_search_cached_until_items_change(self, django_capture_on_commit_callbacks):
+        """Test repeat searches are served from cache until an item is saved"""
+        self.client.force_authenticate(user=self.user)
+        self.client.get(self.search_url, {'q': 'stories'})
+        
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.search_url, {'q': 'stories'})
+        assert len(ctx.captured_queries) == 0
+        assert response.data['count'] == 1
+        
+        with django_capture_on_commit_callbacks(execute=True):
+            LibraryItem.objects.create(title="More Stories", is_published=True)
+        response = self.client.get(self.search_url, {'q': 'stories'})
+        assert response.data['count'] == 2
+    
+    def test_search_cache_kept_until_commit(self, django_capture_on_commit_callbacks):
+        """Test an uncommitted item change doesn't move the cache generation"""
+        from core import cache_generations
+        before = cache_generations.library.current()
+        
+        with django_capture_on_commit_callbacks() as callbacks:
+            LibraryItem.objects.create(title="Pending", is_published=True)
+            assert cache_generations.library.current() == before
+        
+        assert len(callbacks) == 1
+    
+    def test_search_keyset_pagination(self):
+        """Test next_cursor pages through newest-first results"""
+        self.client.force_authenticate(user=self.user)
+        expected = list(
+            LibraryItem.objects.filter(is_published=True)
+            .order_by('-created_at', '-id').values_list('title', flat=True)
+        )
+        
+        first = self.client.get(self.search_url, {'limit': 1})
+        assert [item['title'] for item in first.data['results']] == expected[:1]
+        assert first.data['next_cursor']
+        
+        second = self.client.get(self.search_url, {'limit': 1, 'cursor': first.data['next_cursor']})
+        assert second.status_code == status.HTTP_200_OK
+        assert [item['title'] for item in second.data['results']] == expected[1:2]
+        assert second.data['next_cursor'] is None
+        assert second.data['count'] is None
+    
+    def test_search_invalid_cursor(self):
+        """Test a malformed cursor is rejected"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.search_url, {'cursor': 'not-a-cursor'})
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
     def test_search_case_insensitive(self):
         """Test search is case insensitive"""
         self.client.force_authenticate(user=self.user)
@@ -122,16 +236,57 @@ class TestLibrarySearch:
         assert response1.status_code == status.HTTP_200_OK
         assert response2.status_code == status.HTTP_200_OK
         assert response1.data['count'] == response2.data['count']
+    
+    def test_search_matches_word_forms(self):
+        """Test full-text search matches other forms of a word"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.search_url, {'q': 'story'})
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert [item['title'] for item in response.data['results']] == ['Lango Stories']
+    
+    def test_search_matches_all_words(self):
+        """Test every word must match, in any order or field"""
+        self.client.force_authenticate(user=self.user)
+        # Both titles have "lango"; only one item mentions stories
+        response = self.client.get(self.search_url, {'q': 'stories lango'})
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert [item['title'] for item in response.data['results']] == ['Lango Stories']
+    
+    def test_search_fuzzy_respects_feature_flag(self, settings):
+        """Test fuzzy=true falls back to normal search when fuzzy is disabled"""
+        settings.FUZZY_SEARCH_ENABLED = False
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.search_url, {'q': 'stories', 'fuzzy': 'true'})
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert [item['title'] for item in response.data['results']] == ['Lango Stories']
+    
+    def test_search_short_query_matches_substring(self):
+        """Test queries too short for full-text search match substrings"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.search_url, {'q': 'ui'})
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert [item['title'] for item in response.data['results']] == ['Learning Lango']
+
+
+@pytest.fixture(scope='class')
+def library_member(class_db):
+    """Authenticated library user shared by a test class."""
+    return User.objects.create_user(username='testuser')
 
 
 @pytest.mark.django_db
 class TestLibrarySubmit:
     """Test library submission endpoint"""
     
-    def setup_method(self):
-        self.client = APIClient()
+    @pytest.fixture(autouse=True)
+    def setup(self, api_client, library_member):
+        self.client = api_client
         self.submit_url = '/api/library/submit'
-        self.user = User.objects.create_user(username='testuser', password='pass123')
+        self.user = library_member
     
     def test_submit_requires_authentication(self):
         """Test submission requires authentication"""
@@ -147,7 +302,7 @@ class TestLibrarySubmit:
             'description': 'A great resource',
             'url': 'http://example.com/resource'
         }
-        response = self.client.post(self.submit_url, data, format='json')
+        response = self.client.post(self.submit_url, json.dumps(data), content_type='application/json')
         
         assert response.status_code == status.HTTP_201_CREATED
         assert 'id' in response.data
@@ -155,15 +310,15 @@ class TestLibrarySubmit:
         assert response.data['status'] == 'pending'
         
         # Verify submission was created
-        submission = LibrarySubmission.objects.get(id=response.data['id'])
+        submission = LibrarySubmission.objects.only('title', 'submitted_by').get(id=response.data['id'])
         assert submission.title == 'New Resource'
-        assert submission.submitted_by == self.user
+        assert submission.submitted_by_id == self.user.id
     
     def test_submit_missing_title(self):
         """Test submission fails without title"""
         self.client.force_authenticate(user=self.user)
         data = {'description': 'No title'}
-        response = self.client.post(self.submit_url, data, format='json')
+        response = self.client.post(self.submit_url, json.dumps(data), content_type='application/json')
         
         assert response.status_code == status.HTTP_400_BAD_REQUEST
     
@@ -171,7 +326,7 @@ class TestLibrarySubmit:
         """Test submission fails with empty title"""
         self.client.force_authenticate(user=self.user)
         data = {'title': '   ', 'description': 'Empty title'}
-        response = self.client.post(self.submit_url, data, format='json')
+        response = self.client.post(self.submit_url, json.dumps(data), content_type='application/json')
         
         assert response.status_code == status.HTTP_400_BAD_REQUEST
     
@@ -179,23 +334,30 @@ class TestLibrarySubmit:
         """Test submission works with only required fields"""
         self.client.force_authenticate(user=self.user)
         data = {'title': 'Minimal Submission'}
-        response = self.client.post(self.submit_url, data, format='json')
+        response = self.client.post(self.submit_url, json.dumps(data), content_type='application/json')
         
         assert response.status_code == status.HTTP_201_CREATED
 
 
+@pytest.fixture(scope='class')
+def library_track_item(class_db):
+    """Published item the tracking tests record events against."""
+    return LibraryItem.objects.create(
+        title="Test Item",
+        is_published=True
+    )
+
+
 @pytest.mark.django_db
 class TestLibraryTrack:
     """Test library event tracking endpoint"""
     
-    def setup_method(self):
-        self.client = APIClient()
+    @pytest.fixture(autouse=True)
+    def setup(self, api_client, library_member, library_track_item):
+        self.client = api_client
         self.track_url = '/api/library/track'
-        self.user = User.objects.create_user(username='testuser', password='pass123')
-        self.item = LibraryItem.objects.create(
-            title="Test Item",
-            is_published=True
-        )
+        self.user = library_member
+        self.item = library_track_item
     
     def test_track_requires_authentication(self):
         """Test tracking requires authentication"""
@@ -203,48 +365,56 @@ class TestLibraryTrack:
         
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
     
-    def test_track_view_event(self):
-        """Test tracking a view event"""
+    @pytest.mark.parametrize('event_type', ['view', 'download', 'complete'])
+    def test_track_event(self, event_type):
+        """Test tracking each supported event type"""
         self.client.force_authenticate(user=self.user)
         data = {
             'item_id': self.item.id,
-            'event_type': 'view'
+            'event_type': event_type
         }
-        response = self.client.post(self.track_url, data, format='json')
+        response = self.client.post(self.track_url, json.dumps(data), content_type='application/json')
         
         assert response.status_code == status.HTTP_201_CREATED
         
         # Verify event was created
-        event = LibraryEvent.objects.latest('created_at')
+        event = LibraryEvent.objects.get(pk=response.data['event_id'])
         assert event.item == self.item
-        assert event.event_type == 'view'
+        assert event.event_type == event_type
         assert event.user == self.user
     
-    def test_track_download_event(self):
-        """Test tracking a download event"""
+    def test_track_view_without_rows(self, settings):
+        """Test views are only counted when view rows are turned off"""
+        from core import library_stats
+        settings.LIBRARY_VIEW_EVENT_ROWS = False
         self.client.force_authenticate(user=self.user)
-        data = {
-            'item_id': self.item.id,
-            'event_type': 'download'
-        }
-        response = self.client.post(self.track_url, data, format='json')
+        data = json.dumps({'item_id': self.item.id, 'event_type': 'view'})
+        before = library_stats.item_views(self.item.id)['total_views']
         
-        assert response.status_code == status.HTTP_201_CREATED
-        event = LibraryEvent.objects.latest('created_at')
-        assert event.event_type == 'download'
+        response = self.client.post(self.track_url, data, content_type='application/json')
+        
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert not LibraryEvent.objects.exists()
+        assert library_stats.item_views(self.item.id)['total_views'] == before + 1
     
-    def test_track_complete_event(self):
-        """Test tracking a complete event"""
+    def test_track_event_buffered(self, settings):
+        """Test batched events are accepted and written when the batch fills"""
+        from core import library_events
+        settings.LIBRARY_EVENT_BATCH_SIZE = 2
+        settings.LIBRARY_EVENT_FLUSH_SECONDS = 60
         self.client.force_authenticate(user=self.user)
-        data = {
-            'item_id': self.item.id,
-            'event_type': 'complete'
-        }
-        response = self.client.post(self.track_url, data, format='json')
-        
-        assert response.status_code == status.HTTP_201_CREATED
-        event = LibraryEvent.objects.latest('created_at')
-        assert event.event_type == 'complete'
+        data = json.dumps({'item_id': self.item.id, 'event_type': 'view'})
+        
+        try:
+            response = self.client.post(self.track_url, data, content_type='application/json')
+            assert response.status_code == status.HTTP_202_ACCEPTED
+            assert response.data['event_id'] is None
+            assert not LibraryEvent.objects.exists()
+            
+            self.client.post(self.track_url, data, content_type='application/json')
+            assert LibraryEvent.objects.filter(item=self.item, user=self.user).count() == 2
+        finally:
+            library_events.flush()
     
     def test_track_invalid_event_type(self):
         """Test tracking with invalid event type fails"""
@@ -253,10 +423,22 @@ class TestLibraryTrack:
             'item_id': self.item.id,
             'event_type': 'invalid'
         }
-        response = self.client.post(self.track_url, data, format='json')
+        response = self.client.post(self.track_url, json.dumps(data), content_type='application/json')
         
         assert response.status_code == status.HTTP_400_BAD_REQUEST
-    
+
+    @pytest.mark.parametrize('event_type', [['view'], {}])
+    def test_track_non_string_event_type(self, event_type):
+        """Test tracking with a list or object event type fails cleanly"""
+        self.client.force_authenticate(user=self.user)
+        data = {
+            'item_id': self.item.id,
+            'event_type': event_type
+        }
+        response = self.client.post(self.track_url, json.dumps(data), content_type='application/json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
     def test_track_nonexistent_item(self):
         """Test tracking non-existent item fails"""
         self.client.force_authenticate(user=self.user)
@@ -264,7 +446,7 @@ class TestLibraryTrack:
             'item_id': 99999,
             'event_type': 'view'
         }
-        response = self.client.post(self.track_url, data, format='json')
+        response = self.client.post(self.track_url, json.dumps(data), content_type='application/json')
         
         assert response.status_code == status.HTTP_404_NOT_FOUND
     
@@ -279,10 +461,66 @@ class TestLibraryTrack:
             'item_id': unpublished.id,
             'event_type': 'view'
         }
-        response = self.client.post(self.track_url, data, format='json')
+        response = self.client.post(self.track_url, json.dumps(data), content_type='application/json')
+        
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+    
+    def test_track_item_check_is_cached(self, django_assert_num_queries):
+        """Test repeat tracking checks the item without querying it"""
+        self.client.force_authenticate(user=self.user)
+        data = json.dumps({'item_id': self.item.id, 'event_type': 'download'})
+        self.client.post(self.track_url, data, content_type='application/json')
+        
+        # Only the event insert
+        with django_assert_num_queries(1):
+            response = self.client.post(self.track_url, data, content_type='application/json')
+        assert response.status_code == status.HTTP_201_CREATED
+    
+    def test_track_item_check_memoized(self, django_assert_num_queries):
+        """Test the published-id set is reused in process while unchanged"""
+        from core import cache_generations
+        self.client.force_authenticate(user=self.user)
+        data = json.dumps({'item_id': self.item.id, 'event_type': 'download'})
+        self.client.post(self.track_url, data, content_type='application/json')
+        
+        # Not re-read from the cache (nor rebuilt): only the event insert
+        cache.delete(f'library:published_ids:{cache_generations.library.current()}')
+        with django_assert_num_queries(1):
+            response = self.client.post(self.track_url, data, content_type='application/json')
+        
+        assert response.status_code == status.HTTP_201_CREATED
+    
+    def test_track_after_unpublish(self, django_capture_on_commit_callbacks):
+        """Test unpublishing an item is seen by the cached item check"""
+        self.client.force_authenticate(user=self.user)
+        data = json.dumps({'item_id': self.item.id, 'event_type': 'download'})
+        self.client.post(self.track_url, data, content_type='application/json')
+        
+        self.item.is_published = False
+        with django_capture_on_commit_callbacks(execute=True):
+            self.item.save()
+        response = self.client.post(self.track_url, data, content_type='application/json')
         
         assert response.status_code == status.HTTP_404_NOT_FOUND
     
+    def test_track_throttled(self, monkeypatch):
+        """Test tracking has its own per-user rate limit"""
+        from rest_framework.throttling import ScopedRateThrottle
+        monkeypatch.setitem(ScopedRateThrottle.THROTTLE_RATES, 'track', '2/min')
+        # Earlier tests in the class track as the same user
+        cache.clear()
+        self.client.force_authenticate(user=self.user)
+        data = json.dumps({'item_id': self.item.id, 'event_type': 'download'})
+        
+        responses = [
+            self.client.post(self.track_url, data, content_type='application/json')
+            for _ in range(3)
+        ]
+        
+        assert [r.status_code for r in responses] == [
+            status.HTTP_201_CREATED, status.HTTP_201_CREATED, status.HTTP_429_TOO_MANY_REQUESTS
+        ]
+    
     def test_track_invalid_item_id(self):
         """Test tracking with invalid item_id format"""
         self.client.force_authenticate(user=self.user)
@@ -290,35 +528,42 @@ class TestLibraryTrack:
             'item_id': 'invalid',
             'event_type': 'view'
         }
-        response = self.client.post(self.track_url, data, format='json')
+        response = self.client.post(self.track_url, json.dumps(data), content_type='application/json')
         
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
 
+@pytest.fixture(scope='class')
+def library_review_data(class_db):
+    """Manager, submitter and a pending submission shared by a review test class."""
+    # Manager with permissions and a regular user, in one INSERT
+    manager, user = User.objects.bulk_create([
+        User(username='manager', password=make_password(None), is_staff=True),
+        User(username='regular', password=make_password(None)),
+    ])
+    
+    # Tests read review results back from the database and never change
+    # the shared instance, so the view's writes roll back cleanly per test
+    submission = LibrarySubmission.objects.create(
+        title="Test Submission",
+        description="Test description",
+        url="http://example.com/test",
+        submitted_by=user,
+        status=LibrarySubmission.STATUS_PENDING
+    )
+    return SimpleNamespace(manager=manager, user=user, submission=submission)
+
+
 @pytest.mark.django_db
 class TestLibrarySubmissionApprove:
     """Test library submission approval endpoint"""
     
-    def setup_method(self):
-        self.client = APIClient()
-        
-        # Create manager user with permissions
-        self.manager = User.objects.create_user(username='manager', password='pass123')
-        self.manager.is_staff = True
-        self.manager.save()
-        
-        # Create regular user
-        self.user = User.objects.create_user(username='regular', password='pass123')
-        
-        # Create test submission
-        self.submission = LibrarySubmission.objects.create(
-            title="Test Submission",
-            description="Test description",
-            url="http://example.com/test",
-            submitted_by=self.user,
-            status=LibrarySubmission.STATUS_PENDING
-        )
-        
+    @pytest.fixture(autouse=True)
+    def setup(self, api_client, library_review_data):
+        self.client = api_client
+        self.manager = library_review_data.manager
+        self.user = library_review_data.user
+        self.submission = library_review_data.submission
         self.approve_url = f'/api/admin/library/submissions/{self.submission.id}/approve'
     
     def test_approve_requires_authentication(self):
@@ -343,16 +588,28 @@ class TestLibrarySubmissionApprove:
         assert 'item_id' in response.data
         
         # Verify submission was approved
-        self.submission.refresh_from_db()
-        assert self.submission.status == LibrarySubmission.STATUS_APPROVED
-        assert self.submission.reviewed_by == self.manager
-        assert self.submission.reviewed_at is not None
+        row = LibrarySubmission.objects.values('status', 'reviewed_by_id', 'reviewed_at').get(pk=self.submission.pk)
+        assert row['status'] == LibrarySubmission.STATUS_APPROVED
+        assert row['reviewed_by_id'] == self.manager.id
+        assert row['reviewed_at'] is not None
         
         # Verify library item was created
-        item = LibraryItem.objects.get(id=response.data['item_id'])
+        item = LibraryItem.objects.only('title', 'is_published').get(id=response.data['item_id'])
         assert item.title == self.submission.title
         assert item.is_published is True
     
+    def test_approve_locks_submission(self):
+        """Test approval reads the submission with a row lock"""
+        self.client.force_authenticate(user=self.manager)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(self.approve_url)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert any(
+            'FOR UPDATE' in q['sql'] and 'core_librarysubmission' in q['sql']
+            for q in ctx.captured_queries
+        )
+    
     def test_approve_nonexistent_submission(self):
         """Test approving non-existent submission"""
         self.client.force_authenticate(user=self.manager)
@@ -360,20 +617,13 @@ class TestLibrarySubmissionApprove:
         
         assert response.status_code == status.HTTP_404_NOT_FOUND
     
-    def test_approve_already_approved(self):
-        """Test approving already approved submission fails"""
-        self.submission.status = LibrarySubmission.STATUS_APPROVED
-        self.submission.save()
-        
-        self.client.force_authenticate(user=self.manager)
-        response = self.client.post(self.approve_url)
-        
-        assert response.status_code == status.HTTP_400_BAD_REQUEST
-    
-    def test_approve_already_rejected(self):
-        """Test approving already rejected submission fails"""
-        self.submission.status = LibrarySubmission.STATUS_REJECTED
-        self.submission.save()
+    @pytest.mark.parametrize('state', [
+        LibrarySubmission.STATUS_APPROVED,
+        LibrarySubmission.STATUS_REJECTED,
+    ])
+    def test_approve_already_reviewed(self, state):
+        """Test approving an already approved or rejected submission fails"""
+        LibrarySubmission.objects.filter(pk=self.submission.pk).update(status=state)
         
         self.client.force_authenticate(user=self.manager)
         response = self.client.post(self.approve_url)
@@ -385,20 +635,11 @@ class TestLibrarySubmissionApprove:
 class TestLibrarySubmissionReject:
     """Test library submission rejection endpoint"""
     
-    def setup_method(self):
-        self.client = APIClient()
-        
-        # Create manager user
-        self.manager = User.objects.create_user(username='manager', password='pass123')
-        self.manager.is_staff = True
-        self.manager.save()
-        
-        # Create test submission
-        self.submission = LibrarySubmission.objects.create(
-            title="Test Submission",
-            status=LibrarySubmission.STATUS_PENDING
-        )
-        
+    @pytest.fixture(autouse=True)
+    def setup(self, api_client, library_review_data):
+        self.client = api_client
+        self.manager = library_review_data.manager
+        self.submission = library_review_data.submission
         self.reject_url = f'/api/admin/library/submissions/{self.submission.id}/reject'
     
     def test_reject_requires_authentication(self):
@@ -411,16 +652,18 @@ class TestLibrarySubmissionReject:
         """Test successful submission rejection"""
         self.client.force_authenticate(user=self.manager)
         data = {'reason': 'Does not meet quality standards'}
-        response = self.client.post(self.reject_url, data, format='json')
+        response = self.client.post(self.reject_url, json.dumps(data), content_type='application/json')
         
         assert response.status_code == status.HTTP_200_OK
         
         # Verify submission was rejected
-        self.submission.refresh_from_db()
-        assert self.submission.status == LibrarySubmission.STATUS_REJECTED
-        assert self.submission.reviewed_by == self.manager
-        assert self.submission.reviewed_at is not None
-        assert self.submission.rejection_reason == 'Does not meet quality standards'
+        row = LibrarySubmission.objects.values(
+            'status', 'reviewed_by_id', 'reviewed_at', 'rejection_reason'
+        ).get(pk=self.submission.pk)
+        assert row['status'] == LibrarySubmission.STATUS_REJECTED
+        assert row['reviewed_by_id'] == self.manager.id
+        assert row['reviewed_at'] is not None
+        assert row['rejection_reason'] == 'Does not meet quality standards'
     
     def test_reject_without_reason(self):
         """Test rejection without reason still works"""
@@ -428,8 +671,8 @@ class TestLibrarySubmissionReject:
         response = self.client.post(self.reject_url)
         
         assert response.status_code == status.HTTP_200_OK
-        self.submission.refresh_from_db()
-        assert self.submission.status == LibrarySubmission.STATUS_REJECTED
+        row = LibrarySubmission.objects.values('status').get(pk=self.submission.pk)
+        assert row['status'] == LibrarySubmission.STATUS_REJECTED
     
     def test_reject_nonexistent_submission(self):
         """Test rejecting non-existent submission"""
@@ -478,7 +721,7 @@ class TestLibraryModels:
     
     def test_library_event_creation(self):
         """Test creating a library event"""
-        user = User.objects.create_user(username='testuser', password='pass123')
+        user = User.objects.create_user(username='testuser')
         item = LibraryItem.objects.create(
             title="Test Item",
             is_published=True
@@ -497,11 +740,12 @@ class TestLibraryModels:
     def test_library_event_cascade_delete(self):
         """Test events are deleted when item is deleted"""
         item = LibraryItem.objects.create(title="Test", is_published=True)
-        event = LibraryEvent.objects.create(
+        LibraryEvent.objects.create(
             item=item,
             event_type=LibraryEvent.EVENT_VIEW
         )
         
-        item.delete()
+        _, deleted = LibraryItem.objects.filter(pk=item.pk).delete()
         
-        assert not LibraryEvent.objects.filter(id=event.id).exists()
+        # The event went with the item; no follow-up query needed to check
+        assert deleted == {'core.LibraryItem': 1, 'core.LibraryEvent': 1}
@@ -1,9 +1,12 @@
 # core/tests/test_permissions.py
 
+from types import SimpleNamespace
+
 import pytest
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import Group, AnonymousUser
-from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.test import APIRequestFactory
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
@@ -18,6 +21,9 @@ from core.permissions import (
 
 User = get_user_model()
 
+# Request factories hold no per-request state; one serves every test
+_factory = APIRequestFactory()
+
 
 # Test view for permission testing
 class PermissionTestView(APIView):
@@ -28,14 +34,47 @@ class PermissionTestView(APIView):
         return Response({'method': 'POST'})
 
 
+@pytest.fixture(scope='module')
+def role_users(module_db):
+    """One user per role, shared read-only by every permission test class."""
+    # The role groups are created by core's post_migrate handler
+    groups = Group.objects.in_bulk(['manager', 'editor'], field_name='name')
+    manager_group, editor_group = groups['manager'], groups['editor']
+    
+    # All users in one INSERT; none needs a usable password
+    regular, staff, superuser, manager, editor = User.objects.bulk_create([
+        User(username='regular', password=make_password(None)),
+        User(username='staff', password=make_password(None), is_staff=True),
+        User(username='super', password=make_password(None), is_superuser=True),
+        User(username='manager', password=make_password(None)),
+        User(username='editor', password=make_password(None)),
+    ])
+    Membership = User.groups.through
+    Membership.objects.bulk_create([
+        Membership(user=manager, group=manager_group),
+        Membership(user=editor, group=editor_group),
+    ])
+    
+    return SimpleNamespace(
+        regular=regular,
+        staff=staff,
+        superuser=superuser,
+        manager=manager,
+        editor=editor,
+        manager_group=manager_group,
+        editor_group=editor_group,
+    )
+
+
 @pytest.mark.django_db
 class TestIsAuthenticatedOrReadOnly:
     """Test IsAuthenticatedOrReadOnly permission"""
     
-    def setup_method(self):
-        self.factory = APIRequestFactory()
+    @pytest.fixture(autouse=True)
+    def setup(self, role_users):
+        self.factory = _factory
         self.permission = IsAuthenticatedOrReadOnly()
-        self.user = User.objects.create_user(username='testuser', password='pass123')
+        self.user = role_users.regular
     
     def test_allows_read_for_anonymous(self):
         """Test GET requests allowed for anonymous users"""
@@ -47,7 +86,7 @@ class TestIsAuthenticatedOrReadOnly:
     def test_allows_read_for_authenticated(self):
         """Test GET requests allowed for authenticated users"""
         request = self.factory.get('/test/')
-        force_authenticate(request, user=self.user)
+        request.user = self.user
         
         assert self.permission.has_permission(request, PermissionTestView())
     
@@ -62,7 +101,6 @@ class TestIsAuthenticatedOrReadOnly:
         """Test POST requests allowed for authenticated users"""
         request = self.factory.post('/test/')
         request.user = self.user
-        force_authenticate(request, user=self.user)
         
         assert self.permission.has_permission(request, PermissionTestView())
     
@@ -70,7 +108,6 @@ class TestIsAuthenticatedOrReadOnly:
         """Test PUT requests allowed for authenticated users"""
         request = self.factory.put('/test/')
         request.user = self.user
-        force_authenticate(request, user=self.user)
         
         assert self.permission.has_permission(request, PermissionTestView())
     
@@ -86,25 +123,16 @@ class TestIsAuthenticatedOrReadOnly:
 class TestIsManagerOrAdmin:
     """Test IsManagerOrAdmin permission"""
     
-    def setup_method(self):
-        self.factory = APIRequestFactory()
+    @pytest.fixture(autouse=True)
+    def setup(self, role_users):
+        self.factory = _factory
         self.permission = IsManagerOrAdmin()
         
-        # Create different user types
-        self.regular_user = User.objects.create_user(username='regular', password='pass123')
-        
-        self.staff_user = User.objects.create_user(username='staff', password='pass123')
-        self.staff_user.is_staff = True
-        self.staff_user.save()
-        
-        self.superuser = User.objects.create_user(username='super', password='pass123')
-        self.superuser.is_superuser = True
-        self.superuser.save()
-        
-        # Create manager group and user (use get_or_create to avoid duplicates)
-        self.manager_group, _ = Group.objects.get_or_create(name='manager')
-        self.manager_user = User.objects.create_user(username='manager', password='pass123')
-        self.manager_user.groups.add(self.manager_group)
+        self.regular_user = role_users.regular
+        self.staff_user = role_users.staff
+        self.superuser = role_users.superuser
+        self.manager_group = role_users.manager_group
+        self.manager_user = role_users.manager
     
     def test_denies_anonymous(self):
         """Test permission denied for anonymous users"""
@@ -117,7 +145,6 @@ class TestIsManagerOrAdmin:
         """Test permission denied for regular authenticated users"""
         request = self.factory.get('/test/')
         request.user = self.regular_user
-        force_authenticate(request, user=self.regular_user)
         
         assert not self.permission.has_permission(request, PermissionTestView())
     
@@ -125,7 +152,6 @@ class TestIsManagerOrAdmin:
         """Test permission allowed for staff users"""
         request = self.factory.get('/test/')
         request.user = self.staff_user
-        force_authenticate(request, user=self.staff_user)
         
         assert self.permission.has_permission(request, PermissionTestView())
     
@@ -133,7 +159,6 @@ class TestIsManagerOrAdmin:
         """Test permission allowed for superusers"""
         request = self.factory.get('/test/')
         request.user = self.superuser
-        force_authenticate(request, user=self.superuser)
         
         assert self.permission.has_permission(request, PermissionTestView())
     
@@ -141,7 +166,6 @@ class TestIsManagerOrAdmin:
         """Test permission allowed for users in manager group"""
         request = self.factory.get('/test/')
         request.user = self.manager_user
-        force_authenticate(request, user=self.manager_user)
         
         assert self.permission.has_permission(request, PermissionTestView())
 
@@ -150,26 +174,17 @@ class TestIsManagerOrAdmin:
 class TestIsModeratorOrAdmin:
     """Test IsModeratorOrAdmin permission"""
     
-    def setup_method(self):
-        self.factory = APIRequestFactory()
+    @pytest.fixture(autouse=True)
+    def setup(self, role_users):
+        self.factory = _factory
         self.permission = IsModeratorOrAdmin()
         
-        # Create user types
-        self.regular_user = User.objects.create_user(username='regular', password='pass123')
-        
-        self.staff_user = User.objects.create_user(username='staff', password='pass123')
-        self.staff_user.is_staff = True
-        self.staff_user.save()
-        
-        # Create manager and editor groups (use get_or_create to avoid duplicates)
-        self.manager_group, _ = Group.objects.get_or_create(name='manager')
-        self.editor_group, _ = Group.objects.get_or_create(name='editor')
-        
-        self.manager_user = User.objects.create_user(username='manager', password='pass123')
-        self.manager_user.groups.add(self.manager_group)
-        
-        self.editor_user = User.objects.create_user(username='editor', password='pass123')
-        self.editor_user.groups.add(self.editor_group)
+        self.regular_user = role_users.regular
+        self.staff_user = role_users.staff
+        self.manager_group = role_users.manager_group
+        self.editor_group = role_users.editor_group
+        self.manager_user = role_users.manager
+        self.editor_user = role_users.editor
     
     def test_denies_anonymous(self):
         """Test permission denied for anonymous users"""
@@ -182,7 +197,6 @@ class TestIsModeratorOrAdmin:
         """Test permission denied for regular users"""
         request = self.factory.get('/test/')
         request.user = self.regular_user
-        force_authenticate(request, user=self.regular_user)
         
         assert not self.permission.has_permission(request, PermissionTestView())
     
@@ -190,7 +204,6 @@ class TestIsModeratorOrAdmin:
         """Test permission allowed for staff users"""
         request = self.factory.get('/test/')
         request.user = self.staff_user
-        force_authenticate(request, user=self.staff_user)
         
         assert self.permission.has_permission(request, PermissionTestView())
     
@@ -198,7 +211,6 @@ class TestIsModeratorOrAdmin:
         """Test permission allowed for manager group"""
         request = self.factory.get('/test/')
         request.user = self.manager_user
-        force_authenticate(request, user=self.manager_user)
         
         assert self.permission.has_permission(request, PermissionTestView())
     
@@ -206,7 +218,6 @@ class TestIsModeratorOrAdmin:
         """Test permission allowed for editor group"""
         request = self.factory.get('/test/')
         request.user = self.editor_user
-        force_authenticate(request, user=self.editor_user)
         
         assert self.permission.has_permission(request, PermissionTestView())
 
@@ -215,15 +226,13 @@ class TestIsModeratorOrAdmin:
 class TestIsStaffUser:
     """Test IsStaffUser permission"""
     
-    def setup_method(self):
-        self.factory = APIRequestFactory()
+    @pytest.fixture(autouse=True)
+    def setup(self, role_users):
+        self.factory = _factory
         self.permission = IsStaffUser()
         
-        self.regular_user = User.objects.create_user(username='regular', password='pass123')
-        
-        self.staff_user = User.objects.create_user(username='staff', password='pass123')
-        self.staff_user.is_staff = True
-        self.staff_user.save()
+        self.regular_user = role_users.regular
+        self.staff_user = role_users.staff
     
     def test_denies_anonymous(self):
         """Test permission denied for anonymous users"""
@@ -236,7 +245,6 @@ class TestIsStaffUser:
         """Test permission denied for regular users"""
         request = self.factory.get('/test/')
         request.user = self.regular_user
-        force_authenticate(request, user=self.regular_user)
         
         assert not self.permission.has_permission(request, PermissionTestView())
     
@@ -244,7 +252,6 @@ class TestIsStaffUser:
         """Test permission allowed for staff users"""
         request = self.factory.get('/test/')
         request.user = self.staff_user
-        force_authenticate(request, user=self.staff_user)
         
         assert self.permission.has_permission(request, PermissionTestView())
     
@@ -253,7 +260,6 @@ class TestIsStaffUser:
         for method in ['get', 'post', 'put', 'patch', 'delete']:
             request = getattr(self.factory, method)('/test/')
             request.user = self.staff_user
-            force_authenticate(request, user=self.staff_user)
             
             assert self.permission.has_permission(request, PermissionTestView())
 
@@ -262,15 +268,13 @@ class TestIsStaffUser:
 class TestIsStaffOrReadOnly:
     """Test IsStaffOrReadOnly permission"""
     
-    def setup_method(self):
-        self.factory = APIRequestFactory()
+    @pytest.fixture(autouse=True)
+    def setup(self, role_users):
+        self.factory = _factory
         self.permission = IsStaffOrReadOnly()
         
-        self.regular_user = User.objects.create_user(username='regular', password='pass123')
-        
-        self.staff_user = User.objects.create_user(username='staff', password='pass123')
-        self.staff_user.is_staff = True
-        self.staff_user.save()
+        self.regular_user = role_users.regular
+        self.staff_user = role_users.staff
     
     def test_allows_read_for_anonymous(self):
         """Test GET requests allowed for anonymous users"""
@@ -282,7 +286,7 @@ class TestIsStaffOrReadOnly:
     def test_allows_read_for_regular_user(self):
         """Test GET requests allowed for regular users"""
         request = self.factory.get('/test/')
-        force_authenticate(request, user=self.regular_user)
+        request.user = self.regular_user
         
         assert self.permission.has_permission(request, PermissionTestView())
     
@@ -290,7 +294,6 @@ class TestIsStaffOrReadOnly:
         """Test POST requests denied for regular users"""
         request = self.factory.post('/test/')
         request.user = self.regular_user
-        force_authenticate(request, user=self.regular_user)
         
         assert not self.permission.has_permission(request, PermissionTestView())
     
@@ -298,7 +301,6 @@ class TestIsStaffOrReadOnly:
         """Test POST requests allowed for staff users"""
         request = self.factory.post('/test/')
         request.user = self.staff_user
-        force_authenticate(request, user=self.staff_user)
         
         assert self.permission.has_permission(request, PermissionTestView())
 
@@ -307,19 +309,14 @@ class TestIsStaffOrReadOnly:
 class TestIsAdminOrReadOnly:
     """Test IsAdminOrReadOnly permission"""
     
-    def setup_method(self):
-        self.factory = APIRequestFactory()
+    @pytest.fixture(autouse=True)
+    def setup(self, role_users):
+        self.factory = _factory
         self.permission = IsAdminOrReadOnly()
         
-        self.regular_user = User.objects.create_user(username='regular', password='pass123')
-        
-        self.staff_user = User.objects.create_user(username='staff', password='pass123')
-        self.staff_user.is_staff = True
-        self.staff_user.save()
-        
-        self.superuser = User.objects.create_user(username='super', password='pass123')
-        self.superuser.is_superuser = True
-        self.superuser.save()
+        self.regular_user = role_users.regular
+        self.staff_user = role_users.staff
+        self.superuser = role_users.superuser
     
     def test_allows_read_for_everyone(self):
         """Test GET requests allowed for everyone"""
@@ -332,7 +329,6 @@ class TestIsAdminOrReadOnly:
         """Test POST requests denied for regular users"""
         request = self.factory.post('/test/')
         request.user = self.regular_user
-        force_authenticate(request, user=self.regular_user)
         
         assert not self.permission.has_permission(request, PermissionTestView())
     
@@ -340,7 +336,6 @@ class TestIsAdminOrReadOnly:
         """Test POST requests denied for staff users (not superuser)"""
         request = self.factory.post('/test/')
         request.user = self.staff_user
-        force_authenticate(request, user=self.staff_user)
         
         assert not self.permission.has_permission(request, PermissionTestView())
     
@@ -348,7 +343,6 @@ class TestIsAdminOrReadOnly:
         """Test POST requests allowed for superusers"""
         request = self.factory.post('/test/')
         request.user = self.superuser
-        force_authenticate(request, user=self.superuser)
         
         assert self.permission.has_permission(request, PermissionTestView())
 
@@ -378,10 +372,21 @@ class TestPermissionHelpers:
         user.groups.add(manager_group)
         
         # Should pass both IsManagerOrAdmin and IsStaffUser
-        factory = APIRequestFactory()
-        request = factory.get('/test/')
+        request = _factory.get('/test/')
         request.user = user
-        force_authenticate(request, user=user)
         
         assert IsManagerOrAdmin().has_permission(request, PermissionTestView())
         assert IsStaffUser().has_permission(request, PermissionTestView())
+
+    def test_group_lookup_cached_per_user(self, django_assert_num_queries):
+        """Test group names are fetched once and reused across checks"""
+        user = User.objects.create_user(username='editor2', password='pass123')
+        editor_group, _ = Group.objects.get_or_create(name='editor')
+        user.groups.add(editor_group)
+        
+        request = _factory.get('/test/')
+        request.user = user
+        
+        with django_assert_num_queries(1):
+            assert IsModeratorOrAdmin().has_permission(request, PermissionTestView())
+            assert not IsManagerOrAdmin().has_permission(request, PermissionTestView())
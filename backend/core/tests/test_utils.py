@@ -0,0 +1,171 @@
+# core/tests/test_utils.py
+
+import pytest
+from django.test import RequestFactory
+
+from core.models import DictionaryEntry, LibraryCategory
+from core.utils import (
+    clamp_int_param,
+    format_file_size,
+    generate_unique_slug,
+    paginate_queryset,
+    sanitize_search_query,
+)
+
+
+@pytest.mark.django_db
+class TestGenerateUniqueSlug:
+    """Test unique slug generation"""
+
+    def test_free_slug_is_used(self):
+        """Test an unused slug is returned unchanged"""
+        assert generate_unique_slug(LibraryCategory, "Old Books") == "old-books"
+
+    def test_first_free_suffix_in_one_query(self, django_assert_num_queries):
+        """Test taken slugs get the first free counter from a single lookup"""
+        LibraryCategory.objects.bulk_create([
+            LibraryCategory(name="Books", slug="books"),
+            LibraryCategory(name="Books 1", slug="books-1"),
+            LibraryCategory(name="Books 3", slug="books-3"),
+            LibraryCategory(name="Bookshelf", slug="books-shelf"),
+        ])
+
+        with django_assert_num_queries(1):
+            assert generate_unique_slug(LibraryCategory, "Books") == "books-2"
+
+
+class TestSanitizeSearchQuery:
+    """Test search query cleanup"""
+
+    @pytest.mark.parametrize("raw,expected", [
+        ("", ""),
+        ("  leb   lango\t\n", "leb lango"),
+        ("drop'; table--", "drop table--"),
+        ("a" * 250, "a" * 200),
+    ])
+    def test_sanitize(self, raw, expected):
+        """Test unsafe characters are dropped, length capped and spaces collapsed"""
+        assert sanitize_search_query(raw) == expected
+
+
+class TestFormatFileSize:
+    """Test human-readable file sizes"""
+
+    @pytest.mark.parametrize("size,expected", [
+        (0, "0.0 B"),
+        (1023, "1023.0 B"),
+        (1024, "1.0 KB"),
+        (1536, "1.5 KB"),
+        (5 * 1024 ** 2, "5.0 MB"),
+        (3 * 1024 ** 6, "3072.0 PB"),
+    ])
+    def test_format(self, size, expected):
+        """Test the unit steps every 1024 and stops at PB"""
+        assert format_file_size(size) == expected
+
+    def test_float_size(self):
+        """Test float sizes are accepted and keep their fraction"""
+        assert format_file_size(1536.0) == "1.5 KB"
+        assert format_file_size(512.5) == "512.5 B"
+
+
+class TestClampIntParam:
+    """Test bounded integer query parameter parsing"""
+
+    @pytest.mark.parametrize("raw,expected", [
+        (None, 20), ("", 20), ("abc", 20), ("5", 5), ("0", 1), ("500", 100),
+    ])
+    def test_clamp(self, raw, expected):
+        """Test missing/invalid values fall back and others are bounded"""
+        params = {} if raw is None else {"limit": raw}
+        request = RequestFactory().get("/", params)
+
+        assert clamp_int_param(request, "limit", 20, 1, 100) == expected
+
+    def test_no_upper_bound(self):
+        """Test hi=None only enforces the lower bound"""
+        request = RequestFactory().get("/", {"offset": "100000"})
+
+        assert clamp_int_param(request, "offset", 0, 0) == 100000
+
+
+@pytest.mark.django_db
+class TestPaginateQueryset:
+    """Test offset pagination with a windowed total"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        DictionaryEntry.objects.bulk_create(
+            DictionaryEntry(lemma=lemma) for lemma in ("a", "b", "c", "d", "e")
+        )
+        self.qs = DictionaryEntry.objects.order_by("lemma")
+
+    def test_page_and_total_in_one_query(self, django_assert_num_queries):
+        """Test the total rides along with the page rows"""
+        request = RequestFactory().get("/", {"limit": "2", "offset": "1"})
+
+        with django_assert_num_queries(1):
+            page, total, limit, offset = paginate_queryset(self.qs, request)
+
+        assert [entry.lemma for entry in page] == ["b", "c"]
+        assert (total, limit, offset) == (5, 2, 1)
+
+    def test_values_rows_drop_the_total(self):
+        """Test values() rows don't carry the window column"""
+        request = RequestFactory().get("/", {"limit": "2"})
+
+        page, total, _, _ = paginate_queryset(self.qs.values("lemma"), request)
+
+        assert page == [{"lemma": "a"}, {"lemma": "b"}]
+        assert total == 5
+
+    def test_offset_past_end_still_counts(self):
+        """Test an empty page past the end still reports the total"""
+        request = RequestFactory().get("/", {"offset": "10"})
+
+        page, total, _, _ = paginate_queryset(self.qs, request)
+
+        assert page == []
+        assert total == 5
+
+
+class TestORJSONRenderer:
+    """Test the orjson renderer matches DRF's JSONRenderer output"""
+
+    def test_matches_drf_renderer(self):
+        """Test datetimes, decimals, lazy strings and separators encode identically"""
+        from datetime import datetime, timezone as dt_timezone
+        from decimal import Decimal
+        from django.utils.translation import gettext_lazy
+        from rest_framework.renderers import JSONRenderer
+        from core.renderers import ORJSONRenderer
+
+        data = {
+            'when': datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=dt_timezone.utc),
+            'amount': Decimal('1.50'),
+            'detail': gettext_lazy('Not found.'),
+            'text': 'Lango \u2028\u2029 \u014b',
+            'rows': [{'query': 'a', 'times': 3}],
+            1: None,
+        }
+
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+        assert ORJSONRenderer().render(None) == b''
+
+
+class TestORJSONParser:
+    """Test the orjson parser matches DRF's JSONParser"""
+
+    def test_matches_drf_parser(self):
+        """Test valid bodies decode identically and bad ones raise ParseError"""
+        import io
+        from rest_framework.exceptions import ParseError
+        from rest_framework.parsers import JSONParser
+        from core.parsers import ORJSONParser
+
+        body = '{"entries": [{"lemma": "\u014bat", "n": 1.5, "big": 18446744073709551616}]}'.encode()
+        assert ORJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(io.BytesIO(body))
+
+        for bad in (b'{"entries": [', b'{"n": NaN}'):
+            with pytest.raises(ParseError):
+                ORJSONParser().parse(io.BytesIO(bad))
@@ -0,0 +1,39 @@
+"""
+Turns away clients an auth throttle has already refused, before DRF runs.
+"""
+
+import math
+
+from django.http import JsonResponse
+from rest_framework.exceptions import Throttled
+
+from .throttles import AuthRateThrottle
+
+
+class ThrottleBlacklistMiddleware:
+    """
+    For views throttled by AuthRateThrottle, answer 429 straight from the
+    block the throttle recorded, with a single cache read. A brute-force
+    burst past the limit then never gets to DRF's authentication (a token
+    lookup when a header is sent), request parsing or the view.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, "cls", None)
+        if AuthRateThrottle not in getattr(view_class, "throttle_classes", ()):
+            return None
+
+        remaining = AuthRateThrottle().blocked_for(request)
+        if remaining is None:
+            return None
+
+        wait = math.ceil(remaining)
+        response = JsonResponse({"detail": Throttled(wait).detail}, status=429)
+        response["Retry-After"] = str(wait)
+        return response
@@ -1,5 +1,75 @@
-from rest_framework.throttling import UserRateThrottle
+import hashlib
+import math
+
+from rest_framework.throttling import SimpleRateThrottle, UserRateThrottle
 
 
 class StrictWriteThrottle(UserRateThrottle):
     rate = '30/min'
+
+
+class AuthRateThrottle(SimpleRateThrottle):
+    """
+    Custom throttle for auth endpoints - more restrictive to prevent brute force
+    5 attempts per minute per IP address
+
+    Runs before the view, so throttled attempts never reach the password
+    hasher. Keyed by IP even when the request carries credentials (a valid
+    token must not lift the limit), and kept in its own scope so ordinary
+    anonymous traffic doesn't use up the login budget.
+
+    Counts attempts per fixed window with cache add()/incr() instead of
+    SimpleRateThrottle's read-modify-write of a timestamp list, which lets
+    concurrent workers each read the same history and admit extra
+    attempts. On Redis both are single atomic commands.
+
+    A refused client is also recorded as blocked until the window ends, so
+    ThrottleBlacklistMiddleware can turn its retries away before DRF runs.
+    """
+    scope = 'auth'
+    rate = '5/min'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': self.get_ident(request),
+        }
+
+    def get_blocked_key(self, request):
+        # Hashed so any X-Forwarded-For string makes a safe, fixed-size key
+        ident = hashlib.sha256(self.get_ident(request).encode()).hexdigest()
+        return f"throttle_{self.scope}_blocked_{ident}"
+
+    def allow_request(self, request, view):
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        self.key = f"{self.get_cache_key(request, view)}:{window}"
+
+        if self.cache.add(self.key, 1, self.duration):
+            return True
+        try:
+            attempts = self.cache.incr(self.key)
+        except ValueError:
+            # Expired between add() and incr(): this attempt opens a new count
+            self.cache.add(self.key, 1, self.duration)
+            return True
+        if attempts <= self.num_requests:
+            return True
+
+        wait = self.wait()
+        self.cache.set(self.get_blocked_key(request), self.now + wait, math.ceil(wait))
+        return False
+
+    def wait(self):
+        return self.duration - self.now % self.duration
+
+    def blocked_for(self, request):
+        """
+        Seconds left on a block recorded for this client, or None. One
+        cache read, no database access.
+        """
+        until = self.cache.get(self.get_blocked_key(request))
+        if until is None:
+            return None
+        remaining = until - self.timer()
+        return remaining if remaining > 0 else None
@@ -102,6 +102,11 @@ urlpatterns = [
         views_analytics.LibraryAnalyticsOverview.as_view(),
         name="analytics-library-overview",
     ),
+    path(
+        "admin/analytics/library/items/<int:pk>/views",
+        views_analytics.LibraryItemViews.as_view(),
+        name="analytics-library-item-views",
+    ),
     path(
         "admin/analytics/dictionary/overview",
         views_analytics.DictionaryAnalyticsOverview.as_view(),
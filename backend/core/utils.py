@@ -4,8 +4,14 @@ Utility functions for the core app
 
 import re
 from typing import Optional
+from django.db.models import Count, Window
+from django.utils.http import parse_etags
 from django.utils.text import slugify as django_slugify
 
+_UNSAFE_SEARCH_CHARS_RE = re.compile(r'[^\w\s\-]')
+_WHITESPACE_RE = re.compile(r'\s+')
+_FILE_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
 
 def generate_unique_slug(model_class, title: str, slug_field: str = 'slug') -> str:
     """
@@ -20,10 +26,17 @@ def generate_unique_slug(model_class, title: str, slug_field: str = 'slug') -> s
         A unique slug string
     """
     base_slug = django_slugify(title)
+
+    # Fetch the base slug and its numbered variants in one query
+    taken = set(
+        model_class.objects.filter(
+            **{f'{slug_field}__regex': rf'^{re.escape(base_slug)}(-[0-9]+)?$'}
+        ).values_list(slug_field, flat=True)
+    )
+
     slug = base_slug
     counter = 1
-
-    while model_class.objects.filter(**{slug_field: slug}).exists():
+    while slug in taken:
         slug = f"{base_slug}-{counter}"
         counter += 1
 
@@ -43,16 +56,11 @@ def sanitize_search_query(query: str) -> str:
     if not query:
         return ""
 
-    # Remove potentially dangerous characters
-    query = re.sub(r'[^\w\s\-]', '', query)
+    # Remove potentially dangerous characters, then limit length
+    query = _UNSAFE_SEARCH_CHARS_RE.sub('', query)[:200]
 
-    # Limit length
-    query = query[:200]
-
-    # Remove extra whitespace
-    query = ' '.join(query.split())
-
-    return query.strip()
+    # Collapse runs of whitespace
+    return _WHITESPACE_RE.sub(' ', query).strip()
 
 
 def get_client_ip(request) -> Optional[str]:
@@ -84,11 +92,49 @@ def format_file_size(bytes_size: int) -> str:
     Returns:
         Formatted string (e.g., "1.5 MB")
     """
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if bytes_size < 1024.0:
-            return f"{bytes_size:.1f} {unit}"
-        bytes_size /= 1024.0
-    return f"{bytes_size:.1f} PB"
+    # Each unit is 2**10 of the previous one, so the bit length picks it;
+    # int() because sizes can arrive as floats (e.g. from aggregates)
+    exponent = min(max(int(bytes_size).bit_length() - 1, 0) // 10, len(_FILE_SIZE_UNITS) - 1)
+    return f"{bytes_size / (1 << (10 * exponent)):.1f} {_FILE_SIZE_UNITS[exponent]}"
+
+
+def clamp_int_param(request, name: str, default: int, lo: int, hi: Optional[int] = None) -> int:
+    """
+    Read an integer query parameter, bounded to [lo, hi].
+
+    Args:
+        request: Django or DRF request object
+        name: Query parameter name
+        default: Value used when the parameter is missing or not an integer
+        lo: Smallest allowed value
+        hi: Largest allowed value (None for no upper bound)
+
+    Returns:
+        The clamped integer
+    """
+    try:
+        value = int(request.GET.get(name) or default)
+    except (ValueError, TypeError):
+        value = default
+    if hi is not None:
+        value = min(value, hi)
+    return max(lo, value)
+
+
+def etag_matches(request, etag: str) -> bool:
+    """
+    Check If-None-Match against an ETag using weak comparison (RFC 9110),
+    so W/"..." tags re-sent by proxies or gzip middleware still match.
+
+    Args:
+        request: Django or DRF request object
+        etag: Quoted ETag of the current representation
+
+    Returns:
+        True if the client already holds this representation
+    """
+    candidates = parse_etags(request.headers.get('If-None-Match', ''))
+    return any(tag == '*' or tag.removeprefix('W/') == etag for tag in candidates)
 
 
 def paginate_queryset(queryset, request, default_limit: int = 20):
@@ -101,7 +147,7 @@ def paginate_queryset(queryset, request, default_limit: int = 20):
         default_limit: Default number of items per page
 
     Returns:
-        Tuple of (paginated_queryset, total_count, limit, offset)
+        Tuple of (page rows as a list, total_count, limit, offset)
     """
     try:
         limit = int(request.GET.get('limit', default_limit))
@@ -115,7 +161,21 @@ def paginate_queryset(queryset, request, default_limit: int = 20):
     except (ValueError, TypeError):
         offset = 0
 
-    total_count = queryset.count()
-    paginated = queryset[offset:offset + limit]
+    # COUNT(*) OVER () carries the total on every row, so the page and the
+    # count come back in one query
+    paginated = list(
+        queryset.annotate(_total_count=Window(Count('*')))[offset:offset + limit]
+    )
+    if not paginated:
+        # No row to read the total from; only an offset past the end can
+        # still have matches
+        return paginated, queryset.count() if offset else 0, limit, offset
+
+    if isinstance(paginated[0], dict):
+        total_count = paginated[0]['_total_count']
+        for row in paginated:
+            del row['_total_count']
+    else:
+        total_count = paginated[0]._total_count
 
-    return paginated, total_count, limit, offset
\ No newline at end of file
+    return paginated, total_count, limit, offset
@@ -1,11 +1,13 @@
 # core/views_analytics.py
 
+from django.core.cache import cache
 from django.db.models import Count, Q
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 
-from .models import SearchQueryLog, LibraryEvent
+from . import library_stats, search_stats
+from .models import LibraryEvent
 from .permissions import IsStaffUser
 
 
@@ -18,15 +20,20 @@ class QueryHealthSummary(APIView):
     permission_classes = [IsStaffUser]
 
     def get(self, request):
-        total = SearchQueryLog.objects.count()
-        no_results = SearchQueryLog.objects.filter(has_results=False).count()
+        # Totals and top list come from the hourly rollup when it's enabled,
+        # so neither aggregates the raw log on every request
+        counts = search_stats.search_rows().aggregate(
+            total=search_stats.searches(),
+            no_results=search_stats.searches(filter=Q(has_results=False)),
+        )
+        total, no_results = counts["total"], counts["no_results"]
         with_results = total - no_results
 
         top_missing = (
-            SearchQueryLog.objects.filter(has_results=False)
+            search_stats.search_rows(has_results=False)
             .values("query")
-            .annotate(count=Count("id"))
-            .order_by("-count")[:20]
+            .annotate(count=search_stats.searches())
+            .order_by("-count", "query")[:20]
         )
 
         return Response(
@@ -46,45 +53,63 @@ class LibraryAnalyticsOverview(APIView):
     GET /api/admin/analytics/library/overview
 
     Aggregate views/downloads/completions for all items.
+
+    Cached briefly so auto-refreshing dashboards share one aggregate.
     """
     permission_classes = [IsStaffUser]
 
     def get(self, request):
-        agg = (
-            LibraryEvent.objects.values("event_type")
+        payload = cache.get_or_set("analytics:library:overview", self._overview, timeout=60)
+        return Response(payload, status=status.HTTP_200_OK)
+
+    @staticmethod
+    def _overview() -> dict:
+        by_type = dict(
+            LibraryEvent.objects.order_by()
+            .values_list("event_type")
             .annotate(count=Count("id"))
-            .order_by()
         )
-        by_type = {row["event_type"]: row["count"] for row in agg}
+        return {
+            "total_events": sum(by_type.values()),
+            "by_type": by_type,
+        }
 
-        return Response(
-            {
-                "total_events": sum(by_type.values()),
-                "by_type": by_type,
-            },
-            status=status.HTTP_200_OK,
-        )
+
+class LibraryItemViews(APIView):
+    """
+    GET /api/admin/analytics/library/items/<pk>/views
+
+    Total views and distinct viewers per day for one item, read from the
+    cache counters LibraryTrack maintains.
+    """
+    permission_classes = [IsStaffUser]
+
+    def get(self, request, pk):
+        return Response(library_stats.item_views(pk), status=status.HTTP_200_OK)
 
 
 class DictionaryAnalyticsOverview(APIView):
     """
     GET /api/admin/analytics/dictionary/overview
+
+    Cached briefly so auto-refreshing dashboards share one aggregate.
     """
     permission_classes = [IsStaffUser]
 
     def get(self, request):
-        total = SearchQueryLog.objects.filter(source="dictionary").count()
-        no_results = SearchQueryLog.objects.filter(
-            source="dictionary", has_results=False
-        ).count()
-        with_results = total - no_results
-
-        return Response(
-            {
-                "total_queries": total,
-                "with_results": with_results,
-                "no_results": no_results,
-                "no_results_rate": (no_results / total) if total else 0,
-            },
-            status=status.HTTP_200_OK,
+        payload = cache.get_or_set("analytics:dictionary:overview", self._overview, timeout=60)
+        return Response(payload, status=status.HTTP_200_OK)
+
+    @staticmethod
+    def _overview() -> dict:
+        counts = search_stats.search_rows(source="dictionary").aggregate(
+            total=search_stats.searches(),
+            no_results=search_stats.searches(filter=Q(has_results=False)),
         )
+        total, no_results = counts["total"], counts["no_results"]
+        return {
+            "total_queries": total,
+            "with_results": total - no_results,
+            "no_results": no_results,
+            "no_results_rate": (no_results / total) if total else 0,
+        }
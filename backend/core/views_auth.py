@@ -2,19 +2,11 @@ from rest_framework import status, permissions
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.authtoken.models import Token
-from rest_framework.throttling import AnonRateThrottle
 from django.contrib.auth import authenticate
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 
 from .serializers import SignUpSerializer
-
-
-class AuthRateThrottle(AnonRateThrottle):
-    """
-    Custom throttle for auth endpoints - more restrictive to prevent brute force
-    5 attempts per minute per IP address
-    """
-    rate = '5/min'
+from .throttles import AuthRateThrottle
 
 
 @extend_schema(
@@ -40,7 +32,9 @@ class SignUp(APIView):
         serializer = SignUpSerializer(data=request.data)
         if serializer.is_valid():
             user = serializer.save()
-            token, _ = Token.objects.get_or_create(user=user)
+            # A brand-new user can't have a token yet: INSERT without the
+            # SELECT (and savepoint) get_or_create would spend checking
+            token = Token.objects.create(user=user)
             return Response(
                 {
                     "token": token.key,
@@ -102,14 +96,15 @@ class SignIn(APIView):
         # authenticate() returns None for both wrong password AND inactive users
         User = get_user_model()
         try:
-            user_obj = User.objects.get(username=username)
+            # The token rides along so a successful login needs no extra query
+            user_obj = User.objects.select_related("auth_token").get(username=username)
             if not user_obj.is_active:
                 return Response(
                     {"detail": "Account is disabled."},
                     status=status.HTTP_403_FORBIDDEN,
                 )
         except User.DoesNotExist:
-            pass  # Will be handled by authenticate below
+            user_obj = None  # Will be handled by authenticate below
         
         user = authenticate(username=username, password=password)
         
@@ -119,7 +114,11 @@ class SignIn(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        token, _ = Token.objects.get_or_create(user=user)
+        # Reuse the token loaded with the user; only a first login creates one
+        if user_obj is not None and user_obj.pk == user.pk and hasattr(user_obj, "auth_token"):
+            token = user_obj.auth_token
+        else:
+            token, _ = Token.objects.get_or_create(user=user)
         return Response({
             "token": token.key,
             "user": {
@@ -1,13 +1,60 @@
 # core/views_dictionary.py
 
-from django.db.models import Q, Value, FloatField
-from django.contrib.postgres.search import TrigramSimilarity
+import base64
+import binascii
+import hashlib
+
+from django.db.models import F, Q
+from django.db.models.functions import Greatest, Substr
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
 from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import patch_cache_control
+from django.utils.http import quote_etag
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import permissions, status
 
-from .models import DictionaryEntry, SearchQueryLog
+from . import cache_generations
+from .models import DictionaryEntry
+from .search_logging import log_search
+from .utils import clamp_int_param, etag_matches
+
+# pg_trgm.similarity_threshold default, used by the % (trigram_similar) operator
+TRGM_DEFAULT_THRESHOLD = 0.3
+
+# Columns the public endpoints return; everything else stays unread
+PUBLIC_ENTRY_FIELDS = ("id", "lemma", "gloss_ll", "gloss_en")
+# Per-field scores reported alongside fuzzy results
+SIMILARITY_FIELDS = ("lemma_sim", "gloss_ll_sim", "gloss_en_sim")
+
+# How long a search's total match count is reused across pages
+SEARCH_COUNT_CACHE_SECONDS = 60
+
+
+# How long autocomplete suggestions for a prefix are reused
+AUTOCOMPLETE_CACHE_SECONDS = 300
+# Characters of gloss_en shown with each suggestion
+AUTOCOMPLETE_GLOSS_PREVIEW_CHARS = 50
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()[:32]
+
+
+def _count_cache_key(search_type: str, q: str, threshold: float) -> str:
+    return f"dict:search:count:{cache_generations.dictionary.current()}:{search_type}:{threshold}:{_digest(q)}"
+
+
+def _encode_cursor(lemma: str) -> str:
+    return base64.urlsafe_b64encode(lemma.encode()).decode()
+
+
+def _decode_cursor(cursor: str):
+    try:
+        return base64.b64decode(cursor, altchars=b"-_", validate=True).decode()
+    except (binascii.Error, UnicodeError):
+        return None
 
 
 class PublicDictionarySearch(APIView):
@@ -21,23 +68,48 @@ class PublicDictionarySearch(APIView):
     - Fuzzy/typo tolerance using PostgreSQL trigrams
     - Configurable similarity threshold
     - Auto-suggest capability
+    - Whole-word full-text matching (fulltext=true) over the GIN-indexed
+      search_vector, ranked with lemma hits first
+    - Keyset paging for lemma-ordered results (browse/exact): pass the
+      returned next_cursor as cursor= instead of growing the offset
     """
     permission_classes = [permissions.AllowAny]
 
     def get(self, request):
         q = (request.GET.get("q") or "").strip()
-        use_fuzzy = request.GET.get("fuzzy", "true").lower() == "true"
+        use_fulltext = request.GET.get("fulltext", "false").lower() == "true"
+        use_fuzzy = not use_fulltext and request.GET.get("fuzzy", "true").lower() == "true"
         
         # Get fuzzy search settings
         fuzzy_enabled = getattr(settings, 'FUZZY_SEARCH_ENABLED', True)
-        similarity_threshold = float(request.GET.get("similarity", "0.3"))
+        try:
+            similarity_threshold = float(request.GET.get("similarity") or TRGM_DEFAULT_THRESHOLD)
+        except ValueError:
+            similarity_threshold = TRGM_DEFAULT_THRESHOLD
         similarity_threshold = max(0.1, min(similarity_threshold, 1.0))  # Clamp 0.1-1.0
 
         qs = DictionaryEntry.objects.all()
 
         if q:
-            if fuzzy_enabled and use_fuzzy:
+            if use_fulltext:
+                # FULL-TEXT SEARCH: whole words, served by dictentry_vector_gin
+                query = SearchQuery(q, config="simple", search_type="websearch")
+                qs = (
+                    qs.filter(search_vector=query)
+                    .annotate(rank=SearchRank(F("search_vector"), query))
+                    .order_by('-rank', 'lemma')
+                )
+            elif fuzzy_enabled and use_fuzzy:
                 # FUZZY SEARCH: Use PostgreSQL trigram similarity
+                if similarity_threshold >= TRGM_DEFAULT_THRESHOLD:
+                    # The % operator can use the GIN trigram indexes (0008);
+                    # at pg_trgm's default threshold it matches a superset
+                    # of the rows kept by the exact similarity filter below.
+                    qs = qs.filter(
+                        Q(lemma__trigram_similar=q) |
+                        Q(gloss_ll__trigram_similar=q) |
+                        Q(gloss_en__trigram_similar=q)
+                    )
                 qs = (
                     qs.annotate(
                         # Calculate similarity scores for each field
@@ -47,14 +119,10 @@ class PublicDictionarySearch(APIView):
                     )
                     # Use the highest similarity score
                     .annotate(
-                        max_similarity=Value(0.0, output_field=FloatField())
+                        max_similarity=Greatest('lemma_sim', 'gloss_ll_sim', 'gloss_en_sim')
                     )
                     # Filter by threshold
-                    .filter(
-                        Q(lemma_sim__gt=similarity_threshold) |
-                        Q(gloss_ll_sim__gt=similarity_threshold) |
-                        Q(gloss_en_sim__gt=similarity_threshold)
-                    )
+                    .filter(max_similarity__gt=similarity_threshold)
                     # Order by best match first (prioritize lemma matches)
                     .order_by('-lemma_sim', '-gloss_ll_sim', '-gloss_en_sim')
                 )
@@ -71,48 +139,76 @@ class PublicDictionarySearch(APIView):
             qs = qs.order_by('lemma')
 
         # Pagination
-        try:
-            limit = int(request.GET.get("limit", 20))
-        except ValueError:
-            limit = 20
-        try:
-            offset = int(request.GET.get("offset", 0))
-        except ValueError:
-            offset = 0
+        limit = clamp_int_param(request, "limit", 20, 1, 100)
+        offset = clamp_int_param(request, "offset", 0, 0)
 
-        limit = max(1, min(limit, 100))
-        offset = max(0, offset)
+        # Results ordered by lemma can seek past the last lemma seen, which
+        # the lemma index serves without reading the skipped rows
+        keyset = not q or not (use_fulltext or (fuzzy_enabled and use_fuzzy))
+        cursor = request.GET.get("cursor")
+        # Plain dicts of just the returned columns; no model instances
+        scored = bool(q) and fuzzy_enabled and use_fuzzy and not use_fulltext
+        rows = qs.values(*PUBLIC_ENTRY_FIELDS, *(SIMILARITY_FIELDS if scored else ()))
+        if keyset and cursor:
+            after = _decode_cursor(cursor)
+            if after is None:
+                return Response(
+                    {"detail": "Invalid cursor."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            page = list(rows.filter(lemma__gt=after)[: limit + 1])
+        else:
+            # Slice results (one extra row tells whether a next page exists)
+            page = list(rows[offset : offset + limit + 1])
+        has_more = len(page) > limit
+        page = page[:limit]
 
-        # Get total count before slicing
-        total_count = qs.count()
-        
-        # Slice results
-        sliced = qs[offset : offset + limit]
+        search_type = (
+            "fulltext" if (use_fulltext and q)
+            else "fuzzy" if (fuzzy_enabled and use_fuzzy and q)
+            else "exact"
+        )
+
+        # A short last page already gives the total; otherwise count, and
+        # cache it briefly since the fuzzy COUNT repeats the whole scan
+        if not has_more and not (keyset and cursor) and (page or not offset):
+            total_count = offset + len(page)
+        else:
+            total_count = cache.get_or_set(
+                _count_cache_key(search_type, q, similarity_threshold),
+                qs.count,
+                timeout=SEARCH_COUNT_CACHE_SECONDS,
+            )
 
         # Build response
         results = []
-        for e in sliced:
-            result = {
-                "id": e.id,
-                "lemma": e.lemma,
-                "gloss_ll": e.gloss_ll,
-                "gloss_en": e.gloss_en,
-            }
+        for e in page:
+            result = {field: e[field] for field in PUBLIC_ENTRY_FIELDS}
             
             # Include similarity scores if fuzzy search was used
             if fuzzy_enabled and use_fuzzy and q:
                 result["similarity"] = {
-                    "lemma": round(getattr(e, 'lemma_sim', 0.0), 3),
-                    "gloss_ll": round(getattr(e, 'gloss_ll_sim', 0.0), 3),
-                    "gloss_en": round(getattr(e, 'gloss_en_sim', 0.0), 3),
+                    "lemma": round(e.get('lemma_sim', 0.0), 3),
+                    "gloss_ll": round(e.get('gloss_ll_sim', 0.0), 3),
+                    "gloss_en": round(e.get('gloss_en_sim', 0.0), 3),
                 }
             
             results.append(result)
 
         has_results = bool(results)
 
-        # --- Analytics logging ---
-        SearchQueryLog.objects.create(
+        response = Response(
+            {
+                "count": total_count,
+                "results": results,
+                "next_cursor": _encode_cursor(page[-1]["lemma"]) if keyset and has_more else None,
+                "search_type": search_type,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+        # --- Analytics logging (buffered when SEARCH_LOG_BATCH_SIZE > 1) ---
+        log_search(
             source="dictionary",
             query=q,
             has_results=has_results,
@@ -125,15 +221,7 @@ class PublicDictionarySearch(APIView):
                 "similarity_threshold": similarity_threshold if (fuzzy_enabled and use_fuzzy) else None,
             },
         )
-
-        return Response(
-            {
-                "count": total_count,
-                "results": results,
-                "search_type": "fuzzy" if (fuzzy_enabled and use_fuzzy and q) else "exact",
-            },
-            status=status.HTTP_200_OK,
-        )
+        return response
 
 
 class PublicDictionaryEntryDetail(APIView):
@@ -141,26 +229,51 @@ class PublicDictionaryEntryDetail(APIView):
     Public single entry lookup.
 
     GET /api/public/v1/dictionary/entry/<id>
+
+    The ETag is derived from updated_at, so a matching If-None-Match costs
+    one primary-key lookup and returns 304. The body is cached under the
+    same version and can't outlive an edit.
     """
     permission_classes = [permissions.AllowAny]
+    cache_timeout = 300
 
     def get(self, request, pk: int):
-        try:
-            entry = DictionaryEntry.objects.get(pk=pk)
-        except DictionaryEntry.DoesNotExist:
+        updated_at = (
+            DictionaryEntry.objects.filter(pk=pk)
+            .values_list("updated_at", flat=True)
+            .first()
+        )
+        if updated_at is None:
             return Response(
                 {"detail": "Entry not found."},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        return Response(
-            {
-                "id": entry.id,
-                "lemma": entry.lemma,
-                "gloss_ll": entry.gloss_ll,
-                "gloss_en": entry.gloss_en,
-            },
-            status=status.HTTP_200_OK,
+        version = f"{pk}-{updated_at.timestamp()}"
+        etag = quote_etag(version)
+        if etag_matches(request, etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        else:
+            payload = cache.get_or_set(
+                f"dict:entry:{version}", lambda: self._payload(pk), timeout=self.cache_timeout
+            )
+            if payload is None:
+                # Deleted between the two lookups
+                return Response(
+                    {"detail": "Entry not found."},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            response = Response(payload, headers={"ETag": etag})
+
+        patch_cache_control(response, public=True, max_age=self.cache_timeout)
+        return response
+
+    @staticmethod
+    def _payload(pk: int):
+        return (
+            DictionaryEntry.objects.filter(pk=pk)
+            .values(*PUBLIC_ENTRY_FIELDS)
+            .first()
         )
 
 
@@ -170,7 +283,8 @@ class PublicDictionaryAutocomplete(APIView):
     
     GET /api/public/v1/dictionary/autocomplete?q=wor&limit=10
     
-    Returns top matching lemmas for autocomplete/typeahead.
+    Returns top matching lemmas for autocomplete/typeahead. Suggestions are
+    cached per (case-folded) prefix until the next entry change.
     """
     permission_classes = [permissions.AllowAny]
     
@@ -183,31 +297,39 @@ class PublicDictionaryAutocomplete(APIView):
                 status=status.HTTP_200_OK,
             )
         
-        # Get limit
-        try:
-            limit = int(request.GET.get("limit", 10))
-        except ValueError:
-            limit = 10
-        limit = max(1, min(limit, 50))
+        limit = clamp_int_param(request, "limit", 10, 1, 50)
         
+        # pg_trgm ignores case, so "Wor" and "wor" share an entry
+        key = f"dict:ac:{cache_generations.dictionary.current()}:{limit}:{_digest(q.lower())}"
+        results = cache.get(key)
+        if results is None:
+            results = self._suggestions(q, limit)
+            cache.set(key, results, AUTOCOMPLETE_CACHE_SECONDS)
+        
+        return Response(
+            {"suggestions": results},
+            status=status.HTTP_200_OK,
+        )
+
+    @staticmethod
+    def _suggestions(q: str, limit: int) -> list:
         # Use trigram similarity for fuzzy autocomplete
         suggestions = (
             DictionaryEntry.objects
-            .annotate(similarity=TrigramSimilarity('lemma', q))
+            .annotate(
+                similarity=TrigramSimilarity('lemma', q),
+                # Preview cut in SQL so long glosses never leave the database
+                gloss_preview=Substr('gloss_en', 1, AUTOCOMPLETE_GLOSS_PREVIEW_CHARS),
+            )
             .filter(similarity__gt=0.3)
-            .order_by('-similarity')[:limit]
+            .order_by('-similarity')
+            .values("lemma", "gloss_preview", "similarity")[:limit]
         )
-        
-        results = [
+        return [
             {
-                "lemma": entry.lemma,
-                "gloss_en": entry.gloss_en[:50] if entry.gloss_en else "",  # Preview
-                "similarity": round(entry.similarity, 3),
+                "lemma": row["lemma"],
+                "gloss_en": row["gloss_preview"],
+                "similarity": round(row["similarity"], 3),
             }
-            for entry in suggestions
+            for row in suggestions
         ]
-        
-        return Response(
-            {"suggestions": results},
-            status=status.HTTP_200_OK,
-        )
@@ -2,17 +2,210 @@
 
 import csv
 import io
-import json
-import codecs
+import operator
 
+import ijson
+from django.db import connection, transaction
 from django.utils import timezone
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 
-from .models import DictionaryEntry, ImportJob, LibraryItem
+from . import cache_generations
+from .models import DictionaryEntry, EntryVariant, ImportJob, LibraryItem
 from .permissions import IsStaffUser
 
+# Rows written per INSERT ... ON CONFLICT / bulk statement
+IMPORT_BATCH_SIZE = 1000
+
+
+def stream_json_array(stream, key):
+    """
+    Iterate the items of the top-level `key` array of a JSON body, parsed
+    incrementally with ijson so only one item is in memory at a time.
+
+    The array's opening bracket is read eagerly: ValueError if `key` is
+    missing or not a list. Malformed JSON raises ijson.JSONError, possibly
+    mid-iteration.
+    """
+    events = ijson.parse(stream)
+    for prefix, event, _ in events:
+        if prefix == key:
+            if event == "start_array":
+                return ijson.items(events, f"{key}.item")
+            break
+    raise ValueError(f"Expected '{key}' as a list.")
+
+
+def read_csv_columns(text, names):
+    """
+    Yield the `names` columns of each data row of a CSV stream, as a tuple
+    of strings. Rows are read as plain lists and picked with one
+    itemgetter instead of being built into dicts as csv.DictReader does,
+    with the same results: blank lines are skipped and missing columns or
+    cells read as "". A Unicode BOM character left on the first header
+    (the double-BOM case) is ignored.
+    """
+    reader = csv.reader(text)
+    header = next(reader, [])
+    if header and header[0].startswith("\ufeff"):
+        header[0] = header[0][1:]
+
+    # Absent columns point one past the header, at the padding below
+    width = len(header)
+    columns = [header.index(name) if name in header else width for name in names]
+    pick = operator.itemgetter(*columns)
+    needed = max(columns) + 1
+    for row in reader:
+        if not row:
+            continue
+        if len(row) < needed:
+            row.extend([""] * (needed - len(row)))
+        yield pick(row)
+
+
+def copy_from(cursor, sql: str, buf) -> None:
+    """
+    Run a COPY ... FROM STDIN reading from file-like `buf` with either
+    PostgreSQL driver: psycopg2's copy_expert() or psycopg 3's copy().
+    """
+    if hasattr(cursor, "copy_expert"):
+        cursor.copy_expert(sql, buf)
+        return
+    with cursor.copy(sql) as copy:
+        copy.write(buf.read())
+
+
+def copy_dictionary_entries(rows):
+    """
+    Upsert (lemma, gloss_ll, gloss_en) rows by COPYing them into a temp
+    table and merging with a single INSERT ... SELECT ... ON CONFLICT
+    (lemma). A blank gloss keeps the current value (applied in SQL, so
+    existing rows are never read into Python), and a lemma repeated in
+    `rows` ends up with the merged result of its rows in order. Must be
+    called inside a transaction.
+
+    Returns (created, updated) counts.
+    """
+    merged = {}
+    for lemma, gloss_ll, gloss_en in rows:
+        current = merged.setdefault(lemma, ["", ""])
+        current[0] = gloss_ll or current[0]
+        current[1] = gloss_en or current[1]
+    if not merged:
+        return 0, 0
+
+    buf = io.StringIO()
+    csv.writer(buf).writerows([lemma, *glosses] for lemma, glosses in merged.items())
+    buf.seek(0)
+
+    table = connection.ops.quote_name(DictionaryEntry._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "CREATE TEMP TABLE tmp_dictionary_import "
+            "(lemma text, gloss_ll text, gloss_en text) ON COMMIT DROP"
+        )
+        copy_from(
+            cursor,
+            "COPY tmp_dictionary_import (lemma, gloss_ll, gloss_en) FROM STDIN "
+            "WITH (FORMAT csv, FORCE_NOT_NULL (gloss_ll, gloss_en))",
+            buf,
+        )
+        cursor.execute(
+            f"""
+            INSERT INTO {table} AS entry (lemma, gloss_ll, gloss_en, updated_at)
+            SELECT lemma, gloss_ll, gloss_en, %s FROM tmp_dictionary_import
+            ON CONFLICT (lemma) DO UPDATE SET
+                gloss_ll = COALESCE(NULLIF(EXCLUDED.gloss_ll, ''), entry.gloss_ll),
+                gloss_en = COALESCE(NULLIF(EXCLUDED.gloss_en, ''), entry.gloss_en),
+                updated_at = EXCLUDED.updated_at
+            RETURNING (xmax = 0) AS inserted
+            """,
+            [timezone.now()],
+        )
+        created = sum(1 for (inserted,) in cursor.fetchall() if inserted)
+        cursor.execute("DROP TABLE tmp_dictionary_import")
+
+    return created, len(merged) - created
+
+
+def add_entry_variants(pairs) -> int:
+    """
+    Attach (lemma, alias) variant pairs to their entries with a single
+    INSERT ... SELECT over unnest()ed arrays. Aliases an entry already has
+    are skipped (there is no unique constraint to ON CONFLICT against), as
+    are lemmas with no entry. Returns the number of variants inserted.
+    """
+    pairs = list(dict.fromkeys(pairs))
+    if not pairs:
+        return 0
+
+    variant_table = connection.ops.quote_name(EntryVariant._meta.db_table)
+    entry_table = connection.ops.quote_name(DictionaryEntry._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {variant_table} (entry_id, alias)
+            SELECT entry.id, new.alias
+            FROM unnest(%s::text[], %s::text[]) AS new (lemma, alias)
+            JOIN {entry_table} AS entry ON entry.lemma = new.lemma
+            WHERE NOT EXISTS (
+                SELECT 1 FROM {variant_table} AS variant
+                WHERE variant.entry_id = entry.id AND variant.alias = new.alias
+            )
+            """,
+            [[lemma for lemma, _ in pairs], [alias for _, alias in pairs]],
+        )
+        return cursor.rowcount
+
+
+def upsert_library_items(rows):
+    """
+    Create or update library items matched by title, from dicts as posted
+    to the library importer. Titles aren't unique in the schema, so this
+    is one SELECT, one bulk_create and one bulk_update rather than ON
+    CONFLICT. Returns whether each row created (True) or updated (False)
+    an item, in input order.
+    """
+    items = {}
+    for item in LibraryItem.objects.filter(
+        title__in={row["title"] for row in rows}
+    ).order_by("-pk"):
+        items[item.title] = item  # lowest pk wins, like get_or_create's first match
+
+    to_create, to_update, created_flags = [], {}, []
+    for row in rows:
+        item = items.get(row["title"])
+        if item is None:
+            item = LibraryItem(
+                title=row["title"],
+                description=row.get("description") or "",
+                url=row.get("url") or "",
+                item_type=row.get("item_type") or "",
+                is_published=row.get("is_published", True),
+            )
+            items[item.title] = item
+            to_create.append(item)
+            created_flags.append(True)
+            continue
+
+        item.description = row.get("description") or item.description
+        item.url = row.get("url") or item.url
+        item.item_type = row.get("item_type") or item.item_type
+        if "is_published" in row:
+            item.is_published = row.get("is_published")
+        if item.pk is not None:
+            to_update[item.pk] = item
+        created_flags.append(False)
+
+    LibraryItem.objects.bulk_create(to_create, batch_size=IMPORT_BATCH_SIZE)
+    LibraryItem.objects.bulk_update(
+        to_update.values(),
+        ["description", "url", "item_type", "is_published"],
+        batch_size=IMPORT_BATCH_SIZE,
+    )
+    return created_flags
+
 
 class BaseImportView(APIView):
     permission_classes = [IsStaffUser]
@@ -62,47 +255,47 @@ class DictionaryImportCSVView(BaseImportView):
         job = self.create_job(request)
         log = ["Starting dictionary CSV import."]
 
+        # Decode while streaming so memory stays per-row, not per-file;
+        # utf-8-sig strips the byte-level BOM
+        text = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+        rows = read_csv_columns(text, ("lemma", "gloss_ll", "gloss_en"))
+        batch = []
+        counts = []  # (created, updated) per flushed batch
+        lemma_max_length = DictionaryEntry._meta.get_field("lemma").max_length
+
+        # One transaction for the whole file; rows that would fail the
+        # INSERT are rejected up front so they can't abort it
         try:
-            # Read file content as bytes
-            raw_data = upload.read()
-            
-            # Decode - utf-8-sig automatically strips byte-level BOM
-            data = raw_data.decode("utf-8-sig")
-            
-            # Strip Unicode BOM character if present (handles double-BOM case)
-            if data.startswith('\ufeff'):
-                data = data[1:]
+            with transaction.atomic():
+                for idx, (lemma, gloss_ll, gloss_en) in enumerate(rows, start=1):
+                    job.total_rows += 1
+                    lemma = lemma.strip()
+                    if not lemma:
+                        job.failed_rows += 1
+                        log.append(f"Row {idx}: missing lemma.")
+                        continue
+                    if len(lemma) > lemma_max_length:
+                        job.failed_rows += 1
+                        log.append(f"Row {idx}: lemma longer than {lemma_max_length} characters.")
+                        continue
+
+                    batch.append((lemma, gloss_ll, gloss_en))
+                    job.success_rows += 1
+                    if len(batch) >= IMPORT_BATCH_SIZE:
+                        counts.append(copy_dictionary_entries(batch))
+                        batch = []
+
+                counts.append(copy_dictionary_entries(batch))
+                transaction.on_commit(cache_generations.dictionary.bump)
         except UnicodeDecodeError:
             return Response(
                 {"detail": "Unable to decode CSV as UTF-8."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        reader = csv.DictReader(io.StringIO(data))
-
-        for idx, row in enumerate(reader, start=1):
-            job.total_rows += 1
-            lemma = (row.get("lemma") or "").strip()
-            if not lemma:
-                job.failed_rows += 1
-                log.append(f"Row {idx}: missing lemma.")
-                continue
-
-            entry, created = DictionaryEntry.objects.get_or_create(
-                lemma=lemma,
-                defaults={
-                    "gloss_ll": row.get("gloss_ll") or "",
-                    "gloss_en": row.get("gloss_en") or "",
-                },
-            )
-
-            if not created:
-                # update existing
-                entry.gloss_ll = row.get("gloss_ll") or entry.gloss_ll
-                entry.gloss_en = row.get("gloss_en") or entry.gloss_en
-                entry.save()
-
-            job.success_rows += 1
+        created = sum(c for c, _ in counts)
+        updated = sum(u for _, u in counts)
+        log.append(f"Upserted {created + updated} entries ({created} created, {updated} updated).")
 
         self.finalize_job(job, log)
 
@@ -123,47 +316,76 @@ class DictionaryImportJSONView(BaseImportView):
     POST /api/admin/import/dictionary/json
     {
         "entries": [
-        {"lemma": "...", "gloss_ll": "...", "gloss_en": "..."},
+        {"lemma": "...", "gloss_ll": "...", "gloss_en": "...", "variants": ["..."]},
         ...
     ]
     }
+
+    "variants" is optional; aliases the entry already has are skipped.
     """
 
+    # The body is streamed with ijson rather than parsed up front by DRF
+    parser_classes = []
+
     def post(self, request):
-        # FIXED: Removed request.body access - DRF already parsed it
-        raw = request.data.get("entries")
-        
-        if not isinstance(raw, list):
-            return Response(
-                {"detail": "Expected 'entries' as a list."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+        try:
+            raw = stream_json_array(request.stream, "entries")
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        except ijson.JSONError:
+            return Response({"detail": "Malformed JSON."}, status=status.HTTP_400_BAD_REQUEST)
 
         job = self.create_job(request)
         log = ["Starting dictionary JSON import."]
 
-        for idx, item in enumerate(raw, start=1):
-            job.total_rows += 1
-            lemma = (item.get("lemma") or "").strip()
-            if not lemma:
-                job.failed_rows += 1
-                log.append(f"Item {idx}: missing lemma.")
-                continue
-
-            entry, created = DictionaryEntry.objects.get_or_create(
-                lemma=lemma,
-                defaults={
-                    "gloss_ll": item.get("gloss_ll") or "",
-                    "gloss_en": item.get("gloss_en") or "",
-                },
-            )
-
-            if not created:
-                entry.gloss_ll = item.get("gloss_ll") or entry.gloss_ll
-                entry.gloss_en = item.get("gloss_en") or entry.gloss_en
-                entry.save()
-
-            job.success_rows += 1
+        batch, variants = [], []
+        counts = []  # (created, updated) per flushed batch
+        added_variants = 0
+        lemma_max_length = DictionaryEntry._meta.get_field("lemma").max_length
+        alias_max_length = EntryVariant._meta.get_field("alias").max_length
+        try:
+            with transaction.atomic():
+                for idx, item in enumerate(raw, start=1):
+                    job.total_rows += 1
+                    lemma = (item.get("lemma") or "").strip()
+                    if not lemma:
+                        job.failed_rows += 1
+                        log.append(f"Item {idx}: missing lemma.")
+                        continue
+                    if len(lemma) > lemma_max_length:
+                        job.failed_rows += 1
+                        log.append(f"Item {idx}: lemma longer than {lemma_max_length} characters.")
+                        continue
+
+                    batch.append((lemma, item.get("gloss_ll") or "", item.get("gloss_en") or ""))
+                    job.success_rows += 1
+
+                    aliases = item.get("variants") or []
+                    if not isinstance(aliases, list):
+                        aliases = [aliases]
+                    for alias in aliases:
+                        alias = alias.strip() if isinstance(alias, str) else ""
+                        if not alias or len(alias) > alias_max_length:
+                            log.append(f"Item {idx}: skipped invalid variant.")
+                            continue
+                        variants.append((lemma, alias))
+
+                    if len(batch) >= IMPORT_BATCH_SIZE:
+                        counts.append(copy_dictionary_entries(batch))
+                        added_variants += add_entry_variants(variants)
+                        batch, variants = [], []
+
+                counts.append(copy_dictionary_entries(batch))
+                added_variants += add_entry_variants(variants)
+                transaction.on_commit(cache_generations.dictionary.bump)
+        except ijson.JSONError:
+            return Response({"detail": "Malformed JSON."}, status=status.HTTP_400_BAD_REQUEST)
+
+        created = sum(c for c, _ in counts)
+        updated = sum(u for _, u in counts)
+        log.append(f"Upserted {created + updated} entries ({created} created, {updated} updated).")
+        if added_variants:
+            log.append(f"Added {added_variants} variants.")
 
         self.finalize_job(job, log)
 
@@ -210,37 +432,33 @@ class LibraryImportJSONView(BaseImportView):
         job = self.create_job(request)
         log = ["Starting library JSON import."]
 
+        batch = []
+        row_log = {}  # idx -> line, so the log stays in input order
+        title_max_length = LibraryItem._meta.get_field("title").max_length
         for idx, item in enumerate(raw, start=1):
             job.total_rows += 1
             title = (item.get("title") or "").strip()
             if not title:
                 job.failed_rows += 1
-                log.append(f"Item {idx}: missing title.")
+                row_log[idx] = f"Item {idx}: missing title."
+                continue
+            if len(title) > title_max_length:
+                job.failed_rows += 1
+                row_log[idx] = f"Item {idx}: title longer than {title_max_length} characters."
                 continue
 
-            # Create or update library item
-            library_item, created = LibraryItem.objects.get_or_create(
-                title=title,
-                defaults={
-                    "description": item.get("description") or "",
-                    "url": item.get("url") or "",
-                    "item_type": item.get("item_type") or "",
-                    "is_published": item.get("is_published", True),
-                },
-            )
-
-            if not created:
-                # update existing
-                library_item.description = item.get("description") or library_item.description
-                library_item.url = item.get("url") or library_item.url
-                library_item.item_type = item.get("item_type") or library_item.item_type
-                if "is_published" in item:
-                    library_item.is_published = item.get("is_published")
-                library_item.save()
-
+            batch.append((idx, {**item, "title": title}))
             job.success_rows += 1
-            log.append(f"Item {idx}: {'created' if created else 'updated'} '{title}'")
 
+        with transaction.atomic():
+            for start in range(0, len(batch), IMPORT_BATCH_SIZE):
+                chunk = batch[start:start + IMPORT_BATCH_SIZE]
+                created_flags = upsert_library_items([row for _, row in chunk])
+                for (idx, row), created in zip(chunk, created_flags, strict=True):
+                    row_log[idx] = f"Item {idx}: {'created' if created else 'updated'} '{row['title']}'"
+            transaction.on_commit(cache_generations.library.bump)
+
+        log.extend(row_log[idx] for idx in sorted(row_log))
         self.finalize_job(job, log)
 
         return Response(
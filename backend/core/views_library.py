@@ -1,26 +1,162 @@
-from django.db.models import Q
+import base64
+import binascii
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils.dateparse import parse_datetime
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import permissions, status
+from rest_framework.throttling import ScopedRateThrottle
 
+from . import cache_generations, library_stats
+from .library_events import track_event
 from .models import LibraryItem, LibrarySubmission, LibraryEvent
 from .permissions import IsModeratorOrAdmin
+from .utils import clamp_int_param, paginate_queryset
+
+
+# Shorter queries are matched as substrings; full-text search needs words
+FULLTEXT_MIN_QUERY_LENGTH = 3
+
+# How long a library search page is reused (until an item changes)
+LIBRARY_SEARCH_CACHE_SECONDS = 60
+
+# How long the set of published item ids is reused (until an item changes)
+PUBLISHED_IDS_CACHE_SECONDS = 600
+
+
+# (generation, ids) of the last published-id set this process loaded
+_published_ids_memo = (None, frozenset())
+
+
+def _published_item_ids() -> frozenset:
+    """
+    Ids of all published items, cached under the library generation so
+    tracking calls check membership without a query. Each process also
+    keeps the set it last loaded, so while the generation is unchanged a
+    call costs one cache read rather than fetching and unpickling the set.
+    """
+    global _published_ids_memo
+    generation = cache_generations.library.current()
+    memo_generation, ids = _published_ids_memo
+    if memo_generation != generation:
+        ids = cache.get_or_set(
+            f"library:published_ids:{generation}",
+            lambda: frozenset(
+                LibraryItem.objects.filter(is_published=True).values_list("id", flat=True)
+            ),
+            timeout=PUBLISHED_IDS_CACHE_SECONDS,
+        )
+        _published_ids_memo = (generation, ids)
+    return ids
+
+
+def _encode_cursor(row) -> str:
+    return base64.urlsafe_b64encode(
+        f"{row['created_at'].isoformat()}|{row['id']}".encode()
+    ).decode()
+
+
+def _decode_cursor(cursor: str):
+    """
+    Return the (created_at, id) a cursor points after, or None if invalid.
+    """
+    try:
+        created_at, _, pk = (
+            base64.b64decode(cursor, altchars=b"-_", validate=True).decode().partition("|")
+        )
+        created_at = parse_datetime(created_at)
+        pk = int(pk)
+    except (binascii.Error, UnicodeError, ValueError):
+        return None
+    if created_at is None:
+        return None
+    return created_at, pk
 
 
 class LibrarySearch(APIView):
     """
     Authenticated search over published library items.
+
+    Queries of FULLTEXT_MIN_QUERY_LENGTH or more characters use full-text
+    search on the stored search_vector (GIN-indexed), best match first.
+    Shorter ones fall back to substring matching, newest first.
+
+    fuzzy=true (when FUZZY_SEARCH_ENABLED) matches by trigram similarity
+    instead, tolerating typos; the % operator is served by the partial
+    trigram indexes on title and description.
+
+    Newest-first results (browsing, short queries) also page by keyset:
+    pass the returned next_cursor as cursor= instead of growing the
+    offset, and each page seeks straight to its first row. Cursor pages
+    report count as null.
+
+    Pages are cached for LIBRARY_SEARCH_CACHE_SECONDS, keyed on the query
+    parameters and the library cache generation.
     """
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
         q = (request.GET.get("q") or "").strip()
-        category = request.GET.get("category")
+        category = request.GET.get("category") or ""
+        use_fuzzy = (
+            getattr(settings, "FUZZY_SEARCH_ENABLED", True)
+            and request.GET.get("fuzzy", "false").lower() == "true"
+        )
 
+        # Ranked results (fuzzy, full-text) have no stable seek key
+        keyset = not (q and use_fuzzy) and len(q) < FULLTEXT_MIN_QUERY_LENGTH
+        cursor = request.GET.get("cursor", "") if keyset else ""
+        after = None
+        if cursor:
+            after = _decode_cursor(cursor)
+            if after is None:
+                return Response(
+                    {"detail": "Invalid cursor."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        limit = clamp_int_param(request, "limit", 20, 1, 100)
+        offset = clamp_int_param(request, "offset", 0, 0)
+
+        # Only published items are listed, so one cached page serves
+        # every user; any item or category change moves the generation
+        params = "|".join([q, category, str(use_fuzzy), cursor, str(limit), str(offset)])
+        key = (
+            f"library:search:{cache_generations.library.current()}:"
+            f"{hashlib.sha256(params.encode()).hexdigest()[:32]}"
+        )
+        payload = cache.get_or_set(
+            key,
+            lambda: self._search(request, q, category, use_fuzzy, keyset, after, limit),
+            timeout=LIBRARY_SEARCH_CACHE_SECONDS,
+        )
+        return Response(payload)
+
+    @staticmethod
+    def _search(request, q, category, use_fuzzy, keyset, after, limit) -> dict:
         # Only published items are visible
         qs = LibraryItem.objects.filter(is_published=True)
 
-        if q:
+        # id breaks ties between items created in the same instant
+        ordering = ["-created_at", "-id"]
+        if q and use_fuzzy:
+            qs = qs.filter(
+                Q(title__trigram_similar=q) | Q(description__trigram_similar=q)
+            ).annotate(similarity=TrigramSimilarity("title", q))
+            ordering = ["-similarity", *ordering]
+        elif len(q) >= FULLTEXT_MIN_QUERY_LENGTH:
+            query = SearchQuery(q, config="english", search_type="websearch")
+            qs = qs.filter(search_vector=query).annotate(
+                rank=SearchRank(F("search_vector"), query)
+            )
+            ordering = ["-rank", *ordering]
+        elif q:
             qs = qs.filter(
                 Q(title__icontains=q) |
                 Q(description__icontains=q)
@@ -29,35 +165,41 @@ class LibrarySearch(APIView):
         if category:
             qs = qs.filter(category__slug=category)
 
-        # Pagination
-        try:
-            limit = int(request.GET.get("limit", 20))
-        except ValueError:
-            limit = 20
-        try:
-            offset = int(request.GET.get("offset", 0))
-        except ValueError:
-            offset = 0
-
-        limit = max(1, min(limit, 100))
-        offset = max(0, offset)
-
-        items = qs.order_by("-created_at")[offset: offset + limit]
-
-        return Response(
-            {
-                "count": qs.count(),
-                "results": [
-                    {
-                        "id": i.id,
-                        "title": i.title,
-                        "item_type": getattr(i, "item_type", None),
-                        "category": i.category.name if getattr(i, "category", None) else None,
-                    }
-                    for i in items
-                ],
-            }
+        # Plain dicts of just the rendered columns (plus the cursor key);
+        # the category name comes in through the join
+        page_qs = qs.order_by(*ordering).values(
+            "id", "title", "item_type", "created_at", category_name=F("category__name")
         )
+        if after is not None:
+            created_at, pk = after
+            # Cursor pages skip the total: counting would scan the rows the
+            # seek avoids. One extra row tells whether a next page exists.
+            items = list(
+                page_qs.filter(
+                    Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+                )[: limit + 1]
+            )
+            has_more = len(items) > limit
+            items = items[:limit]
+            total_count = None
+        else:
+            # Page and total in one query (COUNT(*) OVER ())
+            items, total_count, limit, offset = paginate_queryset(page_qs, request)
+            has_more = offset + len(items) < total_count
+
+        return {
+            "count": total_count,
+            "results": [
+                {
+                    "id": i["id"],
+                    "title": i["title"],
+                    "item_type": i["item_type"],
+                    "category": i["category_name"],
+                }
+                for i in items
+            ],
+            "next_cursor": _encode_cursor(items[-1]) if keyset and has_more else None,
+        }
 
 
 class LibrarySubmit(APIView):
@@ -102,14 +244,26 @@ class LibraryTrack(APIView):
         "item_id": <int>,
         "event_type": "view" | "download" | "complete"
     }
+
+    Views also bump the cache counters in core/library_stats.py.
+
+    Returns 201 with the event id, or 202 with a null id when events are
+    batched (LIBRARY_EVENT_BATCH_SIZE > 1) or view rows are turned off
+    (LIBRARY_VIEW_EVENT_ROWS = False).
+
+    Throttled per user under its own "track" rate, so a client replaying
+    events is cut off before it reaches the database.
     """
     permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = "track"
 
     def post(self, request):
         item_id = request.data.get("item_id")
         event_type = request.data.get("event_type")
 
-        if event_type not in ("view", "download", "complete"):
+        # Unhashable JSON values (lists, objects) would raise on the set lookup
+        if not isinstance(event_type, str) or event_type not in LibraryEvent.EVENT_TYPES_SET:
             return Response(
                 {"detail": "Invalid event_type."},
                 status=status.HTTP_400_BAD_REQUEST,
@@ -123,21 +277,38 @@ class LibraryTrack(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        try:
-            item = LibraryItem.objects.get(id=item_id, is_published=True)
-        except LibraryItem.DoesNotExist:
+        # Existence check only; the event row just needs the FK id
+        if item_id not in _published_item_ids():
             return Response(
                 {"detail": "Item not found."},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        LibraryEvent.objects.create(
+        if event_type == LibraryEvent.EVENT_VIEW:
+            library_stats.record_view(item_id, request.user.id)
+            if not settings.LIBRARY_VIEW_EVENT_ROWS:
+                # Counted only; no per-event row
+                return Response(
+                    {"event_id": None, "detail": "Tracked."},
+                    status=status.HTTP_202_ACCEPTED,
+                )
+
+        event = track_event(
             user=request.user,
-            item=item,
+            item_id=item_id,
             event_type=event_type,
         )
+        if event is None:
+            # Buffered: the row (and its id) exists once the batch is written
+            return Response(
+                {"event_id": None, "detail": "Tracked."},
+                status=status.HTTP_202_ACCEPTED,
+            )
 
-        return Response({"detail": "Tracked."}, status=status.HTTP_201_CREATED)
+        return Response(
+            {"event_id": event.id, "detail": "Tracked."},
+            status=status.HTTP_201_CREATED,
+        )
 
 
 class LibrarySubmissionApprove(APIView):
@@ -147,9 +318,12 @@ class LibrarySubmissionApprove(APIView):
     """
     permission_classes = [IsModeratorOrAdmin]
 
+    @transaction.atomic
     def post(self, request, pk):
         try:
-            submission = LibrarySubmission.objects.get(id=pk)
+            # Row lock: a concurrent review of the same submission waits
+            # here and then sees it is no longer pending
+            submission = LibrarySubmission.objects.select_for_update().get(id=pk)
         except LibrarySubmission.DoesNotExist:
             return Response(
                 {"detail": "Submission not found."},
@@ -174,7 +348,7 @@ class LibrarySubmissionApprove(APIView):
         # Update submission status
         submission.status = "approved"
         submission.reviewed_by = request.user
-        submission.save()
+        submission.save(update_fields=["status", "reviewed_by"])
 
         return Response(
             {
@@ -198,9 +372,10 @@ class LibrarySubmissionReject(APIView):
     """
     permission_classes = [IsModeratorOrAdmin]
 
+    @transaction.atomic
     def post(self, request, pk):
         try:
-            submission = LibrarySubmission.objects.get(id=pk)
+            submission = LibrarySubmission.objects.select_for_update().get(id=pk)
         except LibrarySubmission.DoesNotExist:
             return Response(
                 {"detail": "Submission not found."},
@@ -222,7 +397,7 @@ class LibrarySubmissionReject(APIView):
         if reason and hasattr(submission, "rejection_reason"):
             submission.rejection_reason = reason
 
-        submission.save()
+        submission.save(update_fields=["status", "reviewed_by", "rejection_reason"])
 
         return Response(
             {
@@ -1,3 +1,4 @@
+from django.db import transaction
 from django.utils import timezone
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -14,9 +15,12 @@ class ApproveSubmission(APIView):
     """
     permission_classes = [IsManagerOrAdmin]
 
+    @transaction.atomic
     def post(self, request, pk):
         try:
-            submission = LibrarySubmission.objects.get(pk=pk)
+            # Row lock: a concurrent review of the same submission waits
+            # here and then sees it is no longer pending
+            submission = LibrarySubmission.objects.select_for_update().get(pk=pk)
         except LibrarySubmission.DoesNotExist:
             return Response(
                 {"detail": "Submission not found."},
@@ -63,9 +67,10 @@ class RejectSubmission(APIView):
     """
     permission_classes = [IsManagerOrAdmin]
 
+    @transaction.atomic
     def post(self, request, pk):
         try:
-            submission = LibrarySubmission.objects.get(pk=pk)
+            submission = LibrarySubmission.objects.select_for_update().get(pk=pk)
         except LibrarySubmission.DoesNotExist:
             return Response(
                 {"detail": "Submission not found."},
@@ -1,12 +1,25 @@
-from django.core.cache import cache
+import hashlib
+from operator import itemgetter
+
 from datetime import timedelta
 from django.utils import timezone
-from django.db.models import Count
+from django.utils.http import quote_etag
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
+from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
-from .models import SearchQueryLog
+from . import search_stats, swr_cache
 from .permissions import IsManagerOrAdmin
+from .renderers import ORJSONRenderer
+from .utils import clamp_int_param, etag_matches
+
+
+# Summaries are served as is for this long, then rebuilt in the background
+SUMMARY_FRESH_SECONDS = 60
+# Older summaries are rebuilt before responding
+SUMMARY_STALE_SECONDS = 600
 
 
 class QueryHealthSummary(APIView):
@@ -19,64 +32,85 @@ class QueryHealthSummary(APIView):
     - top queries
     - top "no result" queries
 
-    Cached briefly to support fast dashboards.
+    Cached with stale-while-revalidate to support fast dashboards.
     """
     permission_classes = [IsManagerOrAdmin]
 
     def get(self, request):
-        # Window length in days
-        try:
-            days = int(request.GET.get("days", 30) or 30)
-        except ValueError:
-            days = 30
-        days = max(1, days)
-
-        # Max rows for top lists
-        try:
-            limit = int(request.GET.get("limit", 50) or 50)
-        except ValueError:
-            limit = 50
-        limit = max(1, min(limit, 200))
-
-        cache_key = f"qh:summary:{days}:{limit}"
-        cached = cache.get(cache_key)
-        if cached is not None:
-            return Response(cached)
+        # Window length in days, max rows for top lists
+        days = clamp_int_param(request, "days", 30, 1)
+        limit = clamp_int_param(request, "limit", 50, 1, 200)
+
+        cache_key = f"qh:summary:v3:{days}:{limit}"
+        payload, etag = swr_cache.get_or_rebuild(
+            cache_key,
+            lambda: self._summary_with_etag(days, limit),
+            fresh_for=SUMMARY_FRESH_SECONDS,
+            stale_for=SUMMARY_STALE_SECONDS,
+        )
 
-        since = timezone.now() - timedelta(days=days)
+        # Dashboards polling an unchanged summary get a bodyless 304
+        if etag_matches(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        return Response(payload, headers={"ETag": etag})
+
+    @classmethod
+    def _summary_with_etag(cls, days: int, limit: int):
+        payload = cls._summary(days, limit)
+        digest = hashlib.sha256(ORJSONRenderer().render(payload)).hexdigest()[:16]
+        return payload, quote_etag(digest)
 
-        qs = SearchQueryLog.objects.filter(created_at__gte=since)
+    @staticmethod
+    def _summary(days: int, limit: int) -> dict:
+        since = timezone.now() - timedelta(days=days)
 
-        total = qs.count()
-        no_res = qs.filter(has_results=False).count()
+        qs = search_stats.search_rows(since=since)
 
-        # Top no-result queries (these drive your backlog)
-        # FIXED: Added secondary sort by 'query' for deterministic ordering
-        top_missing = (
-            qs.filter(has_results=False)
-            .values("query", "source")
-            .annotate(times=Count("id"))
-            .order_by("-times", "query")[:limit]  # Added 'query' for stable sort
+        # Both counts in one scan of the window
+        counts = qs.aggregate(
+            total=search_stats.searches(),
+            no_res=search_stats.searches(filter=Q(has_results=False)),
         )
+        total, no_res = counts["total"], counts["no_res"]
 
-        # Top queries overall
-        # FIXED: Added secondary sort by 'query' for deterministic ordering
-        top_queries = (
+        # Both top lists from one GROUP BY (query, source) of the window:
+        # each group is ranked by all searches and by no-result searches,
+        # and only groups in either top `limit` come back
+        groups = (
             qs.values("query", "source")
-            .annotate(times=Count("id"))
-            .order_by("-times", "query")[:limit]  # Added 'query' for stable sort
+            .annotate(
+                times=search_stats.searches(),
+                missing=search_stats.searches(filter=Q(has_results=False)),
+            )
+            .annotate(
+                times_rank=Window(RowNumber(), order_by=[F("times").desc(), "query", "source"]),
+                missing_rank=Window(RowNumber(), order_by=[F("missing").desc(), "query", "source"]),
+            )
+            .filter(Q(times_rank__lte=limit) | Q(missing_rank__lte=limit))
+            # Meta.ordering would add created_at to the GROUP BY
+            .order_by()
         )
+        groups = list(groups)
+
+        # Top no-result queries (these drive your backlog)
+        top_missing = [
+            {"query": g["query"], "source": g["source"], "times": g["missing"]}
+            for g in sorted(groups, key=itemgetter("missing_rank"))
+            if g["missing_rank"] <= limit and g["missing"]
+        ]
 
-        payload = {
+        # Top queries overall
+        top_queries = [
+            {"query": g["query"], "source": g["source"], "times": g["times"]}
+            for g in sorted(groups, key=itemgetter("times_rank"))
+            if g["times_rank"] <= limit
+        ]
+
+        return {
             "window_days": days,
             "total_searches": total,
             "no_result_searches": no_res,
             "no_result_rate": (no_res / total) if total else 0.0,
-            "top_no_result_queries": list(top_missing),
-            "top_queries": list(top_queries),
+            "top_no_result_queries": top_missing,
+            "top_queries": top_queries,
         }
-
-        # Cache for 60 seconds – responsive but fresh
-        cache.set(cache_key, payload, timeout=60)
-
-        return Response(payload)
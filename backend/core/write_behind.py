@@ -0,0 +1,121 @@
+"""
+Per-process write-behind buffer for append-only log rows.
+
+With the model's batch-size setting above 1, rows are held in memory and
+written with a single bulk_create once the batch fills up or the oldest
+buffered row is older than the flush-seconds setting. A daemon thread,
+started on the first buffered row, writes aged rows during quiet periods
+so they don't wait for the next call. Whatever is left is flushed at
+interpreter exit.
+
+Trade-offs when buffering is on: rows are not visible until flushed, have
+no primary key until then, columns filled at insert (auto_now_add) hold
+the flush time, and a hard crash loses the pending batch. With a batch
+size of 1 every add() is a plain synchronous insert.
+"""
+
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    def __init__(self, model, batch_size_setting: str, flush_seconds_setting: str):
+        self.model = model
+        self.batch_size_setting = batch_size_setting
+        self.flush_seconds_setting = flush_seconds_setting
+        self._lock = threading.Lock()
+        self._batch_started = threading.Condition(self._lock)
+        self._rows = []
+        self._oldest = None
+        self._flusher = None
+        atexit.register(self._flush_at_exit)
+
+    def add(self, **fields):
+        """
+        Record a row. Returns the saved instance when written
+        synchronously, None when it was buffered.
+        """
+        batch_size = getattr(settings, self.batch_size_setting, 1)
+        if batch_size <= 1:
+            return self.model.objects.create(**fields)
+
+        max_age = self._max_age()
+        now = time.monotonic()
+
+        with self._lock:
+            self._rows.append(self.model(**fields))
+            if self._oldest is None:
+                self._oldest = now
+                self._ensure_flusher()
+                self._batch_started.notify()
+            if len(self._rows) < batch_size and now - self._oldest < max_age:
+                return None
+            batch = self._take_batch()
+
+        self.write(batch)
+        return None
+
+    def flush(self) -> int:
+        """
+        Write any buffered rows now. Returns the number of rows written.
+        """
+        with self._lock:
+            batch = self._take_batch()
+        self.write(batch)
+        return len(batch)
+
+    def write(self, batch) -> None:
+        if batch:
+            self.model.objects.bulk_create(batch, batch_size=500)
+
+    def _max_age(self) -> float:
+        return getattr(settings, self.flush_seconds_setting, 2.0)
+
+    def _take_batch(self):
+        # Caller must hold _lock
+        batch = self._rows[:]
+        self._rows.clear()
+        self._oldest = None
+        return batch
+
+    def _ensure_flusher(self):
+        # Caller must hold _lock
+        if self._flusher is None or not self._flusher.is_alive():
+            self._flusher = threading.Thread(
+                target=self._flush_loop,
+                name=f"{self.model._meta.model_name}-flusher",
+                daemon=True,
+            )
+            self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._lock:
+                while True:
+                    if self._oldest is None:
+                        self._batch_started.wait()
+                        continue
+                    remaining = self._oldest + self._max_age() - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._batch_started.wait(remaining)
+                batch = self._take_batch()
+            try:
+                self.write(batch)
+            except Exception:
+                logger.exception("Failed to flush buffered %s rows", self.model.__name__)
+            finally:
+                connection.close()
+
+    def _flush_at_exit(self) -> None:
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Failed to flush buffered %s rows at exit", self.model.__name__)
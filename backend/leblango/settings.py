@@ -1,6 +1,8 @@
 import os
+from importlib.util import find_spec
 from pathlib import Path
 from datetime import timedelta
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 import sentry_sdk
@@ -60,11 +62,19 @@ INSTALLED_APPS = [
 # Middleware
 # ------------------------------------------------
 MIDDLEWARE = [
+    "core.health_middleware.HealthCheckMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    # Gunicorn is exposed without a compressing proxy; must come before
+    # anything that reads or writes the response body
+    "django.middleware.gzip.GZipMiddleware",
+    # ETags GET responses that lack one and answers a matching
+    # If-None-Match with 304; after GZip so it tags uncompressed content
+    "django.middleware.http.ConditionalGetMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
+    "core.throttle_middleware.ThrottleBlacklistMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
@@ -139,13 +149,34 @@ DATABASES = {
         "PASSWORD": os.getenv("DB_PASSWORD"),  # NO DEFAULT!
         "HOST": os.getenv("DB_HOST", "127.0.0.1"),
         "PORT": os.getenv("DB_PORT", "5432"),
-        "CONN_MAX_AGE": 600,  # Connection pooling
+        # Keep connections open across requests (0 = close after each)
+        "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "600")),
+        # Ping a reused connection before its first query in a request, so
+        # one the server dropped mid-idle is replaced instead of erroring
+        "CONN_HEALTH_CHECKS": True,
         "OPTIONS": {
             "connect_timeout": 10,
         },
     }
 }
 
+# Opt-in connection pool shared by a worker's threads. Requires psycopg 3
+# (pip install "psycopg[binary,pool]" in place of psycopg2-binary); the
+# pool owns connection lifetimes, so CONN_MAX_AGE must be 0.
+if os.getenv("DB_POOL", "False") == "True":
+    # Django only notices a missing psycopg 3 on the first query; fail at startup
+    if not (find_spec("psycopg") and find_spec("psycopg_pool")):
+        raise ImproperlyConfigured(
+            'DB_POOL=True requires psycopg 3 with its pool: pip install "psycopg[binary,pool]"'
+        )
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+        "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "4")),
+        # Seconds a request waits for a free connection before erroring
+        "timeout": 10,
+    }
+
 # Validate DB_PASSWORD is set
 if not DATABASES["default"]["PASSWORD"]:
     raise ValueError("CRITICAL: DB_PASSWORD environment variable must be set!")
@@ -158,7 +189,15 @@ REDIS_PORT = os.getenv("REDIS_PORT", "6379")
 REDIS_DB = os.getenv("REDIS_DB", "0")
 REDIS_PASSWORD = os.getenv("REDIS_PASSWORD", "")
 
-if REDIS_PASSWORD:
+# Path to Redis' unix socket, when it runs on the same host; skips the
+# TCP stack on every cache call
+REDIS_SOCKET = os.getenv("REDIS_SOCKET", "")
+
+if REDIS_SOCKET and REDIS_PASSWORD:
+    REDIS_URL = f"unix://:{REDIS_PASSWORD}@{REDIS_SOCKET}?db={REDIS_DB}"
+elif REDIS_SOCKET:
+    REDIS_URL = f"unix://{REDIS_SOCKET}?db={REDIS_DB}"
+elif REDIS_PASSWORD:
     REDIS_URL = f"redis://:{REDIS_PASSWORD}@{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}"
 else:
     REDIS_URL = f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}"
@@ -282,17 +321,24 @@ REST_FRAMEWORK = {
     "DEFAULT_THROTTLE_RATES": {
         "user": "200/min",
         "anon": "50/min",
+        # LibraryTrack: one event insert per request
+        "track": "60/min",
     },
 
     "DEFAULT_THROTTLE_CACHE": "default",
 
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        "core.renderers.ORJSONRenderer",
     ] if not DEBUG else [
-        "rest_framework.renderers.JSONRenderer",
+        "core.renderers.ORJSONRenderer",
         "rest_framework.renderers.BrowsableAPIRenderer",
     ],
+    "DEFAULT_PARSER_CLASSES": [
+        "core.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "EXCEPTION_HANDLER": "core.exceptions.custom_exception_handler",
     "PAGE_SIZE": 20,
 }
@@ -332,6 +378,23 @@ SPECTACULAR_SETTINGS = {
 # ------------------------------------------------
 FUZZY_SEARCH_ENABLED = os.getenv("FUZZY_SEARCH_ENABLED", "true").lower() == "true"
 
+# Search analytics write-behind (see core/search_logging.py).
+# 1 = insert synchronously on every search.
+SEARCH_LOG_BATCH_SIZE = int(os.getenv("SEARCH_LOG_BATCH_SIZE", "1"))
+SEARCH_LOG_FLUSH_SECONDS = float(os.getenv("SEARCH_LOG_FLUSH_SECONDS", "2"))
+
+# Library tracking events, buffered the same way (see core/library_events.py)
+LIBRARY_EVENT_BATCH_SIZE = int(os.getenv("LIBRARY_EVENT_BATCH_SIZE", "1"))
+LIBRARY_EVENT_FLUSH_SECONDS = float(os.getenv("LIBRARY_EVENT_FLUSH_SECONDS", "2"))
+# Views are always counted in the cache (see core/library_stats.py); set
+# False to stop writing a LibraryEvent row per view as well. The library
+# analytics overview then only counts downloads and completions.
+LIBRARY_VIEW_EVENT_ROWS = os.getenv("LIBRARY_VIEW_EVENT_ROWS", "True") == "True"
+
+# Read search analytics from the hourly rollup (see core/search_stats.py)
+# instead of aggregating the raw log. Requires `refresh_search_stats` on cron.
+SEARCH_STATS_FROM_ROLLUP = os.getenv("SEARCH_STATS_FROM_ROLLUP", "false").lower() == "true"
+
 SENTRY_DSN = os.getenv("SENTRY_DSN", "")
 SENTRY_ENVIRONMENT = os.getenv("SENTRY_ENVIRONMENT", "development" if DEBUG else "production")
 SENTRY_TRACES_SAMPLE_RATE = float(os.getenv("SENTRY_TRACES_SAMPLE_RATE", "0.1"))  # 10% sampling